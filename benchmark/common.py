@@ -0,0 +1,26 @@
+import numpy as np
+
+
+# 벤치마크 공통 무작위 정책 (같은 시드에서는 모든 벤치마크가 같은 행동 순서로 에피소드를 실행)
+
+
+def random_action(rng, mask):
+    # 마스크에서 가능한 행동 중 하나를 균등하게 선택
+    return int(rng.choice(np.flatnonzero(mask.numpy())))
+
+
+def run_random_episode(env, seed, on_decision=None):
+    # env를 초기화하고 무작위 행동으로 에피소드를 끝까지 실행하여 (행동, 모드) 목록과 보상 목록 반환
+    # on_decision(index, state, mask, mode): 각 의사결정에서 행동을 선택하기 전에 호출 (스냅샷 저장 등)
+    rng = np.random.default_rng(seed)
+    state, mask, mode = env.reset()
+    actions, rewards = [], []
+    done = False
+    while not done:
+        if on_decision is not None:
+            on_decision(len(actions), state, mask, mode)
+        action = random_action(rng, mask)
+        actions.append((action, mode))
+        state, reward, done, mask, mode = env.step(action, mode)
+        rewards.append(reward)
+    return actions, rewards
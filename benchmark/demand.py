@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import argparse
+import tempfile
+import numpy as np
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from environment.demand import RateProfile
+from benchmark.common import run_random_episode
+from benchmark.snapshot import check_restore
+
+
+def run_episode(config, seed, rule=None, **kwargs):
+    # rule이 주어지면 규칙 기반으로, 없으면 무작위 행동으로 에피소드 실행
+    env = SteelStockyard(DataGenerator(config), config, record_events=True, seed=seed, **kwargs)
+    start = time.perf_counter()
+    if rule is not None:
+        env.simulate(rule)
+    else:
+        run_random_episode(env, seed)
+    elapsed = time.perf_counter() - start
+    return env, elapsed
+
+
+def check_replay(config, seed, rule=None, **kwargs):
+    # 에피소드의 출고 요청 기록(이벤트 로그 CSV)을 재생하면 같은 에피소드가 재현되는지 확인
+    env, _ = run_episode(config, seed, rule, **kwargs)
+    with tempfile.TemporaryDirectory() as path:
+        file_path = os.path.join(path, "logs.csv")
+        logs = env.monitor.get_logs(file_path)
+        replayed, _ = run_episode(config, seed, rule, demand_options={"trace": file_path}, **kwargs)
+    assert logs.equals(replayed.monitor.get_logs())
+    assert env.get_metrics() == replayed.get_metrics()
+
+
+def check_profile():
+    # 누적 강도의 역함수와 교대 주기 반복 확인
+    profile = RateProfile([(0, 1.0), (100, 0.0), (150, 3.0)], shift_length=200)
+    for time in [0.0, 10.0, 99.0, 120.0, 160.0, 199.0, 250.0, 480.0, 1234.5]:
+        for gap in [1, 5, 30, 200]:
+            shifted = profile.shift(time, gap)
+            assert abs(profile.integrate(shifted) - profile.integrate(time) - gap) < 1e-6
+            # 배율이 0인 구간(100 ~ 150)에서는 요청이 발생하지 않음
+            assert not 100 < shifted % 200 <= 150
+
+
+def measure_sampling(num_samples, p=0.01, block_size=64):
+    # 요청 간격을 하나씩 생성하는 경우와 블록 단위로 생성하는 경우의 샘플당 생성 시간 [us]
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(num_samples):
+        rng.geometric(p)
+    time_single = (time.perf_counter() - start) / num_samples
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    block, position = [], 0
+    for _ in range(num_samples):
+        if position == len(block):
+            block, position = rng.geometric(p, block_size).tolist(), 0
+        position += 1
+    time_block = (time.perf_counter() - start) / num_samples
+
+    return time_single * 1e6, time_block * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_episodes", type=int, default=2)
+    parser.add_argument("--shift_length", type=float, default=28800.0)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    # 기록 재생 / 시간대별 요청 강도 / 스냅샷 복원 확인
+    check_profile()
+    num_checked = 0
+    for rule in [None, "SETT"]:
+        for seed in range(args.num_episodes):
+            check_replay(config, seed, rule)
+            num_checked += 1
+    peak_profile = {"pieces": [(0, 1.0), (args.shift_length / 3, 3.0), (args.shift_length * 2 / 3, 0.5)],
+                    "shift_length": args.shift_length}
+    num_restored = check_restore(config, 0, 300, demand_options={"rate_profile": peak_profile})
+    with tempfile.TemporaryDirectory() as path:
+        file_path = os.path.join(path, "logs.csv")
+        run_episode(config, 1, "SETT")[0].monitor.get_logs(file_path)
+        num_restored += check_restore(config, 0, 300, demand_options={"trace": file_path})
+    print("replayed episodes: %d (all identical), restored snapshots: %d (all equivalent)"
+          % (num_checked, num_restored))
+
+    time_single, time_block = measure_sampling(200000)
+    print(" sampling | per call [us] | block [us] | speedup")
+    print("%9s | %13.3f | %10.3f | %6.1fx" % ("geometric", time_single, time_block, time_single / time_block))
+
+    # 교대 근무 중 출고 요청 강도를 높인 경우의 처리량과 출고 지연 (규칙 기반 SETT)
+    print("demand        | rate | retrievals | mean delay | makespan | episode [s] | events/s")
+    scenarios = [("stationary", None, 1.0)]
+    for multiplier in [2.0, 4.0]:
+        pieces = [(0, 1.0), (args.shift_length / 3, multiplier), (args.shift_length * 2 / 3, 1.0)]
+        scenarios.append(("peak", {"pieces": pieces, "shift_length": args.shift_length}, multiplier))
+    for name, rate_profile, multiplier in scenarios:
+        num_retrievals, delay, makespan, elapsed, num_events = 0, 0.0, 0.0, 0.0, 0
+        for seed in range(args.num_episodes):
+            demand_options = {"rate_profile": rate_profile} if rate_profile is not None else None
+            env, episode_time = run_episode(config, seed, "SETT", demand_options=demand_options)
+            metrics = env.get_metrics()
+            for output_point in env.output_points.values():
+                num_retrievals += metrics["%s/num_retrievals" % output_point.name]
+                delay += metrics["%s/mean_retrieval_delay" % output_point.name] \
+                    * metrics["%s/num_retrievals" % output_point.name]
+            makespan += metrics["makespan"]
+            elapsed += episode_time
+            num_events += env.monitor.recorder.num_events
+        print("%-13s | %4.1f | %10d | %10.1f | %8.0f | %11.3f | %8.0f"
+              % (name, multiplier, num_retrievals / args.num_episodes, delay / num_retrievals,
+                 makespan / args.num_episodes, elapsed / args.num_episodes, num_events / elapsed))
@@ -0,0 +1,52 @@
+import os
+import json
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+from environment.data import DataGenerator
+from environment.evaluate import simulate_rules
+from environment.scenario import ScenarioSet
+from environment.simulation import Dispatcher
+
+
+def evaluate_rules(config, path, rules=Dispatcher.rules, num_workers=None, seed=0, start_method=None):
+    # 시나리오 집합의 모든 시나리오에 대해 각 규칙을 병렬로 실행 (동일 시나리오는 규칙과 무관하게 동일한 시드 사용)
+    num_scenarios = len(ScenarioSet(path))
+    tasks = [(rule, index, seed + index) for rule in rules for index in range(num_scenarios)]
+    rows = [{"rule": rule, **row} for rule, row in simulate_rules(config, path, tasks, num_workers, start_method)]
+    # 결과는 완료되는 순서로 반환되므로 작업 순서(규칙, 시나리오)로 정렬
+    rows.sort(key=lambda row: (rules.index(row["rule"]), row["scenario"]))
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--scenarios", type=str, default=None, help="scenario set directory (generated if omitted)")
+    parser.add_argument("--num_scenarios", type=int, default=8)
+    parser.add_argument("--num_workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    path = args.scenarios
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "scenarios")
+        DataGenerator(config).generate_many(args.num_scenarios, seed=args.seed, path=path)
+
+    start = time.perf_counter()
+    results = evaluate_rules(config, path, num_workers=args.num_workers, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print("rule | episodes | makespan (mean) | makespan (std) | plates / 1000 t | conflicts | episodes/s")
+    for rule in Dispatcher.rules:
+        result = results[results["rule"] == rule]
+        print("%7s | %8d | %15.1f | %14.1f | %15.2f | %9.1f | %10.2f"
+              % (rule, len(result), result["makespan"].mean(), result["makespan"].std(ddof=0),
+                 1000.0 * (result["num_plates"] / result["makespan"]).mean(), result["num_conflicts"].mean(),
+                 len(result) / result["wall_time"].sum()))
+    print("total wall time: %.2f s for %d episodes" % (elapsed, len(results)))
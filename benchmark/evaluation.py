@@ -0,0 +1,82 @@
+import os
+import json
+import time
+import argparse
+import tempfile
+
+from environment.data import DataGenerator
+from environment.evaluate import evaluate
+
+
+def first_action_policy(states, masks, modes):
+    # 가능한 행동 중 번호가 가장 작은 행동을 선택하는 결정적 정책 (병렬 / 순차 평가 결과 비교용)
+    return masks.int().argmax(dim=1)
+
+
+def drop_wall_time(results):
+    return results.drop(columns="wall_time")
+
+
+def check_resume(config, path, output, num_workers, num_envs):
+    # 결과 파일을 절반만 남기고 마지막 행을 잘라 중단된 평가를 흉내낸 후 이어서 실행한 결과가 전체 실행 결과와 같은지 확인
+    full = evaluate(config, path, policy=first_action_policy, output=output,
+                    num_workers=num_workers, num_envs=num_envs)
+    with open(output, 'r') as f:
+        lines = f.readlines()
+    num_kept = 1 + (len(lines) - 1) // 2
+    with open(output, 'w') as f:
+        f.writelines(lines[:num_kept])
+        f.write(lines[num_kept][:len(lines[num_kept]) // 2])
+    resumed = evaluate(config, path, policy=first_action_policy, output=output,
+                       num_workers=num_workers, num_envs=num_envs)
+    assert drop_wall_time(full).equals(drop_wall_time(resumed))
+    return len(lines) - 1 - (num_kept - 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--scenarios", type=str, default=None, help="scenario set directory (generated if omitted)")
+    parser.add_argument("--num_scenarios", type=int, default=16)
+    parser.add_argument("--num_workers", type=int, default=4)
+    parser.add_argument("--num_envs", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = args.scenarios
+        if path is None:
+            path = os.path.join(temp_dir, "scenarios")
+            DataGenerator(config).generate_many(args.num_scenarios, seed=args.seed, path=path)
+
+        # 순차 실행(작업 프로세스 1개, 환경 1개)과 병렬 배치 추론 결과 비교
+        timings = {}
+        results = {}
+        for name, num_workers, num_envs in [("sequential", 1, 1), ("parallel", args.num_workers, args.num_envs)]:
+            start = time.perf_counter()
+            results[name] = evaluate(config, path, policy=first_action_policy, num_workers=num_workers,
+                                     num_envs=num_envs, seed=args.seed, num_threads=1)
+            timings[name] = time.perf_counter() - start
+        assert drop_wall_time(results["sequential"]).equals(drop_wall_time(results["parallel"]))
+
+        start = time.perf_counter()
+        rule_results = evaluate(config, path, rule="SETT", num_workers=args.num_workers, seed=args.seed)
+        timings["rule"] = time.perf_counter() - start
+
+        num_resumed = check_resume(config, path, os.path.join(temp_dir, "results.csv"),
+                                   args.num_workers, args.num_envs)
+
+    num_results = len(results["parallel"])
+    print("parallel results identical to sequential: %d scenarios, resumed %d scenarios after interruption"
+          % (num_results, num_resumed))
+    print("mode       | workers x envs | wall time [s] | scenarios/s | makespan (mean) | retrievals (mean)")
+    for name, workers, table in [("sequential", "1 x 1", results["sequential"]),
+                                 ("parallel", "%d x %d" % (args.num_workers, args.num_envs), results["parallel"]),
+                                 ("rule SETT", "%d x -" % args.num_workers, rule_results)]:
+        key = name.split()[0]
+        print("%-10s | %14s | %13.2f | %11.2f | %15.1f | %17.1f"
+              % (name, workers, timings[key], len(table) / timings[key], table["makespan"].mean(),
+                 table["num_retrievals"].mean()))
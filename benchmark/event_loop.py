@@ -0,0 +1,113 @@
+import json
+import time
+import argparse
+import simpy
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from benchmark.common import run_random_episode
+
+
+class TimedSteelStockyard(SteelStockyard):
+    def __init__(self, *args, queue_scan=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queue_scan = queue_scan
+        self.time_loop = 0.0
+
+    def _poll_until_decision(self):
+        start = time.perf_counter()
+        if self.queue_scan:
+            result = self._poll_with_queue_scan()
+        else:
+            result = super()._poll_until_decision()
+        self.time_loop += time.perf_counter() - start
+        return result
+
+    def _poll_with_queue_scan(self):
+        # 기존 polling 방식 (동일 시점의 이벤트를 확인할 때마다 이벤트 큐 전체를 탐색)
+        while True:
+            if self.monitor.num_plates_remaining == 0:
+                return False, None
+
+            flag, info = self.monitor.request_scheduling()
+            if flag:
+                while self.env.now in [event[0] for event in self.env._queue]:
+                    self.env.step()
+                return self.monitor.request_scheduling()
+            elif self.env.peek() == simpy.core.Infinity:
+                return False, None
+            else:
+                self.env.step()
+
+    def _fast_forward_until_decision(self):
+        start = time.perf_counter()
+        result = super()._fast_forward_until_decision()
+        self.time_loop += time.perf_counter() - start
+        return result
+
+
+def run_episode(config, run_mode, seed=0, count_events=False):
+    # run_mode: polling / decision 또는 기존 polling 방식(polling-scan)
+    env = TimedSteelStockyard(DataGenerator(config), config, run_mode=run_mode.replace("-scan", ""), seed=seed,
+                              queue_scan=run_mode.endswith("-scan"))
+
+    # 처리된 SimPy 이벤트 수 측정 (시간 측정과는 별도의 실행에서만 사용)
+    num_events = [0]
+    if count_events:
+        step = simpy.Environment.step
+
+        def counting_step(self):
+            num_events[0] += 1
+            step(self)
+
+        simpy.Environment.step = counting_step
+
+    try:
+        start = time.perf_counter()
+        actions, _ = run_random_episode(env, seed)
+        num_decisions = len(actions)
+        elapsed = time.perf_counter() - start
+    finally:
+        if count_events:
+            simpy.Environment.step = step
+
+    return {"time_total": elapsed, "time_loop": env.time_loop, "num_decisions": num_decisions,
+            "num_events": num_events[0], "makespan": env.env.now}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_episodes", type=int, default=3)
+    parser.add_argument("--num_repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    # 두 실행 모드는 동일한 시드에서 동일한 궤적을 생성하므로 이벤트 수는 polling 모드 기준으로 측정
+    num_events = 0
+    for seed in range(args.num_episodes):
+        num_events += run_episode(config, "polling", seed, count_events=True)["num_events"]
+
+    run_modes = ["polling-scan", "polling", "decision"]
+    for run_mode in run_modes:
+        run_episode(config, run_mode, 0)
+
+    # 실행 모드를 번갈아 반복 실행하여 측정 중의 부하 변화가 모든 모드에 같이 반영되도록 하고 최소 시간 사용
+    results = {run_mode: [] for run_mode in run_modes}
+    for _ in range(args.num_repeats):
+        for run_mode in run_modes:
+            episodes = [run_episode(config, run_mode, seed) for seed in range(args.num_episodes)]
+            results[run_mode].append((sum(result["time_loop"] for result in episodes),
+                                      sum(result["time_total"] for result in episodes),
+                                      sum(result["num_decisions"] for result in episodes)))
+
+    print("run mode     | episodes | events | decisions | loop time [s] | events/s | decisions/s")
+    for run_mode in run_modes:
+        time_loop = min(result[0] for result in results[run_mode])
+        time_total = min(result[1] for result in results[run_mode])
+        num_decisions = results[run_mode][0][2]
+        print("%12s | %8d | %6d | %9d | %13.3f | %8.0f | %11.0f"
+              % (run_mode, args.num_episodes, num_events, num_decisions, time_loop,
+                 num_events / time_loop, num_decisions / time_total))
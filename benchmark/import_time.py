@@ -0,0 +1,79 @@
+import sys
+import json
+import argparse
+import subprocess
+
+
+# 작업 프로세스의 시작 비용 측정: 패키지 import 시간(python -X importtime)과 실행 후 모듈 / 메모리 사용량
+# 규칙 기반 시뮬레이션(simulate)만 사용하는 경우 torch, PyG, pandas를 불러오지 않아야 함
+
+heavy_modules = ("torch", "torch_geometric", "pandas")
+
+scripts = {
+    "import": "import environment.env\n",
+    "simulate": "from environment.data import DataGenerator\n"
+                "from environment.env import SteelStockyard\n"
+                "env = SteelStockyard(DataGenerator(config), config, seed=0)\n"
+                "env.simulate('SETT')\n",
+    "step": "from environment.data import DataGenerator\n"
+            "from environment.env import SteelStockyard\n"
+            "env = SteelStockyard(DataGenerator(config), config, seed=0)\n"
+            "state, mask, mode = env.reset()\n"
+            "for _ in range(100):\n"
+            "    action = int(mask.nonzero()[0])\n"
+            "    state, reward, done, mask, mode = env.step(action, mode)\n",
+}
+
+report = ("import sys, json, resource\n"
+          "print(json.dumps({'modules': [name for name in %r if name in sys.modules],\n"
+          "                  'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))\n")
+
+
+def run_script(name, config_path):
+    # 새 인터프리터에서 실행하고 최상위 모듈별 import 시간 [ms]과 불러온 대형 모듈, 최대 RSS [MB] 반환
+    source = "import json\nconfig = json.load(open(%r))\n" % config_path + scripts[name] + report % (heavy_modules,)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", source],
+                            capture_output=True, text=True, check=True)
+
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        # 들여쓰기가 없는 모듈만 최상위 import (하위 모듈의 시간은 cumulative에 포함)
+        if not module.startswith("  "):
+            import_times[module.strip()] = int(cumulative) / 1e3
+
+    return import_times, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--budget_ms", type=float, default=500.0,
+                        help="import time budget of the pure simulation path")
+    parser.add_argument("--num_repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    print("path     | import [ms] | peak RSS [MB] | heavy modules loaded")
+    results = {}
+    for name in scripts:
+        # 디스크 캐시 등의 영향을 줄이기 위해 반복 실행 중 가장 짧은 import 시간 사용
+        runs = [run_script(name, args.config) for _ in range(args.num_repeats)]
+        import_times, info = min(runs, key=lambda run: sum(run[0].values()))
+        results[name] = (import_times, info)
+        print("%-8s | %11.1f | %13.1f | %s" % (name, sum(import_times.values()), info["rss_mb"],
+                                               ", ".join(info["modules"]) or "-"))
+
+    print("slowest top-level imports of the simulate path")
+    import_times, info = results["simulate"]
+    for module, elapsed in sorted(import_times.items(), key=lambda item: -item[1])[:args.top]:
+        print("  %-30s %8.1f ms" % (module, elapsed))
+
+    total = sum(import_times.values())
+    if info["modules"] or total > args.budget_ms:
+        print("simulate path exceeds the budget: %.1f ms (budget %.1f ms), heavy modules: %s"
+              % (total, args.budget_ms, ", ".join(info["modules"]) or "-"))
+        raise SystemExit(1)
+    print("simulate path within budget: %.1f ms (budget %.1f ms)" % (total, args.budget_ms))
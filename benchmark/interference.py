@@ -0,0 +1,95 @@
+import time
+import argparse
+import numpy as np
+
+from environment.trajectory import Leg, legs_conflict
+
+
+def reference_check(coord, target_coord, x_velocity, y_velocity, other_coord, other_leg_coord, other_velocity,
+                    elapsed_time, crane_id, safety_margin):
+    # 기존 Crane.check_interference의 계산 (NumPy 스칼라 연산)
+    dx = target_coord[0] - coord[0]
+    dy = target_coord[1] - coord[1]
+    direction = np.sign(dx)
+    moving_time = max(abs(dx) / x_velocity, abs(dy) / y_velocity)
+
+    dx_other = other_leg_coord[0] - other_coord[0]
+    dy_other = other_leg_coord[1] - other_coord[1]
+    direction_other = np.sign(dx_other)
+    moving_time_other = max(abs(dx_other) / other_velocity[0], abs(dy_other) / other_velocity[1])
+    moving_time_other = moving_time_other - elapsed_time
+
+    min_moving_time = min(moving_time, moving_time_other)
+    xcoord = coord[0] + min(min_moving_time * x_velocity, abs(dx)) * direction
+    xcoord_other = other_coord[0] + min((min_moving_time + elapsed_time) * other_velocity[0],
+                                        abs(dx_other)) * direction_other
+
+    if crane_id == 0 and xcoord >= xcoord_other - safety_margin:
+        return True, other_leg_coord[0] - safety_margin - 1
+    elif crane_id == 1 and xcoord <= xcoord_other + safety_margin:
+        return True, other_leg_coord[0] + safety_margin + 1
+    else:
+        return False, None
+
+
+def sample_cases(rng, num_cases, bay_range=(0, 43), velocity=(0.5, 1.0)):
+    # 시뮬레이션과 같은 범위의 정수 좌표 및 경과 시간으로 무작위 이동 구간 쌍 생성
+    cases = []
+    for _ in range(num_cases):
+        crane_id = int(rng.integers(2))
+        coord = (float(rng.integers(bay_range[0], bay_range[1] + 1)), float(rng.integers(2)))
+        target_coord = (int(rng.integers(bay_range[0], bay_range[1] + 1)), int(rng.integers(2)))
+        other_coord = (float(rng.integers(bay_range[0], bay_range[1] + 1)), float(rng.integers(2)))
+        other_leg_coord = (float(rng.integers(bay_range[0], bay_range[1] + 1)), float(rng.integers(2)))
+        other_duration = max(abs(other_leg_coord[0] - other_coord[0]) / velocity[0],
+                             abs(other_leg_coord[1] - other_coord[1]) / velocity[1])
+        elapsed_time = float(rng.integers(0, int(other_duration) + 1))
+        cases.append((crane_id, coord, target_coord, other_coord, other_leg_coord, elapsed_time))
+    return cases
+
+
+def get_legs(cases, velocity=(0.5, 1.0)):
+    # 기존 계산과 같은 시각(now = 100 + 경과 시간) 기준의 (왼쪽, 오른쪽) 이동 구간 쌍
+    legs = []
+    for crane_id, coord, target_coord, other_coord, other_leg_coord, elapsed_time in cases:
+        now = 100.0 + elapsed_time
+        leg = Leg(now, coord, target_coord[0] - coord[0], target_coord[1] - coord[1], velocity[0], velocity[1])
+        other_leg = Leg(100.0, other_coord, other_leg_coord[0] - other_coord[0], other_leg_coord[1] - other_coord[1],
+                        velocity[0], velocity[1])
+        legs.append((leg, other_leg, now) if crane_id == 0 else (other_leg, leg, now))
+    return legs
+
+
+def measure(cases, velocity=(0.5, 1.0), safety_margin=5):
+    # 기존 계산(두 크레인 중 먼저 이동을 마치는 시점의 위치만 비교)과 이동 구간 전체를 비교하는 계산의 처리 속도와
+    # 기존 계산이 놓치는 간섭의 비율
+    legs = get_legs(cases, velocity)
+
+    start = time.perf_counter()
+    expected = [reference_check(coord, target_coord, velocity[0], velocity[1], other_coord, other_leg_coord, velocity,
+                                elapsed_time, crane_id, safety_margin)[0]
+                for crane_id, coord, target_coord, other_coord, other_leg_coord, elapsed_time in cases]
+    time_reference = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [legs_conflict(left_leg, right_leg, safety_margin, now) for left_leg, right_leg, now in legs]
+    time_exact = time.perf_counter() - start
+
+    # 시작 시점에 이미 안전 거리 이내인 쌍은 제외
+    valid = [right_leg.x_at(now) - left_leg.x_at(now) > safety_margin for left_leg, right_leg, now in legs]
+    num_missed = sum(flag and not reference and ok for reference, flag, ok in zip(expected, actual, valid))
+    return time_reference, time_exact, num_missed / max(sum(valid), 1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_cases", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    cases = sample_cases(rng, args.num_cases)
+    time_reference, time_exact, missed = measure(cases)
+    print("implementation        | checks/s | relative")
+    for label, elapsed in [("endpoint (numpy)", time_reference), ("exact (legs_conflict)", time_exact)]:
+        print("%21s | %8.0f | %7.2fx" % (label, args.num_cases / elapsed, time_reference / elapsed))
+    print("conflicts missed by the endpoint check: %.2f%% of leg pairs" % (missed * 100))
@@ -0,0 +1,100 @@
+import json
+import time
+import argparse
+import itertools
+import numpy as np
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from environment.simulation import LoadingPlanner
+
+
+def plan_brute_force(planner, crane):
+    # 후보 파일의 모든 조합과 파일별 강재 수의 모든 조합을 나열하는 기준 구현 (최선 계획의 점수만 반환)
+    required, candidates = planner.get_candidates(crane)
+    weights = planner.plate_table.weight
+    best = None
+    for num_piles in range(1, planner.pile_limit + 1):
+        for combination in itertools.combinations(candidates, num_piles):
+            if required is not None and combination[0][0] is not required:
+                continue
+            for counts in itertools.product(*[range(1, max_plates + 1) for _, max_plates in combination]):
+                num_plates = sum(counts)
+                if num_plates > planner.number_limit:
+                    continue
+                weight = sum(weights[location.plates[-count:]].sum()
+                             for (location, _), count in zip(combination, counts))
+                if weight > planner.weight_limit and num_plates > 1:
+                    continue
+                plan = [(location, count) for (location, _), count in zip(combination, counts)]
+                _, distance = planner.get_route(crane, plan)
+                score = (num_plates, -distance)
+                best = score if best is None or score > best else best
+    return best
+
+
+class TimedLoadingPlanner(LoadingPlanner):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.time_planner = 0.0
+        self.time_brute_force = 0.0
+        self.num_calls = 0
+
+    def plan(self, crane):
+        # 두 구현의 탐색 시간을 각각 측정하고 최선 계획의 점수가 동일한지 확인
+        start = time.perf_counter()
+        best, best_by_location = super().plan(crane)
+        self.time_planner += time.perf_counter() - start
+
+        start = time.perf_counter()
+        score = plan_brute_force(self, crane)
+        self.time_brute_force += time.perf_counter() - start
+        self.num_calls += 1
+
+        if best is not None:
+            plan = [(crane.locations[location_id], best.count(location_id)) for location_id in dict.fromkeys(best)]
+            assert (len(best), -self.get_route(crane, plan)[1]) == score
+        return best, best_by_location
+
+
+class TimedSteelStockyard(SteelStockyard):
+    def _build_simulation_model(self):
+        model = super()._build_simulation_model()
+        monitor = model[-1]
+        planner = monitor.planner
+        monitor.planner = TimedLoadingPlanner(model[3], planner.plate_table, planner.feasibility,
+                                              planner.weight_prefix, planner.weight_limit, planner.number_limit,
+                                              planner.pile_limit)
+        return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_episodes", type=int, default=2)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    print("loading mode | episodes | makespan (mean) | moves (mean)")
+    for loading_mode in ["single", "greedy"]:
+        makespans, num_moves = [], []
+        for seed in range(args.num_episodes):
+            env = SteelStockyard(DataGenerator(config), config, seed=seed, loading_mode=loading_mode)
+            row = env.simulate("SETT")
+            makespans.append(row["makespan"])
+            num_moves.append(sum(value for key, value in row.items() if key.endswith("/num_moves")))
+        print("%12s | %8d | %15.1f | %12.1f" % (loading_mode, args.num_episodes, np.mean(makespans), np.mean(num_moves)))
+
+    time_planner, time_brute_force, num_calls = 0.0, 0.0, 0
+    for seed in range(args.num_episodes):
+        env = TimedSteelStockyard(DataGenerator(config), config, seed=seed)
+        env.simulate("SETT")
+        time_planner += env.monitor.planner.time_planner
+        time_brute_force += env.monitor.planner.time_brute_force
+        num_calls += env.monitor.planner.num_calls
+
+    print("plans | planner [us] | brute force [us] | speedup")
+    print("%5d | %12.1f | %16.1f | %6.1fx" % (num_calls, 1e6 * time_planner / num_calls,
+                                            1e6 * time_brute_force / num_calls, time_brute_force / time_planner))
@@ -0,0 +1,95 @@
+import json
+import time
+import argparse
+import numpy as np
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from environment.simulation import InputPoint, OutputPoint
+from benchmark.common import run_random_episode
+
+
+def get_mask_from_scratch(env, info):
+    # 의사결정 시점마다 모든 위치를 순회하며 작업 가능 여부를 확인하는 기준 구현
+    mask = np.zeros((len(env.pile_list), len(env.crane_list)), dtype=bool)
+    crane = env.crane_in_decision
+    if crane is None:
+        return mask
+
+    if info == "prioritizing":
+        conflict_crane = crane.conflict_crane
+        mask[crane.target_location.id, crane.id] = True
+        mask[conflict_crane.target_location.id, conflict_crane.id] = True
+    elif info == "sequencing":
+        x_min, x_max = crane.x_range
+        reserved = set()
+        for other_crane in crane.other_cranes:
+            if other_crane.offset_location is not None:
+                reserved.add(other_crane.offset_location.id)
+            reserved.update(other_crane.loading_location_ids)
+        for location_id in range(len(env.pile_list)):
+            location = crane.locations[location_id]
+            if location_id in reserved or not x_min <= location.coord[0] <= x_max:
+                continue
+            if type(location) is OutputPoint:
+                if location_id not in env.monitor.queue_retrieval:
+                    continue
+                for pile in env.piles.values():
+                    if pile.type == "retrieval" and len(pile.plates) > 0 \
+                            and env.plate_table.to_location[pile.plates[-1]] == location_id \
+                            and x_min <= pile.coord[0] <= x_max:
+                        mask[location_id, crane.id] = True
+                        break
+            elif type(location) is InputPoint or location.type == "storage":
+                if len(location.plates) == 0:
+                    continue
+                to_location = crane.locations[env.plate_table.to_location[location.plates[-1]]]
+                if x_min <= to_location.coord[0] <= x_max:
+                    mask[location_id, crane.id] = True
+
+    return mask
+
+
+class TimedSteelStockyard(SteelStockyard):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.time_scratch = 0.0
+        self.time_indexed = 0.0
+        self.num_calls = 0
+
+    def _get_mask(self, info):
+        # 두 구현의 마스크 계산 시간을 각각 측정하고 결과가 동일한지 확인
+        start = time.perf_counter()
+        mask_scratch = get_mask_from_scratch(self, info)
+        self.time_scratch += time.perf_counter() - start
+
+        start = time.perf_counter()
+        mask = super()._get_mask(info)
+        self.time_indexed += time.perf_counter() - start
+        self.num_calls += 1
+
+        assert np.array_equal(mask_scratch, mask)
+        return mask
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_episodes", type=int, default=2)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    time_scratch, time_indexed, num_calls = 0.0, 0.0, 0
+    for seed in range(args.num_episodes):
+        env = TimedSteelStockyard(DataGenerator(config), config, seed=seed)
+        run_random_episode(env, seed)
+        time_scratch += env.time_scratch
+        time_indexed += env.time_indexed
+        num_calls += env.num_calls
+
+    print("episodes | mask calls | from scratch [us] | feasibility index [us] | speedup")
+    print("%8d | %10d | %17.1f | %22.1f | %6.1fx"
+          % (args.num_episodes, num_calls, 1e6 * time_scratch / num_calls, 1e6 * time_indexed / num_calls,
+             time_scratch / time_indexed))
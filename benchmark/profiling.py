@@ -0,0 +1,55 @@
+import json
+import time
+import argparse
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from benchmark.common import run_random_episode
+from benchmark.scaling import scale_config
+
+
+def run_episode(config, seed, **kwargs):
+    # 무작위 행동으로 에피소드를 실행하고 보상, 이벤트 로그, 실행 시간 반환
+    env = SteelStockyard(DataGenerator(config), config, record_events=True, seed=seed, **kwargs)
+    start = time.perf_counter()
+    _, rewards = run_random_episode(env, seed)
+    elapsed = time.perf_counter() - start
+    return env, rewards, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_cranes", type=int, default=2)
+    parser.add_argument("--num_repeats", type=int, default=3)
+    parser.add_argument("--trace_path", type=str, default=None, help="Chrome trace JSON file (not saved if omitted)")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    if args.num_cranes != 2:
+        config = scale_config(config, 2, 44, args.num_cranes)
+
+    # 계측 여부와 관계없이 동일한 에피소드가 실행되는지 확인하고 계측에 따른 실행 시간 증가 측정
+    time_plain, time_profiled = [], []
+    for _ in range(args.num_repeats):
+        env_plain, rewards_plain, elapsed = run_episode(config, 0)
+        time_plain.append(elapsed)
+        env, rewards, elapsed = run_episode(config, 0, profile=True,
+                                            profile_options={"trace": args.trace_path is not None})
+        time_profiled.append(elapsed)
+        assert rewards == rewards_plain
+        assert env.monitor.get_logs().equals(env_plain.monitor.get_logs())
+
+    report = env.profile_report(args.trace_path)
+    print("episode [s]: %.3f (profile disabled) / %.3f (profile enabled)" % (min(time_plain), min(time_profiled)))
+    print("phase              |  calls | total [ms] | self [ms] | mean [us] | self share")
+    for name, phase in report["phases"].items():
+        print("%-18s | %6d | %10.1f | %9.1f | %9.1f | %9.1f%%"
+              % (name, phase["calls"], phase["total_ms"], phase["self_ms"], phase["mean_us"],
+                 phase["self_share"] * 100))
+    print("event type         |  count")
+    for kind, count in report["events"].items():
+        print("%-18s | %6d" % (kind, count))
+    if args.trace_path is not None:
+        print("trace saved to %s" % args.trace_path)
@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from environment.recorder import EventRecorder
+from benchmark.common import run_random_episode
+
+
+class ListRecorder:
+    # 기존 Monitor의 기록 방식 (열별 Python 리스트)
+    def __init__(self):
+        self.columns = [[] for _ in range(6)]
+
+    def record(self, time, event, crane=None, location=None, plate=None, tag=None):
+        self.columns[0].append(time)
+        self.columns[1].append(event)
+        self.columns[2].append(crane)
+        self.columns[3].append(location)
+        self.columns[4].append(plate)
+        self.columns[5].append(tag)
+
+
+def run_episode(config, seed, record_events, log_options=None):
+    env = SteelStockyard(DataGenerator(config), config, record_events=record_events, seed=seed,
+                         log_options=log_options)
+
+    start = time.perf_counter()
+    run_random_episode(env, seed)
+    elapsed = time.perf_counter() - start
+
+    num_events = env.monitor.recorder.num_events if record_events else 0
+    return elapsed, num_events
+
+
+def get_events(config, seed):
+    # 에피소드에서 기록되는 이벤트 목록 (Time, Event, Crane, Location, Plate, Tag)
+    env = SteelStockyard(DataGenerator(config), config, record_events=True, seed=seed)
+    run_random_episode(env, seed)
+    logs = env.monitor.get_logs()
+    logs = logs.astype(object).where(logs.notna(), None)
+    return [(float(row[0]),) + row[1:] for row in logs.itertuples(index=False, name=None)]
+
+
+def replay_events(events, log_options=None):
+    # 에피소드의 이벤트를 같은 순서로 다시 기록하는 데 걸리는 시간 (파일 기록 및 닫기 포함)
+    recorder = EventRecorder(**(log_options or {}))
+    start = time.perf_counter()
+    for event in events:
+        recorder.record(*event)
+    recorder.close()
+    return time.perf_counter() - start
+
+
+def measure_record(make_recorder, num_events, num_locations=84, num_plates=3000):
+    # 한 달 규모의 이벤트 스트림을 가정한 기록 비용 및 메모리 사용량 측정 (메모리는 별도 실행에서 측정)
+    events = ["Move_from", "Move_to", "Pick_up", "Put_down"]
+    cranes = ["Crane-1", "Crane-2"]
+    locations = ["L%02d" % i for i in range(num_locations)]
+    plates = ["SP-%05d" % i for i in range(num_plates)]
+    rows = [(float(i), events[i % 4], cranes[i % 2], locations[i % num_locations],
+             plates[i % num_plates] if i % 4 >= 2 else None) for i in range(num_events)]
+
+    results = []
+    for trace in [False, True]:
+        recorder = make_recorder()
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        for row in rows:
+            recorder.record(*row)
+        if hasattr(recorder, "close"):
+            recorder.close()
+        results.append(time.perf_counter() - start)
+        if trace:
+            results.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return results[0], results[2]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_episodes", type=int, default=2)
+    parser.add_argument("--num_repeats", type=int, default=3)
+    parser.add_argument("--num_events", type=int, nargs="+", default=[20000, 1000000])
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    tmp_dir = tempfile.mkdtemp()
+    settings = [("off", False, None),
+                ("memory", True, None),
+                ("ring buffer", True, {"max_events": 10000}),
+                ("parquet", True, {"path": os.path.join(tmp_dir, "events.parquet")}),
+                ("arrow", True, {"path": os.path.join(tmp_dir, "events.arrow"), "file_format": "arrow"})]
+
+    # 시나리오 / 레이아웃 캐시와 지연 import(pyarrow 등)가 측정 시간에 포함되지 않도록 모든 설정을 한 번씩 실행
+    for label, record_events, log_options in settings:
+        run_episode(config, 0, record_events, log_options)
+
+    # 에피소드 실행 시간은 같은 설정에서도 실행마다 10% 이상 차이가 나므로 기록 비용은 에피소드 시간의 차이 대신
+    # 각 에피소드의 이벤트를 설정별로 다시 기록하는 시간으로 측정 (모든 설정을 반복 실행 중 최소 시간으로 비교)
+    time_off = min(sum(run_episode(config, seed, False)[0] for seed in range(args.num_episodes))
+                   for _ in range(args.num_repeats))
+    events = [get_events(config, seed) for seed in range(args.num_episodes)]
+    num_events = sum(len(episode_events) for episode_events in events)
+
+    print("episode time without recording: %.3f s (%d episodes, %d events)"
+          % (time_off, args.num_episodes, num_events))
+    print("recording | record time [s] | overhead")
+    for label, record_events, log_options in settings[1:]:
+        elapsed = min(sum(replay_events(episode_events, log_options) for episode_events in events)
+                      for _ in range(args.num_repeats))
+        print("%11s | %15.3f | %7.1f%%" % (label, elapsed, 100.0 * elapsed / time_off))
+
+    print("recorder | events | record [us/event] | peak memory [MB]")
+    for num_events in args.num_events:
+        for label, make_recorder in [("lists", ListRecorder), ("columnar", EventRecorder),
+                                     ("parquet", lambda: EventRecorder(path=os.path.join(tmp_dir, "stream.parquet"))),
+                                     ("ring", lambda: EventRecorder(max_events=10000))]:
+            elapsed, peak = measure_record(make_recorder, num_events)
+            print("%8s | %7d | %17.3f | %16.1f" % (label, num_events, 1e6 * elapsed / num_events, peak / 2 ** 20))
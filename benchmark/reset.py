@@ -0,0 +1,45 @@
+import json
+import time
+import argparse
+import tracemalloc
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+
+
+def measure_reset(config, num_resets, seed=0):
+    env = SteelStockyard(DataGenerator(config), config, seed=seed)
+    # 첫 reset의 지연 import(torch / PyG)와 캐시 생성이 측정 시간에 포함되지 않도록 한 번 실행
+    env.reset()
+
+    start = time.perf_counter()
+    for _ in range(num_resets):
+        env.reset()
+    elapsed = (time.perf_counter() - start) / num_resets
+
+    # 초기화된 시뮬레이션 모델이 차지하는 메모리 측정
+    env.env = env.input_points = env.output_points = env.piles = env.cranes = env.monitor = None
+    tracemalloc.start()
+    env.reset()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, memory, len(env.plate_table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_resets", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    print("plates per pile | num plates | reset [ms] | memory [KB]")
+    for num_plates in [50, 150, 300]:
+        config["num_plates_for_storage"] = num_plates
+        config["num_plates_for_reshuffle"] = num_plates
+        config["num_plates_for_retrieval"] = num_plates
+        elapsed, memory, total_plates = measure_reset(config, args.num_resets)
+        print("%15d | %10d | %10.3f | %11.1f" % (num_plates, total_plates, elapsed * 1e3, memory / 1024))
@@ -0,0 +1,87 @@
+import json
+import time
+import argparse
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from environment.trajectory import get_x_ranges
+from benchmark.common import run_random_episode
+
+
+def scale_config(config, num_rows, num_bays, num_cranes):
+    # 기본 설정의 베이 좌표를 비율로 확장하고 작업 파일 수는 적치장 면적에 비례하여 증가
+    base_rows = config["row_range"][1] - config["row_range"][0] + 1
+    base_bays = config["bay_range"][1] - config["bay_range"][0] + 1
+    ratio = (num_bays - 1) / (base_bays - 1)
+    area_ratio = num_rows * num_bays / (base_rows * base_bays)
+
+    def scale_x(x):
+        return int(round(x * ratio))
+
+    def scale_keys(values):
+        return {str(scale_x(int(key))): value for key, value in values.items()}
+
+    scaled = dict(config)
+    scaled["row_range"] = [0, num_rows - 1]
+    scaled["bay_range"] = [0, num_bays - 1]
+    scaled["input_point_coords"] = [scale_x(x) for x in config["input_point_coords"]]
+    scaled["output_point_coords"] = [scale_x(x) for x in config["output_point_coords"]]
+    scaled["storage_pile_range"] = {key: [scale_x(x_min), scale_x(x_max)]
+                                    for key, (x_min, x_max) in config["storage_pile_range"].items()}
+    scaled["retrieval_pile_range"] = scale_keys({key: [scale_x(x_min), scale_x(x_max)]
+                                                 for key, (x_min, x_max) in config["retrieval_pile_range"].items()})
+    scaled["inter_retrieval_times"] = scale_keys(config["inter_retrieval_times"])
+    scaled["num_from_piles_for_retrieval"] = scale_keys(config["num_from_piles_for_retrieval"])
+    scaled["num_to_piles_for_storage"] = [max(1, int(round(k * area_ratio))) for k in config["num_to_piles_for_storage"]]
+    scaled["num_from_piles_for_reshuffle"] = max(1, int(round(config["num_from_piles_for_reshuffle"] * area_ratio)))
+    scaled["num_to_piles_for_reshuffle"] = max(1, int(round(config["num_to_piles_for_reshuffle"] * area_ratio)))
+
+    # 크레인은 각자의 이동 가능 범위 내에서 레일 위에 균등하게 배치
+    x_ranges = get_x_ranges(scaled["bay_range"], config["safety_margin"], num_cranes)
+    scaled["crane_initial_coords"] = [[int(round(x_min + (x_max - x_min) * i / max(num_cranes - 1, 1))), 0]
+                                      for i, (x_min, x_max) in enumerate(x_ranges)]
+    return scaled
+
+
+def run_episode(config, seed, rule=None):
+    # rule이 주어지면 규칙 기반으로, 없으면 무작위 행동으로 에피소드 실행
+    env = SteelStockyard(DataGenerator(config), config, record_events=True, seed=seed,
+                         log_options={"max_events": 4096})
+    start = time.perf_counter()
+    if rule is not None:
+        env.simulate(rule)
+        num_decisions = 0
+    else:
+        actions, _ = run_random_episode(env, seed)
+        num_decisions = len(actions)
+    elapsed = time.perf_counter() - start
+
+    assert env.monitor.num_plates_remaining == 0
+    return elapsed, env.monitor.recorder.num_events, num_decisions, env.env.now
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_episodes", type=int, default=1)
+    parser.add_argument("--rule", type=str, default="SETT", help="dispatching rule (random actions if 'none')")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    rule = None if args.rule.lower() == "none" else args.rule
+
+    print("rows | bays | cranes | locations | events | makespan | episode time [s] | events/s")
+    for num_rows, num_bays, num_cranes in [(2, 44, 2), (2, 44, 3), (4, 44, 2), (4, 88, 2), (4, 88, 3), (4, 88, 4),
+                                           (6, 132, 4)]:
+        scaled = scale_config(config, num_rows, num_bays, num_cranes)
+        elapsed, num_events, makespan = 0.0, 0, 0.0
+        for seed in range(args.num_episodes):
+            result = run_episode(scaled, seed, rule)
+            elapsed += result[0]
+            num_events += result[1]
+            makespan += result[3]
+        num_locations = len(SteelStockyard(DataGenerator(scaled), scaled, seed=0).pile_list)
+        print("%4d | %4d | %6d | %9d | %6d | %8.0f | %16.3f | %8.0f"
+              % (num_rows, num_bays, num_cranes, num_locations, num_events / args.num_episodes,
+                 makespan / args.num_episodes, elapsed / args.num_episodes, num_events / elapsed))
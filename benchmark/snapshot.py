@@ -0,0 +1,101 @@
+import json
+import time
+import pickle
+import argparse
+import numpy as np
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from benchmark.common import run_random_episode
+from benchmark.scaling import scale_config
+
+
+def run_with_snapshots(config, seed, interval, **kwargs):
+    # 무작위 행동으로 에피소드를 실행하며 interval번의 의사결정마다 스냅샷 저장 (0이면 저장하지 않음)
+    env = SteelStockyard(DataGenerator(config), config, record_events=True, seed=seed, **kwargs)
+    snapshots = []
+
+    def save_snapshot(index, state, mask, mode):
+        if interval > 0 and index % interval == interval // 2:
+            snapshot = pickle.loads(pickle.dumps(env.snapshot()))
+            snapshots.append((index, snapshot, env.monitor.recorder.num_events, state, mask, mode))
+
+    actions, rewards = run_random_episode(env, seed, save_snapshot)
+    return env, actions, rewards, snapshots
+
+
+def check_restore(config, seed, interval, **kwargs):
+    # 스냅샷에서 복원한 시뮬레이션에 이후 행동을 재실행하여 원래 에피소드와 로그 / 보상 / 지표가 동일한지 확인
+    env, actions, rewards, snapshots = run_with_snapshots(config, seed, interval, **kwargs)
+    logs = env.monitor.get_logs()
+    for index, snapshot, num_events, state, mask, mode in snapshots:
+        restored = SteelStockyard(DataGenerator(config), config, record_events=True, seed=seed, **kwargs)
+        restored_state, restored_mask, restored_mode = restored.restore(snapshot)
+        assert restored_mode == mode and np.array_equal(restored_mask.numpy(), mask.numpy())
+        assert np.array_equal(restored_state["crane"].x.numpy(), state["crane"].x.numpy())
+        assert np.array_equal(restored_state["pile"].x.numpy(), state["pile"].x.numpy())
+
+        mode = restored_mode
+        for (action, original_mode), reward in zip(actions[index:], rewards[index:]):
+            assert mode == original_mode
+            _, restored_reward, done, _, mode = restored.step(action, mode)
+            assert restored_reward == reward
+        assert done
+
+        restored_logs = restored.monitor.get_logs()
+        assert logs.iloc[num_events:].reset_index(drop=True).equals(restored_logs)
+        assert restored.get_metrics() == env.get_metrics()
+    return len(snapshots)
+
+
+def measure(config, seed, num_repeats):
+    # 에피소드 중간 시점의 스냅샷 저장 / 복원 시간과 처음부터 같은 시점까지 재실행하는 시간 비교
+    env, actions, _, _ = run_with_snapshots(config, seed, 0)
+    index = len(actions) // 2
+
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        env.reset(seed=env.episode_seed)
+        for action, mode in actions[:index]:
+            env.step(action, mode)
+    time_replay = (time.perf_counter() - start) / num_repeats
+
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        snapshot = env.snapshot()
+    time_snapshot = (time.perf_counter() - start) / num_repeats
+    size = len(pickle.dumps(snapshot))
+
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        env.restore(snapshot)
+    time_restore = (time.perf_counter() - start) / num_repeats
+
+    return index, time_replay, time_snapshot, time_restore, size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_episodes", type=int, default=2)
+    parser.add_argument("--interval", type=int, default=300)
+    parser.add_argument("--num_repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    # 2대 / 3대 크레인, 적재 계획 결정 방식별로 복원 후 재실행 결과가 원래 에피소드와 동일한지 확인
+    num_checked = 0
+    for num_cranes in [2, 3]:
+        scaled = config if num_cranes == 2 else scale_config(config, 2, 44, num_cranes)
+        for loading_mode in ["single", "greedy", "decision"]:
+            for seed in range(args.num_episodes):
+                num_checked += check_restore(scaled, seed, args.interval, loading_mode=loading_mode)
+    print("restored snapshots: %d (all equivalent)" % num_checked)
+
+    print("decisions replayed | replay [ms] | snapshot [us] | restore [us] | snapshots/s | restores/s | size [KB]")
+    index, time_replay, time_snapshot, time_restore, size = measure(config, 0, args.num_repeats)
+    print("%18d | %11.2f | %13.1f | %12.1f | %11.0f | %10.0f | %9.1f"
+          % (index, time_replay * 1e3, time_snapshot * 1e6, time_restore * 1e6, 1 / time_snapshot,
+             1 / time_restore, size / 1024))
@@ -0,0 +1,105 @@
+import json
+import time
+import argparse
+import torch
+
+from torch_geometric.data import HeteroData
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from environment.simulation import OutputPoint
+
+
+def get_state_from_scratch(env, info):
+    # 의사결정 시점마다 파이썬 리스트로부터 HeteroData를 새로 생성하는 기준 구현
+    state = HeteroData()
+
+    crane_features = []
+    for crane in env.cranes.values():
+        target_xcoord = crane.target_location_coord[0] if crane.status != "idle" else crane.current_location_coord[0]
+        crane_features.append([crane.current_location_coord[0] / env.bay_range[1],
+                               target_xcoord / env.bay_range[1]])
+
+    pile_features = []
+    for location_id, name in enumerate(env.pile_list):
+        location = env.locations[location_id]
+        if type(location) is OutputPoint:
+            feature = [1.0 if location_id in env.monitor.queue_retrieval else 0.0]
+            feature += [0.0 for _ in range(env.look_ahead)]
+        else:
+            feature = [len(location.plates) / env.max_num_plates]
+            for i in range(env.look_ahead):
+                if i < len(location.plates):
+                    to_location = env.locations[env.plate_table.to_location[location.plates[-1 - i]]]
+                    feature.append((to_location.coord[0] + 1) / (env.bay_range[1] + 1))
+                else:
+                    feature.append(0.0)
+        pile_features.append(feature)
+
+    state["crane"].x = torch.tensor(crane_features, dtype=torch.float32)
+    state["pile"].x = torch.tensor(pile_features, dtype=torch.float32)
+
+    edge_crane_to_pile = [[], []]
+    for i in range(len(env.crane_list)):
+        for j in range(len(env.pile_list)):
+            edge_crane_to_pile[0].append(i)
+            edge_crane_to_pile[1].append(j)
+    state["crane", "moving", "pile"].edge_index = torch.tensor(edge_crane_to_pile, dtype=torch.long)
+    state["pile", "moving_rev", "crane"].edge_index = torch.tensor(edge_crane_to_pile[::-1], dtype=torch.long)
+
+    mask = env._get_mask(info)
+
+    return state, torch.from_numpy(mask.reshape(-1))
+
+
+class TimedSteelStockyard(SteelStockyard):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.time_scratch = 0.0
+        self.time_incremental = 0.0
+        self.num_calls = 0
+
+    def _get_state(self, info):
+        # 두 구현의 상태 생성 시간을 각각 측정하고 결과가 동일한지 확인
+        start = time.perf_counter()
+        state_scratch, _ = get_state_from_scratch(self, info)
+        self.time_scratch += time.perf_counter() - start
+
+        start = time.perf_counter()
+        state, mask = super()._get_state(info)
+        self.time_incremental += time.perf_counter() - start
+        self.num_calls += 1
+
+        assert torch.equal(state_scratch["crane"].x, state["crane"].x)
+        assert torch.equal(state_scratch["pile"].x, state["pile"].x)
+
+        return state, mask
+
+
+def run(config, look_ahead, num_decisions, seed=0):
+    env = TimedSteelStockyard(DataGenerator(config), config, look_ahead=look_ahead, seed=seed)
+    state, mask, mode = env.reset()
+
+    for _ in range(num_decisions):
+        candidates = torch.nonzero(mask).flatten()
+        action = candidates[torch.randint(len(candidates), (1,))].item()
+        state, reward, done, mask, mode = env.step(action, mode)
+        if done:
+            state, mask, mode = env.reset()
+
+    return env.time_scratch / env.num_calls, env.time_incremental / env.num_calls, len(env.pile_list)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_decisions", type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    print("look_ahead | num_piles | from scratch [us] | incremental [us] | speedup")
+    for look_ahead in range(2, 11):
+        t_scratch, t_incremental, num_piles = run(config, look_ahead, args.num_decisions)
+        print("%10d | %9d | %17.1f | %16.1f | %6.1fx"
+              % (look_ahead, num_piles, t_scratch * 1e6, t_incremental * 1e6, t_scratch / t_incremental))
@@ -0,0 +1,49 @@
+import json
+import time
+import argparse
+import numpy as np
+import multiprocessing as mp
+
+from environment.data import DataGenerator
+from environment.subproc_env import SubprocSteelStockyard
+from benchmark.common import random_action
+
+
+def measure_throughput(config, num_envs, num_workers, num_steps, seed=0):
+    # 작업 프로세스 수별 전체 환경의 초당 전이 수 (reset은 측정에서 제외, 완료된 에피소드는 작업 프로세스에서 자동 reset)
+    env = SubprocSteelStockyard(DataGenerator(config), config, num_envs, num_workers=num_workers, seed=seed)
+    rng = np.random.default_rng(seed)
+    try:
+        states, masks, modes = env.reset()
+        start = time.perf_counter()
+        for _ in range(num_steps):
+            actions = [random_action(rng, masks[i]) for i in range(num_envs)]
+            states, rewards, dones, masks, modes = env.step(actions, modes)
+        elapsed = time.perf_counter() - start
+    finally:
+        env.close()
+    return num_envs * num_steps / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--num_envs", type=int, default=32)
+    parser.add_argument("--num_workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--num_steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    # 작업 프로세스 수가 CPU 코어 수를 넘으면 처리량이 늘지 않으므로 코어 수와 함께 출력
+    print("cpu cores: %d, environments: %d, steps per environment: %d" % (mp.cpu_count(), args.num_envs, args.num_steps))
+    print("workers | transitions/s | speedup | efficiency")
+    baseline = None
+    for num_workers in args.num_workers:
+        throughput = measure_throughput(config, args.num_envs, num_workers, args.num_steps, args.seed)
+        baseline = baseline or throughput
+        speedup = throughput / baseline
+        print("%7d | %13.0f | %6.2fx | %9.1f%%"
+              % (num_workers, throughput, speedup, 100.0 * speedup * args.num_workers[0] / num_workers))
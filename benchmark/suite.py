@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tracemalloc
+import numpy as np
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from benchmark.common import run_random_episode
+from benchmark.scaling import scale_config
+
+
+# 커밋 간 성능 비교를 위한 벤치마크 모음
+# 고정된 시드와 적치장 규모(행 수, 베이 수, 크레인 수)별로 아래 지표를 측정하여 JSON 파일로 저장
+#   reset_ms: 에피소드 초기화 시간, reset_peak_kb: 초기화 중 최대 메모리 사용량
+#   events_per_s: 초당 처리 이벤트 수, decisions_per_s: 초당 의사결정 수 (무작위 행동 기준)
+#   step_mean_us / step_p95_us: step 호출 한 번의 평균 / 95백분위 지연 시간
+#   state_us: 의사결정 시점의 상태(HeteroData) 생성 시간
+#   generate_ms: DataGenerator.generate로 시나리오 하나를 생성하는 시간, generate_many_ms: generate_many의 시나리오당 생성 시간
+#   episode_peak_kb: 에피소드 한 번을 실행하는 동안의 최대 메모리 사용량
+
+SCALES = {"small": (2, 44, 2), "medium": (4, 88, 3), "large": (6, 132, 4)}
+
+# 값이 클수록 좋은 지표 (나머지는 작을수록 좋음)
+HIGHER_IS_BETTER = {"events_per_s", "decisions_per_s"}
+
+
+class TimedSteelStockyard(SteelStockyard):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.time_state = 0.0
+        self.num_states = 0
+        self.latencies = []
+
+    def step(self, action, mode):
+        start = time.perf_counter()
+        result = super().step(action, mode)
+        self.latencies.append(time.perf_counter() - start)
+        return result
+
+    def _get_state(self, info):
+        start = time.perf_counter()
+        result = super()._get_state(info)
+        self.time_state += time.perf_counter() - start
+        self.num_states += 1
+        return result
+
+
+def get_num_events(env):
+    # SimPy에 등록된 이벤트 수(등록 순번 _eid) - 처리되지 않고 남은 이벤트 수
+    return next(env._eid) - len(env._queue)
+
+
+def run_episode(config, seed):
+    # 무작위 행동으로 에피소드를 실행하고 step 호출별 지연 시간 기록
+    env = TimedSteelStockyard(DataGenerator(config), config, seed=seed)
+    start = time.perf_counter()
+    run_random_episode(env, seed)
+    elapsed = time.perf_counter() - start
+    return env, elapsed, env.latencies
+
+
+def measure_reset(config, seeds, num_resets):
+    # 첫 초기화의 일회성 비용(레이아웃 / 시나리오 캐시 생성, 지연 import 등)은 측정에서 제외
+    env = SteelStockyard(DataGenerator(config), config, seed=seeds[0])
+    env.reset(seed=seeds[0])
+    elapsed = []
+    for seed in seeds:
+        start = time.perf_counter()
+        for _ in range(num_resets):
+            env.reset(seed=seed)
+        elapsed.append((time.perf_counter() - start) / num_resets)
+
+    env.env = env.input_points = env.output_points = env.piles = env.cranes = env.monitor = None
+    tracemalloc.start()
+    env.reset(seed=seeds[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"reset_ms": min(elapsed) * 1e3, "reset_peak_kb": peak / 1024}
+
+
+def measure_episodes(config, seeds, num_repeats):
+    # 반복 실행 중 가장 빠른 실행 시간을 기준으로 처리 속도 계산 (이벤트 수와 의사결정 수는 시드별로 고정)
+    result = {}
+    num_events, num_decisions, elapsed, time_state, num_states, all_latencies = 0, 0, 0.0, 0.0, 0, []
+    for seed in seeds:
+        best = None
+        for _ in range(num_repeats):
+            env, episode_time, latencies = run_episode(config, seed)
+            if best is None or episode_time < best[1]:
+                best = (env, episode_time, latencies)
+        env, episode_time, latencies = best
+        num_events += get_num_events(env.env)
+        num_decisions += len(latencies)
+        elapsed += episode_time
+        time_state += env.time_state
+        num_states += env.num_states
+        all_latencies += latencies
+
+    result["num_events"] = num_events // len(seeds)
+    result["events_per_s"] = num_events / elapsed
+    result["num_decisions"] = num_decisions // len(seeds)
+    result["decisions_per_s"] = num_decisions / elapsed
+    result["step_mean_us"] = float(np.mean(all_latencies)) * 1e6
+    result["step_p95_us"] = float(np.percentile(all_latencies, 95)) * 1e6
+    result["state_us"] = time_state / num_states * 1e6
+
+    tracemalloc.start()
+    run_episode(config, seeds[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result["episode_peak_kb"] = peak / 1024
+
+    return result
+
+
+def measure_generation(config, seeds, num_scenarios):
+    data_src = DataGenerator(config)
+    elapsed = []
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        start = time.perf_counter()
+        for _ in range(num_scenarios):
+            data_src.generate(rng=rng)
+        elapsed.append((time.perf_counter() - start) / num_scenarios)
+
+    start = time.perf_counter()
+    data_src.generate_many(num_scenarios, seed=seeds[0])
+    time_many = (time.perf_counter() - start) / num_scenarios
+
+    return {"generate_ms": min(elapsed) * 1e3, "generate_many_ms": time_many * 1e3}
+
+
+def get_commit():
+    # 결과 파일을 커밋별로 구분하기 위한 git 커밋 해시 (작업 트리에 변경 사항이 있으면 -dirty 추가)
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL)
+        status = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"],
+                                         stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit.decode().strip() + ("-dirty" if status.strip() else "")
+
+
+def run_suite(config, scales, seeds, num_repeats=3, num_resets=50, num_scenarios=50):
+    results = {}
+    for name in scales:
+        num_rows, num_bays, num_cranes = SCALES[name]
+        scaled = scale_config(config, num_rows, num_bays, num_cranes)
+        result = {"num_locations": len(SteelStockyard(DataGenerator(scaled), scaled, seed=seeds[0]).pile_list)}
+        result.update(measure_reset(scaled, seeds, num_resets))
+        result.update(measure_episodes(scaled, seeds, num_repeats))
+        result.update(measure_generation(scaled, seeds, num_scenarios))
+        results[name] = result
+        print_results(name, result)
+
+    return {"commit": get_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(), "machine": platform.machine(),
+            "seeds": list(seeds), "num_repeats": num_repeats, "scales": {name: SCALES[name] for name in scales},
+            "results": results}
+
+
+def print_results(name, result):
+    print("[%s]" % name)
+    for key, value in result.items():
+        print("  %-22s %14.2f" % (key, value))
+
+
+def compare(base, new, threshold):
+    # 두 결과 파일의 공통 지표를 비교하여 threshold 비율 이상 나빠진 지표 표시
+    print("base: %s (%s) -> new: %s (%s)" % (base["commit"], base["timestamp"], new["commit"], new["timestamp"]))
+    print("scale  | metric                 |           base |            new |   change")
+    num_regressions = 0
+    for name, result in new["results"].items():
+        for key, value in result.items():
+            if name not in base["results"] or key not in base["results"][name] or key.startswith("num_"):
+                continue
+            base_value = base["results"][name][key]
+            change = value / base_value - 1 if base_value else 0.0
+            worse = -change if key in HIGHER_IS_BETTER else change
+            flag = ""
+            if worse > threshold:
+                flag = "  <- regression"
+                num_regressions += 1
+            print("%-6s | %-22s | %14.2f | %14.2f | %+7.1f%%%s" % (name, key, base_value, value, change * 100, flag))
+    return num_regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="./input/env_config.json")
+    parser.add_argument("--scales", type=str, nargs="+", default=list(SCALES), choices=list(SCALES))
+    parser.add_argument("--num_episodes", type=int, default=2, help="number of fixed seeds (0, 1, ...)")
+    parser.add_argument("--num_repeats", type=int, default=3)
+    parser.add_argument("--output", type=str, default=None, help="default: ./benchmark/results/<commit>.json")
+    parser.add_argument("--compare", type=str, nargs="+", default=None,
+                        help="base result file (and optionally a new result file to compare without running)")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.compare is not None and len(args.compare) > 2:
+        parser.error("--compare takes a base result file and an optional new result file")
+
+    if args.compare is not None and len(args.compare) == 2:
+        with open(args.compare[1], 'r') as f:
+            new = json.load(f)
+    else:
+        with open(args.config, 'r') as f:
+            config = json.load(f)
+        new = run_suite(config, args.scales, list(range(args.num_episodes)), args.num_repeats)
+
+        output = args.output
+        if output is None:
+            output = os.path.join("./benchmark/results", "%s.json" % new["commit"])
+        if os.path.dirname(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(new, f, indent=2)
+        print("results saved to %s" % output)
+
+    if args.compare is not None:
+        with open(args.compare[0], 'r') as f:
+            base = json.load(f)
+        if compare(base, new, args.threshold) > 0:
+            raise SystemExit(1)
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+class StackArena:
+    # 적치장 전체의 강재 스택을 하나의 int32 배열(강재 인덱스)과 스택별 시작 위치 / 크기 배열로 관리
+    # 스택 ID: 0 ~ L-1은 위치별 반출 대상 강재, L ~ 2L-1은 위치별로 적치 / 출고 완료된 강재 (L: 위치 수)
+    # 스택별 구간은 시나리오의 강재 배치로부터 크기가 정해지며, 각 구간의 마지막 강재가 최상단
+    def __init__(self, plates, head, size):
+        self.plates = plates
+        self.head = head
+        self.size = size
+        self.num_locations = len(head) // 2
+
+    @classmethod
+    def from_locations(cls, plates_by_location, num_plates_to_location):
+        # 반출 대상 구간은 초기 강재 수, 적치 구간은 해당 위치가 목적지인 강재 수만큼 할당
+        num_plates = np.array([len(plates) for plates in plates_by_location], dtype=np.int64)
+        capacity = np.concatenate([num_plates, np.asarray(num_plates_to_location, dtype=np.int64)])
+        head = np.zeros(len(capacity), dtype=np.int64)
+        head[1:] = np.cumsum(capacity)[:-1]
+
+        plates = np.full(int(capacity.sum()), -1, dtype=np.int32)
+        plates[:int(num_plates.sum())] = np.concatenate([np.asarray(p, dtype=np.int32) for p in plates_by_location]
+                                                        + [np.array([], dtype=np.int32)])
+        size = np.zeros(len(capacity), dtype=np.int32)
+        size[:len(num_plates)] = num_plates
+        return cls(plates, head, size)
+
+    def copy(self):
+        # 스택 시작 위치는 변하지 않으므로 공유하고 강재 배열과 크기 배열만 복사
+        return StackArena(self.plates.copy(), self.head, self.size.copy())
+
+    def stack(self, stack_id):
+        # 스택의 강재 인덱스 (아래 → 위 순서, 배열의 view)
+        head = self.head[stack_id]
+        return self.plates[head:head + self.size[stack_id]]
+
+    def top(self, stack_id):
+        # 최상단 강재 인덱스 (빈 스택은 -1)
+        size = self.size[stack_id]
+        return int(self.plates[self.head[stack_id] + size - 1]) if size > 0 else -1
+
+    def pop(self, stack_id):
+        self.size[stack_id] -= 1
+        return int(self.plates[self.head[stack_id] + self.size[stack_id]])
+
+    def push(self, stack_id, plate):
+        self.plates[self.head[stack_id] + self.size[stack_id]] = plate
+        self.size[stack_id] += 1
+
+    def top_k(self, stack_ids, k):
+        # 스택별 상위 k개 강재 인덱스 (위 → 아래 순서, 강재가 없는 칸은 인접 구간을 읽은 뒤 -1로 대체)
+        size = self.size[stack_ids]
+        depth = np.arange(k)
+        idx = (self.head[stack_ids] + size - 1)[:, None] - depth
+        return np.where(depth < size[:, None], self.plates[idx], -1)
@@ -0,0 +1,24 @@
+# 크레인-파일 그래프의 간선 정보 / 배치 그래프 생성 (SteelStockyard, SubprocSteelStockyard, 평가 배치 추론에서 공통 사용)
+# 크레인-파일 간 간선은 레이아웃에 의해 고정되므로 한 번만 생성하고 노드 특성만 교체하여 사용
+
+
+def get_edge_index(num_cranes, num_piles):
+    # 모든 크레인-파일 쌍을 잇는 간선 (정방향, 역방향)
+    import torch
+
+    edge_index = torch.cartesian_prod(torch.arange(num_cranes), torch.arange(num_piles)).t().contiguous()
+    return edge_index, edge_index.flip(0).contiguous()
+
+
+def get_batch_template(num_nodes, state_size, batch_size):
+    # 노드 특성이 0인 그래프 batch_size개로 구성한 배치 그래프 (clone 후 노드 특성만 교체)
+    import torch
+    from torch_geometric.data import Batch, HeteroData
+
+    edge_index, edge_index_rev = get_edge_index(num_nodes["crane"], num_nodes["pile"])
+    data = HeteroData()
+    data["crane"].x = torch.zeros((num_nodes["crane"], state_size["crane"]))
+    data["pile"].x = torch.zeros((num_nodes["pile"], state_size["pile"]))
+    data["crane", "moving", "pile"].edge_index = edge_index
+    data["pile", "moving_rev", "crane"].edge_index = edge_index_rev
+    return Batch.from_data_list([data] * batch_size)
@@ -0,0 +1,66 @@
+import os
+import json
+
+from collections import OrderedDict
+from environment.data import DataGenerator, get_crane_initial_coords
+
+
+class LRUCache:
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key is None or key not in self.items:
+            self.misses += 1
+            return None
+        self.items.move_to_end(key)
+        self.hits += 1
+        return self.items[key]
+
+    def put(self, key, value):
+        if key is None or self.maxsize <= 0:
+            return
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+
+    def clear(self):
+        self.items.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.items)
+
+
+# 적치장 레이아웃과 시나리오(강재 배열)는 프로세스 단위로 공유
+layout_cache = LRUCache(maxsize=8)
+scenario_cache = LRUCache(maxsize=64)
+
+layout_keys = ["row_range", "bay_range", "input_point_coords", "output_point_coords", "retrieval_pile_range",
+               "safety_margin"]
+
+
+def get_layout_key(config):
+    # 크레인별 도달 가능 위치는 크레인 수에 따라 달라지므로 키에 포함
+    layout = {key: config[key] for key in layout_keys}
+    layout["num_cranes"] = len(get_crane_initial_coords(config))
+    return json.dumps(layout, sort_keys=True)
+
+
+def get_scenario_key(data_src, config, seed=None):
+    # 파일은 경로와 수정 시각, 데이터 생성기는 생성기 설정, 환경 설정과 시드로 시나리오를 식별
+    # (같은 환경 설정이라도 생성기 설정(강재 수, 파일 범위 등)이 다르면 다른 시나리오)
+    if hasattr(data_src, "get_key"):
+        return data_src.get_key() + (get_layout_key(config),)
+    elif isinstance(data_src, (str, os.PathLike)):
+        path = os.path.abspath(data_src)
+        return ("file", path, os.path.getmtime(path), get_layout_key(config))
+    elif isinstance(data_src, DataGenerator) and seed is not None:
+        return ("generator", json.dumps(data_src.config, sort_keys=True), json.dumps(config, sort_keys=True), seed)
+    else:
+        return None
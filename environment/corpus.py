@@ -0,0 +1,73 @@
+import numpy as np
+import multiprocessing as mp
+
+from environment.data import DataGenerator, spawn_seeds
+from environment.scenario import save_columns
+
+
+_generator = None
+
+
+def _init_worker(config):
+    global _generator
+    _generator = DataGenerator(config)
+
+
+def _generate_chunk(seeds):
+    # 시나리오마다 자신의 시드로 만든 생성기를 사용하므로 작업 프로세스 배정과 무관하게 동일한 결과
+    chunks = [_generator.sample(1, np.random.default_rng(seed), name_dtype="S")[0] for seed in seeds]
+    columns = {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+    return columns, [len(chunk["id"]) for chunk in chunks]
+
+
+def build_corpus(config, path, num_scenarios, seed=None, num_workers=None, chunk_size=64, start_method=None):
+    # 작업 프로세스 풀로 시나리오를 생성하여 시나리오 집합 형식으로 저장 (manifest에 시나리오별 시드 기록)
+    if num_scenarios < 0:
+        raise ValueError("num_scenarios must be non-negative")
+    seeds = spawn_seeds(seed, num_scenarios)
+    chunks = [seeds[i:i + chunk_size] for i in range(0, num_scenarios, chunk_size)]
+    num_workers = min(num_workers or mp.cpu_count(), max(len(chunks), 1))
+
+    if num_workers > 1:
+        ctx = mp.get_context(start_method)
+        with ctx.Pool(num_workers, initializer=_init_worker, initargs=(config,)) as pool:
+            results = pool.map(_generate_chunk, chunks)
+    else:
+        _init_worker(config)
+        results = [_generate_chunk(chunk) for chunk in chunks]
+
+    keys = ["name", "id", "weight", "from_location", "to_location", "sheet"]
+    if len(results) == 0:
+        # 빈 시나리오 집합 (DataGenerator.generate_many(0)과 같은 열 형식)
+        columns = DataGenerator(config).sample(0, np.random.default_rng(seed), name_dtype="S")[0]
+    else:
+        columns = {key: np.concatenate([result[0][key] for result in results]) for key in keys}
+    offsets = np.zeros(num_scenarios + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([count for result in results for count in result[1]])
+
+    return save_columns(path, columns, offsets, DataGenerator(config).locations,
+                        sources=["DataGenerator(seed=%s)" % seed], seeds=seeds)
+
+
+if __name__ == "__main__":
+    import json
+    import time
+    import argparse
+
+    parser = argparse.ArgumentParser(description="generate a seeded scenario corpus in parallel")
+    parser.add_argument("--config", type=str, default="./input/env_config.json", help="environment config file")
+    parser.add_argument("--output", type=str, required=True, help="output directory of the scenario set")
+    parser.add_argument("--num_scenarios", type=int, default=1000, help="number of scenarios")
+    parser.add_argument("--seed", type=int, default=None, help="root seed of the corpus")
+    parser.add_argument("--num_workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    start = time.perf_counter()
+    scenario_set = build_corpus(config, args.output, args.num_scenarios, seed=args.seed,
+                                num_workers=args.num_workers)
+    print("generated %d scenarios (%d plates) into %s in %.2f s"
+          % (len(scenario_set), scenario_set.manifest["num_plates"], scenario_set.path,
+             time.perf_counter() - start))
@@ -1,11 +1,31 @@
 import os
-import random
 import numpy as np
-import pandas as pd
+
+from environment.scenario import ScenarioSet
+from environment.trajectory import get_x_ranges
+
+
+def spawn_seeds(seed, n):
+    # SeedSequence로부터 서로 독립적인 n개의 정수 시드 생성 (로그 기록 및 재현용)
+    children = np.random.SeedSequence(seed).spawn(n)
+    return [int(child.generate_state(1, np.uint64)[0]) for child in children]
+
+
+def get_crane_initial_coords(config):
+    # 크레인 초기 위치 (레일 위 왼쪽부터 순서대로, crane_initial_coords가 없으면 두 크레인 설정 사용)
+    if "crane_initial_coords" in config:
+        coords = [tuple(coord) for coord in config["crane_initial_coords"]]
+    else:
+        coords = [tuple(config["crane_1_initial_coord"]), tuple(config["crane_2_initial_coord"])]
+    if any(left[0] >= right[0] for left, right in zip(coords[:-1], coords[1:])):
+        raise ValueError("crane initial coordinates must be given in increasing bay order")
+    return coords
 
 
 class DataGenerator:
     def __init__(self, config):
+        # 생성 설정 (시나리오 캐시 키에 사용, environment.cache.get_scenario_key 참고)
+        self.config = config
         self.num_to_piles_for_storage = config['num_to_piles_for_storage']
         self.num_from_piles_for_reshuffle = config['num_from_piles_for_reshuffle']
         self.num_to_piles_for_reshuffle = config['num_to_piles_for_reshuffle']
@@ -14,7 +34,9 @@ class DataGenerator:
         self.num_plates_for_reshuffle = config['num_plates_for_reshuffle']
         self.num_plates_for_retrieval = config['num_plates_for_retrieval']
         self.safety_margin = config['safety_margin']
+        self.num_cranes = len(get_crane_initial_coords(config))
         self.storage_piles, self.retrieval_piles = self.read_config(config)
+        self.build_location_arrays()
 
     def read_config(self, config):
         row_range = config['row_range']
@@ -24,205 +46,199 @@ class DataGenerator:
         storage_pile_range = config['storage_pile_range']
         retrieval_pile_range = config['retrieval_pile_range']
 
-        storage_piles = {key:{} for key in input_point_coords}
-        retrieval_piles = {key:{} for key in output_point_coords}
-        for row_id in range(row_range[0], row_range[0] + 1):
+        self.bay_range = bay_range
+        self.input_point_coords = input_point_coords
+        self.output_point_coords = output_point_coords
+
+        storage_piles = {key: [] for key in input_point_coords}
+        retrieval_piles = {key: [] for key in output_point_coords}
+        self.mapping_from_pile_to_x = {}
+        for row_id in range(row_range[0], row_range[1] + 1):
             for col_id in range(bay_range[0], bay_range[1] + 1):
                 if (not col_id in input_point_coords) and (not col_id in output_point_coords):
+                    name = chr(row_id + 65) + str(col_id).rjust(2, '0')
+                    self.mapping_from_pile_to_x[name] = col_id
                     flag = True
                     for key in retrieval_pile_range.keys():
                         min_col, max_col = retrieval_pile_range[key]
                         if min_col <= col_id <= max_col:
-                            retrieval_piles[int(key)][col_id] = "%s%d" % (chr(row_id + 65), col_id)
+                            retrieval_piles[int(key)].append(name)
                             flag = False
                     if flag:
                         for key in storage_pile_range.keys():
                             min_col, max_col = storage_pile_range[key]
                             if min_col <= col_id <= max_col:
-                                storage_piles[int(key)][col_id] = "%s%d" % (chr(row_id + 65), col_id)
+                                storage_piles[int(key)].append(name)
 
         return storage_piles, retrieval_piles
 
-    def generate(self, file_path=None):
-        df_storage = pd.DataFrame(columns=["pileno", "pileseq", "markno", "unitw", "topile"])
-        df_reshuffle = pd.DataFrame(columns=["pileno", "pileseq", "markno", "unitw", "topile"])
-        df_retrieval = pd.DataFrame(columns=["pileno", "pileseq", "markno", "unitw", "topile"])
+    def build_location_arrays(self):
+        # 위치 이름을 정수 코드로 변환 (입고 지점 → 적치 파일 → 출고 파일 → 출고 지점 순서)
+        input_points = ["I" + str(key).rjust(2, '0') for key in self.input_point_coords]
+        output_points = ["O" + str(key).rjust(2, '0') for key in self.output_point_coords]
+        storage_piles = list(dict.fromkeys(name for key in self.input_point_coords
+                                           for name in self.storage_piles[key]))
+        retrieval_piles = [name for key in self.output_point_coords for name in self.retrieval_piles[key]]
+        self.locations = input_points + storage_piles + retrieval_piles + output_points
+        self.location_to_code = {name: i for i, name in enumerate(self.locations)}
+
+        x_coords = {**{name: key for name, key in zip(input_points, self.input_point_coords)},
+                    **{name: key for name, key in zip(output_points, self.output_point_coords)},
+                    **self.mapping_from_pile_to_x}
+        self.location_x = np.array([x_coords[name] for name in self.locations])
+
+        # 두 위치를 모두 방문할 수 있는 크레인이 존재하는지 여부 (크레인 간 안전 거리 고려)
+        self.reachable = np.zeros((len(self.locations), len(self.locations)), dtype=bool)
+        for x_min, x_max in get_x_ranges(self.bay_range, self.safety_margin, self.num_cranes):
+            inside = (x_min <= self.location_x) & (self.location_x <= x_max)
+            self.reachable |= inside[:, None] & inside[None, :]
+
+        self.input_codes = np.array([self.location_to_code[name] for name in input_points], dtype=np.int32)
+        self.output_codes = np.array([self.location_to_code[name] for name in output_points], dtype=np.int32)
+        self.storage_codes = np.array([self.location_to_code[name] for name in storage_piles], dtype=np.int32)
+        self.retrieval_codes = [np.array([self.location_to_code[name] for name in self.retrieval_piles[key]],
+                                         dtype=np.int32) for key in self.output_point_coords]
+
+        # 입고 지점별 적치 후보 파일 (적치 파일 배열 내 위치)
+        self.storage_candidates = []
+        for key, code in zip(self.input_point_coords, self.input_codes):
+            names = set(self.storage_piles[key])
+            self.storage_candidates.append(np.array([i for i, pile in enumerate(self.storage_codes)
+                                                     if self.locations[pile] in names and self.reachable[code, pile]],
+                                                    dtype=np.int64))
+
+        self.name_prefixes = {}
+        for dtype in ["U", "S"]:
+            self.name_prefixes[dtype] = np.array([["%s-%s-" % (prefix, name) for name in self.locations]
+                                                  for prefix in ["SP-ST", "SP-RS", "SP-RT"]], dtype=dtype)
+
+    def generate(self, file_path=None, rng=None):
+        # 재현이 필요한 경우 시드가 지정된 numpy.random.Generator를 전달
+        # pandas는 DataFrame으로 반환하는 generate에서만 필요 (시뮬레이션 환경은 sample의 열 단위 배열을 사용)
+        import pandas as pd
+
+        if rng is None:
+            rng = np.random.default_rng()
+
+        columns, offsets = self.sample(1, rng, name_dtype="U")
+        df_plates = pd.DataFrame({"name": columns["name"], "id": columns["id"],
+                                  "from_location": np.asarray(self.locations, dtype=object)[columns["from_location"]],
+                                  "to_location": np.asarray(self.locations, dtype=object)[columns["to_location"]],
+                                  "weight": columns["weight"]})
+        df_storage, df_reshuffle, df_retrieval \
+            = [df_plates[columns["sheet"] == i].reset_index(drop=True) for i in range(3)]
 
-        if self.num_plates_for_retrieval > 0:
-            candidates = piles_in_area2 + piles_in_area3 + piles_in_area4
-            # candidates = [i for i in candidates if not i in ["A22", "A23", "A24", "B22", "B23", "B24"]]
-            from_piles_retrieval_cn1 = random.sample(candidates, self.n_from_piles_retrieval_cn1)
-            candidates = [i for i in candidates if not i in from_piles_retrieval_cn1]
-            from_piles_retrieval_cn2 = random.sample(candidates, self.n_from_piles_retrieval_cn2)
-            if "Crane-2" in self.working_crane_ids:
-                candidates = piles_in_area6
-                from_piles_retrieval_cn3 = random.sample(candidates, self.n_from_piles_retrieval_cn3)
-            else:
-                from_piles_retrieval_cn3 = []
-            from_piles_retrieval = from_piles_retrieval_cn1 + from_piles_retrieval_cn2 + from_piles_retrieval_cn3
-            for pile in from_piles_retrieval:
-                num_of_plates = random.randint(int(0.9 * self.n_plates_retrieval), int(1.1 * self.n_plates_retrieval))
-                pileno = [pile] * num_of_plates
-                pileseq = [str(i).rjust(3, '0') for i in range(1, num_of_plates + 1)]
-                markno = ["SP-RT-%s-%s" % (pile, i) for i in pileseq]
-                unitw = np.random.uniform(0.141, 19.294, num_of_plates)
-                if pile in from_piles_retrieval_cn1:
-                    topile = ["cn1"] * num_of_plates
-                elif pile in from_piles_retrieval_cn2:
-                    topile = ["cn2"] * num_of_plates
-                else:
-                    topile = ["cn3"] * num_of_plates
-                df_temp = pd.DataFrame(
-                    {"pileno": pileno, "pileseq": pileseq, "markno": markno, "unitw": unitw, "topile": topile})
-                df_retrieval = pd.concat([df_retrieval, df_temp], ignore_index=True)
-        else:
-            from_piles_retrieval = []
-
-    def generate_pre(self, file_path=None):
-        # 입고, 선별, 출고 데이터를 저장하기 위한 데이터프레임 생성
-        df_storage = pd.DataFrame(columns=["pileno", "pileseq", "markno", "unitw", "topile"])
-        df_reshuffle = pd.DataFrame(columns=["pileno", "pileseq", "markno", "unitw", "topile"])
-        df_retrieval = pd.DataFrame(columns=["pileno", "pileseq", "markno", "unitw", "topile"])
-
-        # 강재 적치장 내 모든 파일이 포함된 리스트 생성
-        mapping_from_pile_to_x = {}
-
-        piles_in_area0 = []
-        for row_id in self.rows:
-            pile = row_id + "00"
-            piles_in_area0.append(pile)
-            mapping_from_pile_to_x[pile] = 1
-
-        piles_in_area1, piles_in_area2, piles_in_area3, piles_in_area4, piles_in_area5, piles_in_area6 = [], [], [], [], [], []
-        n_bays_cum = np.cumsum([self.n_bays_in_area1, self.n_bays_in_area2, self.n_bays_in_area3,
-                                self.n_bays_in_area4, self.n_bays_in_area5, self.n_bays_in_area6])
-
-        for row_id in self.rows:
-            for col_id in range(1, n_bays_cum[-1] + 1):
-                pile = row_id + str(col_id).rjust(2, '0')
-                if col_id <= n_bays_cum[0]:
-                    piles_in_area1.append(pile)
-                    mapping_from_pile_to_x[pile] = col_id + 1
-                elif n_bays_cum[0] < col_id <= n_bays_cum[1]:
-                    piles_in_area2.append(pile)
-                    mapping_from_pile_to_x[pile] = col_id + 1
-                elif n_bays_cum[1] < col_id <= n_bays_cum[2]:
-                    piles_in_area3.append(pile)
-                    mapping_from_pile_to_x[pile] = col_id + 2
-                elif n_bays_cum[2] < col_id <= n_bays_cum[3]:
-                    piles_in_area4.append(pile)
-                    mapping_from_pile_to_x[pile] = col_id + 3
-                elif n_bays_cum[3] < col_id <= n_bays_cum[4]:
-                    piles_in_area5.append(pile)
-                    mapping_from_pile_to_x[pile] = col_id + 3
-                else:
-                    piles_in_area6.append(pile)
-                    mapping_from_pile_to_x[pile] = col_id + 3
-
-        piles_all = piles_in_area0 + piles_in_area1 + piles_in_area2 \
-                    + piles_in_area3 + piles_in_area4 + piles_in_area5 + piles_in_area6
-        x_max = max(mapping_from_pile_to_x.values()) + 1
+        if file_path is not None:
+            with pd.ExcelWriter(file_path) as writer:
+                df_storage.to_excel(writer, sheet_name="storage", index=False)
+                df_reshuffle.to_excel(writer, sheet_name="reshuffle", index=False)
+                df_retrieval.to_excel(writer, sheet_name="retrieval", index=False)
+
+        return df_storage, df_reshuffle, df_retrieval
+
+    def generate_many(self, n, seed=None, path=None):
+        # n개의 시나리오를 하나의 난수 생성기로 한 번에 생성하여 시나리오 집합으로 반환 (path 지정 시 디스크에 저장)
+        # 시나리오별로 재현 가능한 시드가 필요한 경우 environment.corpus.build_corpus 사용
+        rng = np.random.default_rng(seed)
+        columns, offsets = self.sample(n, rng, name_dtype="S")
+        scenario_set = ScenarioSet.from_columns(columns, offsets, self.locations)
+        if path is not None:
+            scenario_set = scenario_set.save(path)
+        return scenario_set
+
+    def sample(self, n, rng, name_dtype="U"):
+        scenario, sheet, from_location, to_location, seq = [], [], [], [], []
+
+        def add_block(block_sheet, block_scenario, block_from, block_to, block_seq):
+            scenario.append(block_scenario)
+            sheet.append(np.full(len(block_scenario), block_sheet, dtype=np.int8))
+            from_location.append(block_from)
+            to_location.append(block_to)
+            seq.append(block_seq)
 
         # 출고 계획 생성
-        if self.retrieval:
-            candidates = piles_in_area2 + piles_in_area3 + piles_in_area4
-            # candidates = [i for i in candidates if not i in ["A22", "A23", "A24", "B22", "B23", "B24"]]
-            from_piles_retrieval_cn1 = random.sample(candidates, self.n_from_piles_retrieval_cn1)
-            candidates = [i for i in candidates if not i in from_piles_retrieval_cn1]
-            from_piles_retrieval_cn2 = random.sample(candidates, self.n_from_piles_retrieval_cn2)
-            if "Crane-2" in self.working_crane_ids:
-                candidates = piles_in_area6
-                from_piles_retrieval_cn3 = random.sample(candidates, self.n_from_piles_retrieval_cn3)
-            else:
-                from_piles_retrieval_cn3 = []
-            from_piles_retrieval = from_piles_retrieval_cn1 + from_piles_retrieval_cn2 + from_piles_retrieval_cn3
-            for pile in from_piles_retrieval:
-                num_of_plates = random.randint(int(0.9 * self.n_plates_retrieval), int(1.1 * self.n_plates_retrieval))
-                pileno = [pile] * num_of_plates
-                pileseq = [str(i).rjust(3, '0') for i in range(1, num_of_plates + 1)]
-                markno = ["SP-RT-%s-%s" % (pile, i) for i in pileseq]
-                unitw = np.random.uniform(0.141, 19.294, num_of_plates)
-                if pile in from_piles_retrieval_cn1:
-                    topile = ["cn1"] * num_of_plates
-                elif pile in from_piles_retrieval_cn2:
-                    topile = ["cn2"] * num_of_plates
-                else:
-                    topile = ["cn3"] * num_of_plates
-                df_temp = pd.DataFrame(
-                    {"pileno": pileno, "pileseq": pileseq, "markno": markno, "unitw": unitw, "topile": topile})
-                df_retrieval = pd.concat([df_retrieval, df_temp], ignore_index=True)
-        else:
-            from_piles_retrieval = []
+        if self.num_plates_for_retrieval > 0:
+            for i, key in enumerate(self.output_point_coords):
+                num_from_piles = self.num_from_piles_for_retrieval[str(key)]
+                from_piles = self.retrieval_codes[i][self.sample_piles(rng, n, len(self.retrieval_codes[i]),
+                                                                       num_from_piles)]
+                counts = self.sample_counts(rng, from_piles.shape, self.num_plates_for_retrieval)
+                block_scenario, block_from, block_seq, _ = self.expand(from_piles, counts)
+                add_block(2, block_scenario, block_from, np.full(len(block_from), self.output_codes[i]), block_seq)
 
         # 선별 계획 생성
-        if self.reshuffle:
-            candidates = piles_in_area1 + piles_in_area5
-            if not "Crane-1" in self.working_crane_ids:
-                candidates = [i for i in candidates if mapping_from_pile_to_x[i] >= 1 + self.safety_margin]
-            if not "Crane-2" in self.working_crane_ids:
-                candidates = [i for i in candidates if mapping_from_pile_to_x[i] <= x_max - self.safety_margin]
-            from_piles_reshuffle = random.sample(candidates, self.n_from_piles_reshuffle)
-            candidates = [i for i in piles_all if (i not in from_piles_retrieval) and (i not in piles_in_area0)]
-            candidates = [i for i in candidates if i not in from_piles_reshuffle]
-            if not "Crane-1" in self.working_crane_ids:
-                candidates = [i for i in candidates if mapping_from_pile_to_x[i] >= 1 + self.safety_margin]
-            if not "Crane-2" in self.working_crane_ids:
-                candidates = [i for i in candidates if mapping_from_pile_to_x[i] <= x_max - self.safety_margin]
-            to_piles_reshuffle = random.sample(candidates, self.n_to_piles_reshuffle)
-            # to_piles_reshuffle = ["A22", "A23", "A24", "B22", "B23", "B24"]
-
-            for pile in from_piles_reshuffle:
-                x = mapping_from_pile_to_x[pile]
-                if x < 1 + self.safety_margin:
-                    to_piles_reshuffle_rev = [i for i in to_piles_reshuffle
-                                              if mapping_from_pile_to_x[i] <= x_max - self.safety_margin]
-                elif x > x_max - self.safety_margin:
-                    to_piles_reshuffle_rev = [i for i in to_piles_reshuffle
-                                              if mapping_from_pile_to_x[i] >= 1 + self.safety_margin]
-                else:
-                    to_piles_reshuffle_rev = to_piles_reshuffle
-                num_of_plates = random.randint(int(0.9 * self.n_plates_reshuffle), int(1.1 * self.n_plates_reshuffle))
-                pileno = [pile] * num_of_plates
-                pileseq = [str(i).rjust(3, '0') for i in range(1, num_of_plates + 1)]
-                markno = ["SP-RS-%s-%s" % (pile, i) for i in pileseq]
-                unitw = np.random.uniform(0.141, 19.294, num_of_plates)
-                topile = random.choices(to_piles_reshuffle_rev, k=num_of_plates)
-                df_temp = pd.DataFrame(
-                    {"pileno": pileno, "pileseq": pileseq, "markno": markno, "unitw": unitw, "topile": topile})
-                df_reshuffle = pd.concat([df_reshuffle, df_temp], ignore_index=True)
-        else:
-            from_piles_reshuffle = []
+        excluded = np.zeros((n, len(self.storage_codes)), dtype=bool)
+        if self.num_plates_for_reshuffle > 0:
+            from_idx = self.sample_piles(rng, n, len(self.storage_codes), self.num_from_piles_for_reshuffle)
+            excluded[np.arange(n)[:, None], from_idx] = True
+            to_idx = self.sample_piles(rng, n, len(self.storage_codes), self.num_to_piles_for_reshuffle, excluded)
+            from_piles, to_piles = self.storage_codes[from_idx], self.storage_codes[to_idx]
+
+            counts = self.sample_counts(rng, from_piles.shape, self.num_plates_for_reshuffle)
+            block_scenario, block_from, block_seq, group = self.expand(from_piles, counts)
+
+            # 출발 파일에서 도달 가능한 목적 파일 중 하나를 균등하게 선택
+            reachable = self.reachable[from_piles[:, :, None], to_piles[:, None, :]]
+            cumsum = np.cumsum(reachable, axis=2)
+            if (cumsum[:, :, -1] == 0).any():
+                raise ValueError("no reachable to-pile for a reshuffle from-pile")
+            cumsum = cumsum.reshape(-1, to_piles.shape[1])[group]
+            kth = np.floor(rng.random(len(group)) * cumsum[:, -1])
+            block_to = to_piles[block_scenario, np.argmax(cumsum > kth[:, None], axis=1)]
+            add_block(1, block_scenario, block_from, block_to, block_seq)
 
         # 적치 계획 생성
-        if self.storage:
-            if "Crane-1" in self.working_crane_ids:
-                from_piles_storage = random.sample(piles_in_area0, self.n_from_piles_storage)
-            else:
-                from_piles_storage = []
-            candidates = piles_in_area1 + piles_in_area5
-            candidates = [i for i in candidates if i not in from_piles_reshuffle]
-            candidates = [i for i in candidates if mapping_from_pile_to_x[i] <= x_max - self.safety_margin]
-            to_piles_storage = random.sample(candidates, self.n_to_piles_storage)
-            # to_piles_storage = ["A22", "A23", "A24", "B22", "B23", "B24"]
-
-            for pile in from_piles_storage:
-                num_of_plates = random.randint(int(0.9 * self.n_plates_storage), int(1.1 * self.n_plates_storage))
-                pileno = [pile] * num_of_plates
-                pileseq = [str(i).rjust(3, '0') for i in range(1, num_of_plates + 1)]
-                markno = ["SP-ST-%s-%s" % (pile, i) for i in pileseq]
-                unitw = np.random.uniform(0.141, 19.294, num_of_plates)
-                topile = random.choices(to_piles_storage, k=num_of_plates)
-                df_temp = pd.DataFrame({"pileno": pileno, "pileseq": pileseq, "markno": markno, "unitw": unitw, "topile": topile})
-                df_storage = pd.concat([df_storage, df_temp], ignore_index=True)
-
-        if file_path is not None:
-            writer = pd.ExcelWriter(file_path)
-            df_storage.to_excel(writer, sheet_name="storage", index=False)
-            df_reshuffle.to_excel(writer, sheet_name="reshuffle", index=False)
-            df_retrieval.to_excel(writer, sheet_name="retrieval", index=False)
-            writer.save()
-
-        return df_storage, df_reshuffle, df_retrieval
+        if self.num_plates_for_storage > 0:
+            for i, candidates in enumerate(self.storage_candidates):
+                to_idx = self.sample_piles(rng, n, len(candidates), self.num_to_piles_for_storage[i],
+                                           excluded[:, candidates])
+                to_piles = self.storage_codes[candidates[to_idx]]
+                from_points = np.full((n, 1), self.input_codes[i])
+                counts = self.sample_counts(rng, from_points.shape, self.num_plates_for_storage)
+                block_scenario, block_from, block_seq, _ = self.expand(from_points, counts)
+                block_to = to_piles[block_scenario, rng.integers(0, to_piles.shape[1], len(block_scenario))]
+                add_block(0, block_scenario, block_from, block_to, block_seq)
+
+        # 시나리오 → 계획 유형(입고 / 선별 / 출고) 순서로 정렬
+        scenario = np.concatenate(scenario + [np.array([], dtype=np.int64)])
+        sheet = np.concatenate(sheet + [np.array([], dtype=np.int8)])
+        order = np.lexsort((sheet, scenario))
+        scenario, sheet = scenario[order], sheet[order]
+        from_location = np.concatenate(from_location + [np.array([], dtype=np.int32)])[order].astype(np.int32)
+        to_location = np.concatenate(to_location + [np.array([], dtype=np.int32)])[order].astype(np.int32)
+        seq = np.concatenate(seq + [np.array([], dtype=np.int64)])[order]
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(scenario, minlength=n))
+        seq_names = np.char.zfill(np.arange(seq.max(initial=0) + 1).astype(name_dtype), 3)
+        columns = {"name": np.char.add(self.name_prefixes[name_dtype][sheet, from_location], seq_names[seq]),
+                   "id": np.arange(len(scenario)) - offsets[scenario],
+                   "weight": rng.uniform(0.141, 19.294, len(scenario)),
+                   "from_location": from_location,
+                   "to_location": to_location,
+                   "sheet": sheet}
+
+        return columns, offsets
+
+    def sample_piles(self, rng, n, num_candidates, k, excluded=None):
+        # 시나리오별로 후보 중 k개를 비복원 추출 (제외 대상은 정렬 키를 무한대로 설정)
+        keys = rng.random((n, num_candidates))
+        if excluded is not None:
+            keys[excluded] = np.inf
+        idx = np.argsort(keys, axis=1)[:, :k]
+        if idx.shape[1] < k or (excluded is not None and np.take_along_axis(excluded, idx, axis=1).any()):
+            raise ValueError("not enough candidate piles to sample %d piles" % k)
+        return idx
+
+    def sample_counts(self, rng, shape, num_plates):
+        return rng.integers(int(0.9 * num_plates), int(1.1 * num_plates) + 1, size=shape)
+
+    def expand(self, from_piles, counts):
+        # (시나리오, 파일)별 강재 수를 강재 단위 배열로 펼침
+        counts = counts.ravel()
+        group = np.repeat(np.arange(len(counts)), counts)
+        seq = np.arange(len(group)) - (np.cumsum(counts) - counts)[group] + 1
+        return group // from_piles.shape[1], from_piles.ravel()[group], seq, group
 
 
 if __name__ == '__main__':
@@ -0,0 +1,197 @@
+import csv
+
+from bisect import bisect_left, bisect_right
+
+
+# 출고 지점별 SimPy 프로세스 대신 하나의 구성 요소가 모든 출고 지점의 출고 요청을 발생시킴
+# 출고 요청 타이머는 SimPy 이벤트 큐에 직접 등록하고 (처리는 이벤트 콜백)
+# 출고 요청이 처리(반출)되면 다음 요청 시각을 정하여 타이머를 다시 등록
+# 다음 요청 시각은 아래 두 가지 방식 중 하나로 결정
+#   - 요청 간격 생성: 출고 지점별 난수 스트림에서 기하 분포 간격을 block_size개씩 미리 생성하여 사용
+#     (rate_profile 지정 시 누적 강도로 시간 변환하여 교대 근무 중 시간대별로 다른 요청 강도 반영)
+#   - 기록 재생: 실제 출고 요청 기록(trace)의 요청 시각을 순서대로 사용
+#     (이전 요청이 처리되기 전에 도착한 요청은 처리 직후 발생하며 요청 시각은 기록된 시각으로 유지)
+
+
+class RateProfile:
+    # 구간별로 일정한 요청 강도 배율 (pieces: (구간 시작 시각, 배율) 리스트, shift_length 지정 시 교대 주기로 반복)
+    # 기준 강도로 생성한 요청 간격을 누적 강도 Λ(t)의 역함수로 변환 (Λ(t) = 0부터 t까지 배율의 적분)
+    def __init__(self, pieces, shift_length=None):
+        self.starts = [float(start) for start, _ in pieces]
+        self.multipliers = [float(multiplier) for _, multiplier in pieces]
+        if not self.starts or self.starts[0] != 0.0:
+            raise ValueError("rate profile must start at time 0")
+        if any(left >= right for left, right in zip(self.starts[:-1], self.starts[1:])):
+            raise ValueError("rate profile pieces must be given in increasing start time order")
+        if any(multiplier < 0 for multiplier in self.multipliers):
+            raise ValueError("rate profile multipliers must be non-negative")
+        if shift_length is not None and shift_length <= self.starts[-1]:
+            raise ValueError("shift_length must be greater than the start time of the last piece")
+
+        self.shift_length = shift_length
+        self.cumulative = [0.0]
+        ends = self.starts[1:] + ([float(shift_length)] if shift_length is not None else [])
+        for start, end, multiplier in zip(self.starts, ends, self.multipliers):
+            self.cumulative.append(self.cumulative[-1] + multiplier * (end - start))
+        if (self.cumulative[-1] if shift_length is not None else self.multipliers[-1]) <= 0:
+            raise ValueError("rate profile must have a positive total rate")
+
+    def integrate(self, time):
+        cycle = 0
+        if self.shift_length is not None:
+            cycle, time = divmod(time, self.shift_length)
+        i = bisect_right(self.starts, time) - 1
+        value = self.cumulative[i] + self.multipliers[i] * (time - self.starts[i])
+        return cycle * self.cumulative[-1] + value if cycle else value
+
+    def invert(self, value):
+        # Λ(t) >= value를 만족하는 가장 이른 시각 (배율이 0인 구간에서는 요청이 발생하지 않음)
+        offset = 0.0
+        if self.shift_length is not None:
+            cycle = max(0, -(-value // self.cumulative[-1]) - 1)
+            value -= cycle * self.cumulative[-1]
+            offset = cycle * self.shift_length
+        i = bisect_left(self.cumulative, value) - 1
+        if i < 0:
+            return offset
+        if i >= len(self.starts):
+            i = len(self.starts) - 1
+        return offset + self.starts[i] + (value - self.cumulative[i]) / self.multipliers[i]
+
+    def shift(self, time, gap):
+        return self.invert(self.integrate(time) + gap)
+
+
+def load_trace(trace):
+    # 출고 지점 이름별 요청 시각 리스트 (trace: {이름: 시각 리스트} 또는 Time, Location 열을 갖는 CSV 파일)
+    # Event 열이 있는 CSV(Monitor.get_logs로 저장한 이벤트 로그)는 Retrieval 이벤트만 사용
+    if isinstance(trace, dict):
+        return {name: sorted(float(time) for time in times) for name, times in trace.items()}
+
+    times = {}
+    with open(trace, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            if "Event" in row and row["Event"] != "Retrieval":
+                continue
+            times.setdefault(row["Location"], []).append(float(row["Time"]))
+    return {name: sorted(values) for name, values in times.items()}
+
+
+class DemandStream:
+    # rngs: 출고 지점별 난수 생성기 (출고 지점 ID 순서), block_size: 한 번에 미리 생성하는 요청 간격 수
+    # rate_profile: RateProfile 생성 인자 (pieces, shift_length를 갖는 dict), trace: load_trace 인자
+    def __init__(self, env, output_points, rngs, block_size=64, rate_profile=None, trace=None):
+        self.env = env
+        self.output_points = output_points
+        self.rngs = dict(zip(output_points, rngs))
+        self.block_size = block_size
+        self.rate_profile = RateProfile(**rate_profile) if rate_profile is not None else None
+
+        if trace is not None:
+            times = load_trace(trace)
+            self.trace = {output_point_id: times.get(output_point.name, [])
+                          for output_point_id, output_point in output_points.items()}
+        else:
+            self.trace = None
+
+        # 출고 지점별 미리 생성한 요청 간격 블록과 다음에 사용할 위치 (기록 재생 시 기록 내 다음 요청의 위치)
+        self.blocks = {output_point_id: [] for output_point_id in output_points}
+        self.positions = {output_point_id: 0 for output_point_id in output_points}
+        # 대기 중인 출고 요청 타이머와 해당 요청의 요청 시각
+        self.timers = {}
+        self.arrivals = {}
+        # 출고 지점별 타이머 / 반출 이벤트 처리 함수
+        self.timer_handlers = {output_point_id: self.get_handler(self.on_timer, output_point_id)
+                               for output_point_id in output_points}
+        self.call_handlers = {output_point_id: self.get_handler(self.on_call, output_point_id)
+                              for output_point_id in output_points}
+
+    def start(self):
+        for output_point_id in self.output_points:
+            self.next_request(output_point_id)
+
+    def get_phase(self, output_point_id):
+        # 출고 지점이 대기 중인 단계 (timer: 요청 대기, call: 반출 대기, done: 종료, 스냅샷 저장에 사용)
+        output_point = self.output_points[output_point_id]
+        if output_point_id in self.timers:
+            return "timer"
+        elif output_point.call is not None and not output_point.call.triggered:
+            return "call"
+        else:
+            return "done"
+
+    def get_state(self):
+        return {"rngs": {key: rng.bit_generator.state for key, rng in self.rngs.items()},
+                "blocks": {key: list(block) for key, block in self.blocks.items()},
+                "positions": dict(self.positions), "arrivals": dict(self.arrivals)}
+
+    def set_state(self, state, phases):
+        # 스냅샷으로부터 복원 (timer 단계의 타이머는 environment.snapshot에서 self.timers에 설정한 후 호출)
+        for key, rng_state in state["rngs"].items():
+            self.rngs[key].bit_generator.state = rng_state
+        self.blocks = {key: list(block) for key, block in state["blocks"].items()}
+        self.positions = dict(state["positions"])
+        self.arrivals = dict(state["arrivals"])
+        for output_point_id, phase in phases.items():
+            output_point = self.output_points[output_point_id]
+            if phase == "timer":
+                self.wait(self.timers[output_point_id], self.timer_handlers[output_point_id])
+            elif phase == "call":
+                output_point.call = self.env.event()
+                self.wait(output_point.call, self.call_handlers[output_point_id])
+
+    def wait(self, event, handler):
+        event.callbacks.append(handler)
+
+    def get_handler(self, method, output_point_id):
+        def handler(value=None):
+            method(output_point_id)
+        return handler
+
+    def get_gap(self, output_point_id):
+        position = self.positions[output_point_id]
+        block = self.blocks[output_point_id]
+        if position == len(block):
+            # 기하 분포 난수를 블록 단위로 생성 (한 번에 생성해도 하나씩 생성한 값과 동일)
+            block = self.blocks[output_point_id] \
+                = self.rngs[output_point_id].geometric(self.output_points[output_point_id].irt,
+                                                       self.block_size).tolist()
+            position = 0
+        self.positions[output_point_id] = position + 1
+        return block[position]
+
+    def next_request(self, output_point_id):
+        # 출고 대상 강재가 모두 반출되지 않은 경우 다음 출고 요청 타이머 등록
+        output_point = self.output_points[output_point_id]
+        if output_point.arena.size[output_point.stacked_id] >= output_point.num_plates:
+            return
+
+        now = self.env.now
+        if self.trace is not None:
+            times = self.trace[output_point_id]
+            position = self.positions[output_point_id]
+            if position == len(times):
+                return
+            self.positions[output_point_id] = position + 1
+            arrival = times[position]
+            delay = max(0, arrival - now)
+        elif self.rate_profile is not None:
+            arrival = self.rate_profile.shift(now, self.get_gap(output_point_id))
+            delay = arrival - now
+        else:
+            delay = self.get_gap(output_point_id)
+            arrival = now + delay
+
+        self.arrivals[output_point_id] = arrival
+        timer = self.env.timeout(delay)
+        self.timers[output_point_id] = timer
+        self.wait(timer, self.timer_handlers[output_point_id])
+
+    def on_timer(self, output_point_id):
+        del self.timers[output_point_id]
+        output_point = self.output_points[output_point_id]
+        output_point.request_retrieval(self.arrivals.pop(output_point_id))
+        self.wait(output_point.call, self.call_handlers[output_point_id])
+
+    def on_call(self, output_point_id):
+        self.next_request(output_point_id)
@@ -1,18 +1,46 @@
-import torch
 import simpy
 import numpy as np
-import pandas as pd
 
-from torch_geometric.data import HeteroData
-from environment.data import DataGenerator
-from environment.simulation import Crane, InputPoint, Pile, OutputPoint, Plate, Monitor
+from environment.arena import StackArena
+from environment.batch import get_edge_index
+from environment.cache import layout_cache, scenario_cache, get_layout_key, get_scenario_key
+from environment.data import DataGenerator, spawn_seeds, get_crane_initial_coords
+from environment.scenario import Scenario, ScenarioSet, is_scenario_set
+from environment.snapshot import take_snapshot, restore_snapshot
+from environment.profiler import Profiler
+from environment.demand import DemandStream
+from environment.simulation import Crane, InputPoint, Pile, OutputPoint, PlateTable, Monitor, Dispatcher, \
+    FeasibilityIndex, LoadingPlanner
+from environment.recorder import get_episode_path
+from environment.trajectory import get_x_ranges
 
 
 class SteelStockyard:
-    def __init__(self, data_src, config, look_ahead=2):
+    def __init__(self, data_src, config, look_ahead=2, record_events=False, run_mode="decision",
+                 seed=None, use_cache=True, log_options=None, loading_mode="greedy", profile=False,
+                 profile_options=None, demand_options=None, scenario_index=None):
+        # 시나리오 집합 디렉토리는 scenario_index번째 시나리오를 사용 (지정하지 않으면 시드로 선택, 시드가 없으면 0)
+        if is_scenario_set(data_src):
+            scenario_set = ScenarioSet(data_src)
+            if scenario_index is None:
+                scenario_index = seed % len(scenario_set) if seed is not None else 0
+            data_src = scenario_set[scenario_index]
         self.data_src = data_src
         self.config = config
         self.look_ahead = look_ahead
+        self.record_events = record_events
+        self.log_options = log_options
+        # demand_options: 출고 요청 발생 설정 (block_size, rate_profile, trace, environment.demand 참고)
+        self.demand_options = demand_options
+        # 적재 계획 결정 방식 (single: 강재 1매 이동, greedy: 최선의 복수 강재 계획 자동 선택, decision: 에이전트가 결정)
+        if loading_mode not in ("single", "greedy", "decision"):
+            raise ValueError("loading_mode must be 'single', 'greedy' or 'decision'")
+        self.loading_mode = loading_mode
+        self.run_mode = run_mode
+        self.seed = seed
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.episode_seed = None
+        self.use_cache = use_cache
         self.row_range = config['row_range']
         self.bay_range = config['bay_range']
         self.retrieval_pile_range = config['retrieval_pile_range']
@@ -24,18 +52,29 @@ class SteelStockyard:
         self.weight_limit = config['weight_limit']
         self.number_limit = config['number_limit']
         self.pile_limit = config['pile_limit']
-        self.crane_1_initial_coord = config['crane_1_initial_coord']
-        self.crane_2_initial_coord = config['crane_2_initial_coord']
-
-        if type(self.data_src) is DataGenerator:
-            self.df_storage, self.df_reshuffle, self.df_retrieval = self.data_src.generate()
-        else:
-            self.df_storage = pd.read_excel(self.data_src, sheet_name="storage", engine="openpyxl")
-            self.df_reshuffle = pd.read_excel(self.data_src, sheet_name="reshuffle", engine="openpyxl")
-            self.df_retrieval = pd.read_excel(self.data_src, sheet_name="retrieval", engine="openpyxl")
+        # 레일을 공유하는 크레인 수는 초기 위치 설정으로 결정 (레일 위 왼쪽부터 순서대로)
+        self.crane_initial_coords = get_crane_initial_coords(config)
 
         self.decision_mode = {0: "sequencing", 1: "multi-loading", 2: "prioritizing"}
 
+        # 레이아웃 정보는 설정별로, 강재 정보는 시나리오별로 캐시하여 재사용
+        layout_key = get_layout_key(config) if use_cache else None
+        layout = layout_cache.get(layout_key)
+        if layout is None:
+            layout = self._build_layout()
+            layout_cache.put(layout_key, layout)
+        self.row_list = layout["row_list"]
+        self.bay_list = layout["bay_list"]
+        self.pile_list = layout["pile_list"]
+        self.action_mapping = layout["action_mapping"]
+        self.location_specs = layout["location_specs"]
+        self.coord_to_id = layout["coord_to_id"]
+        self.to_location_features = layout["to_location_features"]
+        self.reachable = layout["reachable"]
+        self.is_output_point = layout["is_output_point"]
+        self.x_ranges = layout["x_ranges"]
+        self.crane_list = ["Crane-%d" % (i + 1) for i in range(len(self.crane_initial_coords))]
+
         self.action_size = len(self.pile_list) * len(self.crane_list)
         self.state_size = {"crane": 2, "pile": 1 + 1 * look_ahead}
         self.meta_data = (["crane", "pile"],
@@ -43,133 +82,477 @@ class SteelStockyard:
                            ("crane", "moving", "pile")])
         self.num_nodes = {"crane": len(self.crane_list), "pile": len(self.pile_list)}
 
+        scenario_key = get_scenario_key(data_src, config, seed) if use_cache else None
+        scenario = scenario_cache.get(scenario_key)
+        if scenario is None:
+            scenario = self._build_scenario()
+            scenario_cache.put(scenario_key, scenario)
+        self.plate_table = scenario["plate_table"]
+        self.plates_by_location = scenario["plates_by_location"]
+        self.initial_arena = scenario["arena"]
+        self.look_ahead_features = scenario["look_ahead_features"]
+        self.num_plates_to_location = scenario["num_plates_to_location"]
+        self.max_num_plates = scenario["max_num_plates"]
+        self.weight_prefix = scenario["weight_prefix"]
+
+        self.edge_index = None
+        self.edge_index_rev = None
+        self.crane_features = None
+        self.pile_features = None
+
+        self.arena = None
+        self.monitor = None
+        self.num_episodes = 0
+        self.crane_in_decision = None
+        self.loading_plans = {}
+        self.time = 0.0
+
+        # 구간별 실행 시간 측정 (profile_options: Profiler 설정 (trace, max_trace_events), environment.profiler 참고)
+        self.profiler = Profiler(**(profile_options or {})) if profile else None
+        if self.profiler is not None:
+            self.profiler.attach_yard(self)
+
+    def _build_layout(self):
+        # 강재 적치장 레이아웃 정보 (위치 ID 순서: 행 → 베이, 입고/출고 지점은 베이별로 하나씩)
+        row_list = [chr(i + 65) for i in range(self.row_range[0], self.row_range[1] + 1)]
+        bay_list = [i for i in range(self.bay_range[0], self.bay_range[1] + 1)]
+        pile_list = []
+        action_mapping = {}
+        location_specs = []
+        # 좌표(베이, 행) → 위치 ID 배열 (-1은 위치 없음)
+        coord_to_id = np.full((len(bay_list), len(row_list)), -1, dtype=np.int32)
+        for i, row_id in enumerate(row_list):
+            for bay_id in bay_list:
+                location_id = len(pile_list)
+                if bay_id in self.input_point_coords or bay_id in self.output_point_coords:
+                    if i != 0:
+                        continue
+                    code = "input_point" if bay_id in self.input_point_coords else "output_point"
+                    name = ("I" if code == "input_point" else "O") + str(bay_id).rjust(2, '0')
+                    location_specs.append((code, name, (bay_id,), None))
+                    coord_to_id[bay_id - self.bay_range[0], :] = location_id
+                else:
+                    code = "pile"
+                    name = row_id + str(bay_id).rjust(2, '0')
+                    type = "storage"
+                    for min_col, max_col in self.retrieval_pile_range.values():
+                        if min_col <= bay_id <= max_col:
+                            type = "retrieval"
+                    location_specs.append((code, name, (bay_id, i), type))
+                    coord_to_id[bay_id - self.bay_range[0], i] = location_id
+                action_mapping[location_id] = code
+                pile_list.append(name)
+
+        # 강재 목적지 특성 (목적지 x 좌표 기준, 0은 강재 없음을 의미)
+        to_location_features = np.array([(spec[2][0] + 1) / (self.bay_range[1] + 1) for spec in location_specs],
+                                        dtype=np.float32)
+
+        # 크레인별 도달 가능 위치 (다른 크레인들과의 안전 거리를 고려한 이동 범위 기준)
+        x_ranges = get_x_ranges(self.bay_range, self.safety_margin, len(self.crane_initial_coords))
+        xcoords = np.array([spec[2][0] for spec in location_specs])
+        reachable = np.array([(x_min <= xcoords) & (xcoords <= x_max) for x_min, x_max in x_ranges])
+        is_output_point = np.array([spec[0] == "output_point" for spec in location_specs])
+
+        return {"row_list": row_list, "bay_list": bay_list, "pile_list": pile_list,
+                "action_mapping": action_mapping, "location_specs": location_specs,
+                "coord_to_id": coord_to_id, "to_location_features": to_location_features,
+                "reachable": reachable, "is_output_point": is_output_point, "x_ranges": x_ranges}
+
+    def _build_scenario(self):
+        # 강재 정보를 열 단위 배열로 변환하고 출발 위치별로 한 번만 그룹화
+        # (DataGenerator는 DataFrame을 거치지 않도록 generate와 같은 난수로 생성한 열 단위 배열을 시나리오로 사용)
+        if type(self.data_src) is DataGenerator:
+            rng = np.random.default_rng(self.seed)
+            columns, offsets = self.data_src.sample(1, rng, name_dtype="U")
+            scenario = ScenarioSet.from_columns(columns, offsets, self.data_src.locations)[0]
+            plate_table = self._build_plate_table_from_scenario(scenario)
+        elif type(self.data_src) is Scenario:
+            scenario = self.data_src
+            plate_table = self._build_plate_table_from_scenario(scenario)
+        else:
+            # pandas는 엑셀 파일을 읽는 경우에만 필요
+            import pandas as pd
+
+            df_storage = pd.read_excel(self.data_src, sheet_name="storage", engine="openpyxl")
+            df_reshuffle = pd.read_excel(self.data_src, sheet_name="reshuffle", engine="openpyxl")
+            df_retrieval = pd.read_excel(self.data_src, sheet_name="retrieval", engine="openpyxl")
+            plate_table = self._build_plate_table(pd.concat([df_storage, df_reshuffle, df_retrieval],
+                                                            ignore_index=True))
+
+        plates_by_location = plate_table.group_by_location(len(self.pile_list))
+        num_plates_to_location = np.bincount(plate_table.to_location, minlength=len(self.pile_list))
+        max_num_plates = max(1, max(len(plates) for plates in plates_by_location))
+
+        # 위치별 강재 중량 누적합 (복수 강재 적재 계획에서 맨 위 강재들의 총 중량 계산에 사용)
+        weight_prefix = [np.concatenate([[0.0], np.cumsum(plate_table.weight[plates])]).tolist()
+                         for plates in plates_by_location]
+
+        # 에피소드 시작 시 복사하여 사용하는 초기 강재 스택
+        arena = StackArena.from_locations(plates_by_location, num_plates_to_location)
+        # 강재별 목적지 특성 (마지막 원소는 강재 없음을 나타내는 인덱스 -1에 대응)
+        look_ahead_features = np.append(self.to_location_features[plate_table.to_location], 0.0).astype(np.float32)
+
+        return {"plate_table": plate_table, "plates_by_location": plates_by_location, "arena": arena,
+                "look_ahead_features": look_ahead_features,
+                "num_plates_to_location": num_plates_to_location, "max_num_plates": max_num_plates,
+                "weight_prefix": weight_prefix}
+
+    def _build_plate_table(self, df_plates):
+        name_to_id = {name: i for i, name in enumerate(self.pile_list)}
+        from_locations = df_plates["from_location"].map(name_to_id)
+        to_locations = df_plates["to_location"].map(name_to_id)
+        if from_locations.isna().any() or to_locations.isna().any():
+            raise ValueError("plate data refers to locations that are not in the layout")
+
+        return PlateTable(df_plates["name"].to_numpy(), df_plates["id"].to_numpy(dtype=np.int64),
+                          df_plates["weight"].to_numpy(dtype=np.float64),
+                          from_locations.to_numpy(dtype=np.int32), to_locations.to_numpy(dtype=np.int32))
+
+    def _build_plate_table_from_scenario(self, scenario):
+        # 시나리오 집합의 위치 코드를 레이아웃의 위치 ID로 변환
+        name_to_id = {name: i for i, name in enumerate(self.pile_list)}
+        location_ids = np.array([name_to_id.get(name, -1) for name in scenario.locations] + [-1], dtype=np.int32)
+        from_locations = location_ids[scenario.from_location]
+        to_locations = location_ids[scenario.to_location]
+        if (from_locations < 0).any() or (to_locations < 0).any():
+            raise ValueError("plate data refers to locations that are not in the layout")
+
+        return PlateTable(scenario.name, scenario.id, scenario.weight,
+                          from_locations, to_locations)
 
     def step(self, action, mode):
         if self.decision_mode[mode] == "sequencing":
             self._step_for_sequencing(action)
         elif self.decision_mode[mode] == "prioritizing":
             self._step_for_prioritizing(action)
+        elif self.decision_mode[mode] == "multi-loading":
+            self._step_for_multi_loading(action)
         else:
             print("Wrong decision mode")
 
-        while True:
-            while True:
-                if self.monitor.scheduling_for_sequencing:
-                    mode = 0
-                    break
-                elif self.monitor.scheduling_for_prioritizing:
-                    mode = 1
-                    break
-                else:
-                    if len(self.model.move_list) == 0 and all([crane.idle for crane in self.cranes]):
-                        mode = 0
-                        done = True
-                        break
-                    elif len(self.model.move_list) == 0 and not all([crane.idle for crane in self.cranes]):
-                        mode = 1
-                        done = True
-                        break
-                    else:
-                        self.env.step()
+        info, done = self._run_until_decision()
+        next_state, mask = self._get_state(info)
+        mode = self._get_mode(info)
+
+        reward = self.time - self.env.now
+        self.time = self.env.now
+
+        # 에피소드 종료 시 스트리밍 중인 이벤트 로그 파일을 닫음
+        if done and self.monitor.recorder is not None:
+            self.monitor.recorder.close()
 
+        return next_state, reward, done, mask, mode
 
-        return next_state, reward, done, mode
+    def get_metrics(self):
+        # 현재 에피소드의 누적 KPI (에피소드 종료 후 호출 시 에피소드 결과 한 행)
+        return self.monitor.metrics.summary(self.env.now, self.cranes, self.output_points)
 
     def _step_for_sequencing(self, action):
         crane_id = action % self.num_nodes["crane"]
         pile_id = action // self.num_nodes["crane"]
-        pile_name = self.action_mapping[pile_id]
-        done = False
+        target_location_code = self.action_mapping[pile_id]
 
-        self.cranes[crane_id].event.succed(pile_name)
+        del self.monitor.queue_sequencing[crane_id]
+        self.cranes[crane_id].event_sequencing.succeed((pile_id, target_location_code))
 
-    def reset(self):
-        self.env, self.input_points, self.output_points, self.piles, self.cranes, self.monitor \
-            = self._build_simulation_model()
+    def _step_for_prioritizing(self, action):
+        crane_id = action % self.num_nodes["crane"]
+        crane = self.crane_in_decision
+        priority = "high" if crane_id == crane.id else "low"
 
-        while True:
-            while True:
-                flag, info = self.monitor.request_scheduling()
-                if flag:
-                    while self.env.now in [event[0] for event in self.env._queue]:
-                        self.env.step()
-                    break
-                else:
-                    self.env.step()
+        del self.monitor.queue_prioritizing[crane.id]
+        crane.event_prioritizing.succeed(priority)
 
-            initial_state, mask = self._get_state(info)
+    def _step_for_multi_loading(self, action):
+        # 선택한 위치를 포함하는 적재 계획 중 최선의 계획 실행
+        pile_id = action // self.num_nodes["crane"]
+        crane = self.crane_in_decision
 
-            if info == "sequencing" and not mask.any():
-                if not mask[0].any():
-                    self.cranes[0].event_sequencing.succeed(("None", "None"))
-                if not mask[1].any():
-                    self.cranes[1].event_sequencing.succeed(("None", "None"))
-                break
-            else:
-                break
+        del self.monitor.queue_loading[crane.id]
+        crane.event_loading.succeed(self.loading_plans[pile_id])
 
-            return initial_state, mask
+    def _step_for_loading(self, crane):
+        # 에이전트가 적재 계획을 결정하지 않는 경우 자동으로 결정
+        if self.loading_mode == "single":
+            loading_location_ids = self.monitor.planner.single(crane)
+        else:
+            loading_location_ids = self.monitor.planner.greedy(crane)
 
+        del self.monitor.queue_loading[crane.id]
+        crane.event_loading.succeed(loading_location_ids)
 
-    def _get_state(self, info):
-        pass
+    def _get_mode(self, info):
+        if info == "prioritizing":
+            return 2
+        elif info == "loading":
+            return 1
+        else:
+            return 0
+
+    def reset(self, seed=None):
+        self._start_episode(seed)
+        self.time = 0.0
+        self._init_state()
+
+        info, done = self._run_until_decision()
+        initial_state, mask = self._get_state(info)
+        mode = self._get_mode(info)
+
+        return initial_state, mask, mode
+
+    def simulate(self, rule, seed=None):
+        # 규칙 기반 의사결정으로 에피소드 전체를 실행하고 에피소드 KPI 반환 (step 인터페이스를 거치지 않음)
+        self._start_episode(seed)
+        planner = self.monitor.planner if self.loading_mode != "single" else None
+        self.monitor.dispatcher = Dispatcher(rule, self.piles, self.monitor, planner)
+        self.env.run()
+        if self.monitor.recorder is not None:
+            self.monitor.recorder.close()
+        return self.get_metrics()
+
+    def snapshot(self):
+        # 현재 의사결정 시점의 시뮬레이션 상태 (rollout / 탐색 시 restore로 같은 시점부터 재개, environment.snapshot 참고)
+        return take_snapshot(self)
+
+    def restore(self, snapshot):
+        # 스냅샷 시점으로 시뮬레이션을 재구성하고 해당 시점의 (상태, 마스크, 의사결정 유형) 반환
+        return restore_snapshot(self, snapshot)
+
+    def profile_report(self, trace_path=None):
+        # 구간별 실행 시간과 유형별 이벤트 수 (trace_path 지정 시 Chrome trace JSON 파일 저장)
+        if self.profiler is None:
+            raise ValueError("profiling is disabled (create the environment with profile=True)")
+        if trace_path is not None:
+            self.profiler.save_trace(trace_path)
+        return self.profiler.report()
+
+    def _start_episode(self, seed=None):
+        # 에피소드별 시드를 기록하여 reset(seed=env.episode_seed)로 동일한 에피소드를 재현
+        if seed is None:
+            seed = int(self.seed_sequence.spawn(1)[0].generate_state(1, np.uint64)[0])
+        self.episode_seed = seed
 
+        self.env, self.input_points, self.output_points, self.piles, self.cranes, self.monitor \
+            = self._build_simulation_model()
+        self.locations = {**self.input_points, **self.piles, **self.output_points}
 
-    def _build_simulation_model(self):
-        env = simpy.Environment()
-        monitor = Monitor()
+    def _run_until_decision(self):
+        while True:
+            if self.run_mode == "polling":
+                flag, info = self._poll_until_decision()
+            else:
+                flag, info = self._fast_forward_until_decision()
+
+            if self.monitor.num_plates_remaining == 0 or not flag:
+                self.crane_in_decision = None
+                return None, True
+
+            if info == "prioritizing":
+                self.crane_in_decision = next(iter(self.monitor.queue_prioritizing.values()))
+            elif info == "sequencing":
+                self.crane_in_decision = next(iter(self.monitor.queue_sequencing.values()))
+                mask = self._get_mask(info)
+                if not mask.any():
+                    del self.monitor.queue_sequencing[self.crane_in_decision.id]
+                    self.crane_in_decision.event_sequencing.succeed((None, "None"))
+                    continue
+            else:
+                crane = next(iter(self.monitor.queue_loading.values()))
+                if self.loading_mode == "decision":
+                    _, self.loading_plans = self.monitor.planner.plan(crane)
+                    if len(self.loading_plans) > 1:
+                        self.crane_in_decision = crane
+                        return info, False
+                self._step_for_loading(crane)
+                continue
+
+            return info, False
+
+    def _poll_until_decision(self):
+        # 이벤트를 하나씩 처리하며 매번 의사결정 요청 여부를 확인
+        while True:
+            if self.monitor.num_plates_remaining == 0:
+                return False, None
 
-        row_list = [chr(i) for i in range(ord(self.row_range[0]), ord(self.row_range[1]) + 1)]
-        bay_list = [i for i in range(self.bay_range[0], self.bay_range[1] + 1)]
+            flag, info = self.monitor.request_scheduling()
+            if flag:
+                # 동일 시점의 남은 이벤트 처리 (이벤트 큐는 시각 순 힙이므로 대기열 전체 대신 첫 이벤트만 확인)
+                while self.env.peek() == self.env.now:
+                    self.env.step()
+                return self.monitor.request_scheduling()
+            elif self.env.peek() == simpy.core.Infinity:
+                return False, None
+            else:
+                self.env.step()
+
+    def _fast_forward_until_decision(self):
+        # 의사결정 대기열이 채워질 때까지(Monitor.trigger_decision) 이벤트를 연속 처리한 뒤 동일 시점의 이벤트를 처리
+        # env.run(until=이벤트)은 종료할 때마다 종료 이벤트를 다시 스케줄하고 예외를 발생시키므로 (의사결정마다 이벤트 2개)
+        # 대기열이 채워졌는지 여부만 확인하며 직접 이벤트를 처리
+        monitor = self.monitor
+        flag, info = monitor.request_scheduling()
+        if not flag and monitor.num_plates_remaining > 0:
+            step = self.env.step
+            monitor.decision_ready = False
+            monitor.waiting_decision = True
+            try:
+                while not monitor.decision_ready:
+                    step()
+            except simpy.core.EmptySchedule:
+                # 더 이상 진행 가능한 이벤트가 없는 경우 에피소드 종료
+                return False, None
+            finally:
+                monitor.waiting_decision = False
+
+        while self.env.peek() == self.env.now:
+            self.env.step()
+        return monitor.request_scheduling()
+
+    def _get_state(self, info):
+        # torch / PyG는 그래프 상태를 생성하는 경우에만 필요 (규칙 기반 simulate만 사용하는 경우 불러오지 않음)
+        import torch
+        from torch_geometric.data import HeteroData
+
+        # 크레인 특성은 매 시점 갱신, 파일 특성은 강재 이동이 발생한 위치만 갱신
+        for crane in self.cranes.values():
+            crane.settle()
+            target_xcoord = crane.target_location_coord[0] if crane.status != "idle" \
+                else crane.current_location_coord[0]
+            self.crane_features[crane.id, 0] = crane.current_location_coord[0] / self.bay_range[1]
+            self.crane_features[crane.id, 1] = target_xcoord / self.bay_range[1]
+
+        if len(self.monitor.updated_locations) > 0:
+            self._update_pile_features(list(self.monitor.updated_locations))
+            self.monitor.updated_locations.clear()
+
+        state = HeteroData()
+        state["crane"].x = torch.from_numpy(self.crane_features.copy())
+        state["pile"].x = torch.from_numpy(self.pile_features.copy())
+        state["crane", "moving", "pile"].edge_index = self.edge_index
+        state["pile", "moving_rev", "crane"].edge_index = self.edge_index_rev
+
+        mask = self._get_mask(info)
+
+        return state, torch.from_numpy(mask.reshape(-1))
+
+    def _init_state(self):
+        # 크레인-파일 간 간선은 레이아웃에 의해 고정되므로 최초 1회만 생성
+        if self.edge_index is None:
+            self.edge_index, self.edge_index_rev = get_edge_index(len(self.crane_list), len(self.pile_list))
+
+        self.crane_features = np.zeros((len(self.crane_list), self.state_size["crane"]), dtype=np.float32)
+        self.pile_features = np.zeros((len(self.pile_list), self.state_size["pile"]), dtype=np.float32)
+        self._update_pile_features(np.arange(len(self.pile_list)))
+        self.monitor.updated_locations.clear()
+
+    def _update_pile_features(self, location_ids):
+        # 강재 수와 상위 look_ahead개 강재의 목적지 특성을 StackArena로부터 한 번에 계산
+        # 출고 지점은 출고 요청 여부만 표시 (출고 지점의 반출 대상 스택은 항상 비어 있음)
+        location_ids = np.asarray(location_ids, dtype=np.int64)
+        top = self.arena.top_k(location_ids, self.look_ahead)
+        self.pile_features[location_ids, 0] = np.where(self.is_output_point[location_ids],
+                                                       self.monitor.feasibility.has_job[location_ids],
+                                                       self.arena.size[location_ids] / self.max_num_plates)
+        self.pile_features[location_ids, 1:] = self.look_ahead_features[top]
+
+    def _get_mask(self, info):
+        # 행동 공간: action = pile_id * num_cranes + crane_id
+        mask = np.zeros((len(self.pile_list), len(self.crane_list)), dtype=bool)
+        crane = self.crane_in_decision
+        if crane is None:
+            return mask
+
+        if info == "prioritizing":
+            # 간섭이 예측된 두 크레인 중 우선순위가 높은 크레인 선택
+            conflict_crane = crane.conflict_crane
+            mask[crane.target_location.id, crane.id] = True
+            mask[conflict_crane.target_location.id, conflict_crane.id] = True
+        elif info == "sequencing":
+            # 다른 크레인들이 작업 중이거나 적재 예정인 위치를 제외하고 작업 가능 위치 정보로부터 마스크 생성
+            mask[:, crane.id] = self.monitor.feasibility.get_mask(crane.id, crane.get_reserved_location_ids())
+        elif info == "loading":
+            mask[list(self.loading_plans), crane.id] = True
+
+        return mask
+
+    def _build_simulation_model(self, snapshot=None):
+        # snapshot이 주어지면 스냅샷 시점의 시각, 강재 스택, 난수 상태로 생성하고 각 프로세스는 중단된 단계부터 재개
+        env = simpy.Environment(initial_time=snapshot["time"]) if snapshot is not None else simpy.Environment()
+        # 이전 에피소드의 이벤트 기록을 마무리하고 (중단된 에피소드의 스트리밍 파일도 닫음),
+        # 스트리밍 기록은 에피소드(스냅샷 복원 포함)마다 별도 파일에 기록
+        if self.monitor is not None and self.monitor.recorder is not None:
+            self.monitor.recorder.close()
+        log_options = self.log_options
+        if log_options is not None and log_options.get("path") is not None:
+            log_options = dict(log_options, path=get_episode_path(log_options["path"], self.num_episodes))
+        self.num_episodes += 1
+        monitor = Monitor(record_events=self.record_events, log_options=log_options)
 
         input_points = {}
         output_points = {}
         piles = {}
 
-        location_id = 0
-        for i, row_id in enumerate(row_list):
-            for j, bay_id in enumerate(bay_list):
-                if bay_id in self.input_point_coords:
-                    name = "I" + str(bay_id).rjust(2, '0')
-                    coord = (bay_id,)
-                    plates = []
-                    df_plates = self.df_storage[self.df_storage["from_location"] == name]
-                    for k, row in df_plates.iterrows():
-                        plate = Plate(row["name"], row["id"], row["from_location"], row["to_location"], row["weight"])
-                        plates.append(plate)
-                    input_points[location_id] = InputPoint(env, name, location_id, coord, plates, monitor)
-                elif bay_id in self.output_point_coords:
-                    name = "O" + str(bay_id).rjust(2, '0')
-                    coord = (bay_id,)
-                    irt = self.inter_retrieval_times[bay_id]
-                    output_points[location_id] = OutputPoint(env, name, location_id, coord, irt, monitor)
-                else:
-                    name = row_id + str(bay_id).rjust(2, '0')
-                    type = "retrieval" if self.retrieval_pile_range[0] <= bay_id <= self.retrieval_pile_range[1] \
-                        else "storage"
-                    coord = (i, bay_id)
-                    plates = []
-                    if type == "storage":
-                        df_plates = self.df_reshuffle[self.df_reshuffle["from_location"] == name]
-                    else:
-                        df_plates = self.df_retrieval[self.df_retrieval["from_location"] == name]
-                    for k, row in df_plates.iterrows():
-                        plate = Plate(row["name"], row["id"], row["from_location"], row["to_location"], row["weight"])
-                        plates.append(plate)
-                    piles[location_id] = Pile(env, name, location_id, type, coord, plates, monitor)
-                location_id += 1
+        # 출고 요청은 출고 지점별로 독립된 난수 스트림을 사용 (정책에 따라 요청 시점이 바뀌지 않도록)
+        num_output_points = sum(1 for code, _, _, _ in self.location_specs if code == "output_point")
+        rngs = [np.random.default_rng(seed) for seed in spawn_seeds(self.episode_seed, num_output_points)]
 
-        cranes = {}
-        crane1 = Crane(env, 'Crane-1', 0, self.crane_velocity, self.safety_margin, self.crane_1_initial_coord,
-                       input_points, piles, output_points, monitor, self.row_range, self.bay_range)
-        crane2 = Crane(env, 'Crane-2', 1, self.crane_velocity, self.safety_margin, self.crane_2_initial_coord,
-                       input_points, piles, output_points, monitor, self.row_range, self.bay_range)
+        # 모든 위치의 강재 스택은 시나리오의 초기 스택을 복사한 하나의 배열에 저장
+        if snapshot is None:
+            self.arena = self.initial_arena.copy()
+        else:
+            plates, size = snapshot["arena"]
+            self.arena = StackArena(plates.copy(), self.initial_arena.head, size.copy())
+        monitor.num_plates_remaining = len(self.plate_table)
+
+        for location_id, (code, name, coord, type) in enumerate(self.location_specs):
+            if code == "input_point":
+                input_points[location_id] = InputPoint(env, name, location_id, coord, self.arena, monitor)
+            elif code == "output_point":
+                irt = self.inter_retrieval_times[str(coord[0])]
+                num_plates = int(self.num_plates_to_location[location_id])
+                output_points[location_id] = OutputPoint(env, name, location_id, coord, irt, num_plates,
+                                                         self.arena, monitor)
+            else:
+                piles[location_id] = Pile(env, name, location_id, type, coord, self.arena, monitor)
+
+        # 작업 가능 위치 정보 초기화 (이후에는 강재 반출 및 출고 요청 시점에 갱신)
+        # (스냅샷에서 복원하는 경우 environment.snapshot에서 저장된 값으로 설정)
+        feasibility = FeasibilityIndex(self.reachable, self.is_output_point, self.plate_table.to_location)
+        if snapshot is None:
+            for location_id in input_points:
+                feasibility.update_source(location_id, self.arena.top(location_id))
+            for location_id, pile in piles.items():
+                if pile.type == "storage":
+                    feasibility.update_source(location_id, self.arena.top(location_id))
+                else:
+                    feasibility.update_retrieval_pile(location_id, self.arena.top(location_id))
+        monitor.feasibility = feasibility
+        monitor.planner = LoadingPlanner(piles, self.plate_table, feasibility, self.weight_prefix,
+                                         self.weight_limit, self.number_limit, self.pile_limit)
 
-        crane1.other_crane = crane2
-        crane2.other_crane = crane1
+        # 모든 출고 지점의 출고 요청 발생 (스냅샷에서 복원하는 경우 environment.snapshot에서 상태 설정)
+        monitor.demand = DemandStream(env, output_points, rngs, **(self.demand_options or {}))
+        if snapshot is None:
+            monitor.demand.start()
 
-        cranes[0] = crane1
-        cranes[1] = crane2
+        cranes = {}
+        for crane_id, name in enumerate(self.crane_list):
+            resume = None
+            if snapshot is not None:
+                resume = (snapshot["cranes"][crane_id]["phase"], snapshot["cranes"][crane_id]["move_phase"])
+            cranes[crane_id] = Crane(env, name, crane_id, self.crane_velocity, self.safety_margin,
+                                     self.crane_initial_coords[crane_id], input_points, piles, output_points,
+                                     self.plate_table, monitor, self.row_range, self.bay_range, self.coord_to_id,
+                                     self.x_ranges[crane_id], resume)
+
+        # 간섭 확인은 레일 위 인접 크레인을 따라 양쪽 방향으로 진행 (크레인 ID 순서 = 레일 위 왼쪽부터의 순서)
+        for crane_id, crane in cranes.items():
+            crane.left_crane = cranes.get(crane_id - 1)
+            crane.right_crane = cranes.get(crane_id + 1)
+            crane.other_cranes = [other_crane for other_crane in cranes.values() if other_crane is not crane]
+
+        if self.profiler is not None:
+            self.profiler.attach_model(env, cranes, monitor)
 
         return env, input_points, output_points, piles, cranes, monitor
 
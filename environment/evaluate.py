@@ -0,0 +1,401 @@
+import os
+import csv
+import time
+import importlib
+import traceback
+import numpy as np
+import multiprocessing as mp
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from environment.batch import get_batch_template
+from environment.env import SteelStockyard
+from environment.scenario import ScenarioSet
+
+
+# 시나리오 집합 전체에 대한 정책 / 규칙 평가
+# 시나리오를 작업 프로세스별로 나누어 실행하고, 학습된 정책은 메인 프로세스에서 모든 작업 프로세스의 관측을 모아 한 번에 추론
+# 완료된 시나리오의 결과는 즉시 결과 파일(CSV)에 추가하므로 중단된 평가는 같은 결과 파일로 다시 실행하면 이어서 진행
+
+
+def get_row(env, index, seed, wall_time):
+    # 시나리오별 결과 (makespan, 처리한 강재 수, 크레인별 유휴 / 회피 시간, 반출 완료된 출고 요청 수)
+    metrics = env.get_metrics()
+    row = {"scenario": index, "seed": seed, "makespan": metrics["makespan"],
+           "num_plates": sum(metrics[crane.name + "/num_plates"] for crane in env.cranes.values()),
+           "num_conflicts": metrics["num_conflicts"], "num_interruptions": metrics["num_interruptions"]}
+    for crane in env.cranes.values():
+        row[crane.name + "/idle_time"] = metrics[crane.name + "/idle_time"]
+        row[crane.name + "/avoiding_time"] = crane.avoiding_time
+        row[crane.name + "/waiting_time"] = metrics[crane.name + "/waiting_time"]
+    num_retrievals = [metrics[output_point.name + "/num_retrievals"] for output_point in env.output_points.values()]
+    delays = [metrics[output_point.name + "/mean_retrieval_delay"] for output_point in env.output_points.values()]
+    row["num_retrievals"] = sum(num_retrievals)
+    row["mean_retrieval_delay"] = float(np.dot(num_retrievals, delays) / max(sum(num_retrievals), 1))
+    row["wall_time"] = wall_time
+    return row
+
+
+def get_random_policy(seed=None):
+    # 가능한 행동 중 하나를 균등하게 선택하는 정책 (평가 파이프라인 확인용)
+    import torch
+
+    generator = torch.Generator()
+    if seed is not None:
+        generator.manual_seed(seed)
+
+    def policy(states, masks, modes):
+        return torch.multinomial(masks.float(), 1, generator=generator).squeeze(1)
+
+    return policy
+
+
+def load_policy(spec, checkpoint=None):
+    # spec: "모듈:함수" 형식의 정책 생성 함수 (checkpoint 경로를 받아 policy(states, masks, modes) 함수를 반환)
+    # "random"은 get_random_policy 사용
+    if spec == "random":
+        return get_random_policy(0)
+    module_name, _, function_name = spec.partition(":")
+    if not function_name:
+        raise ValueError("policy must be given as 'module:function'")
+    return getattr(importlib.import_module(module_name), function_name)(checkpoint)
+
+
+def parse_value(value):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+class ResultWriter:
+    # 결과 파일에 행 단위로 기록 (기존 파일이 있으면 완료된 시나리오를 읽어 이어서 기록)
+    def __init__(self, path):
+        self.path = path
+        self.rows = []
+        self.fieldnames = None
+        if path is not None and os.path.isfile(path):
+            with open(path, 'r', newline='') as f:
+                text = f.read()
+            # 행은 줄바꿈까지 한 번에 기록되므로 줄바꿈으로 끝나지 않는 마지막 행은 기록 도중 중단되어 잘린 행
+            # (열 수가 맞거나 값이 일부만 기록된 경우도 있으므로 내용이 아닌 줄바꿈으로 판단)
+            lines = text.splitlines(keepends=True)
+            if not text.endswith("\n"):
+                lines = lines[:-1]
+            reader = csv.DictReader(lines)
+            # 값은 파이썬 int / float로 변환 (pandas의 문자열 변환은 마지막 자리가 달라질 수 있음)
+            self.rows = [{key: parse_value(value) for key, value in row.items()} for row in reader]
+            self.fieldnames = reader.fieldnames
+            # 잘린 행을 제거한 파일로 교체
+            self.rewrite()
+
+    def get_completed(self):
+        return {int(row["scenario"]) for row in self.rows}
+
+    def rewrite(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', newline='') as f:
+            if self.fieldnames is not None:
+                writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+                writer.writeheader()
+                writer.writerows(self.rows)
+        os.replace(temp_path, self.path)
+
+    def write(self, rows):
+        if len(rows) == 0:
+            return
+        if self.path is not None and self.fieldnames is None:
+            # 첫 결과의 열 순서로 헤더 기록
+            self.fieldnames = list(rows[0])
+            self.rewrite()
+        self.rows.extend(rows)
+        if self.path is None:
+            return
+        with open(self.path, 'a', newline='') as f:
+            csv.DictWriter(f, fieldnames=self.fieldnames).writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+_config = None
+_scenario_set = None
+_env_kwargs = None
+
+
+def _init_worker(config, path, env_kwargs):
+    global _config, _scenario_set, _env_kwargs
+    _config = config
+    _scenario_set = ScenarioSet(path)
+    _env_kwargs = env_kwargs
+
+
+def _simulate(task):
+    rule, index, seed = task
+    env = SteelStockyard(_scenario_set[index], _config, seed=seed, **_env_kwargs)
+    start = time.perf_counter()
+    env.simulate(rule)
+    return rule, get_row(env, index, seed, time.perf_counter() - start)
+
+
+def simulate_rules(config, path, tasks, num_workers=None, start_method=None, env_kwargs=None):
+    # (규칙, 시나리오 번호, 시드) 작업별로 작업 프로세스 안에서 에피소드 전체를 실행하고 완료되는 순서대로 (규칙, 결과) 반환
+    # 실패한 작업(작업 프로세스의 비정상 종료 포함)은 규칙과 시나리오를 포함한 RuntimeError로 보고
+    # (multiprocessing.Pool은 작업 프로세스가 비정상 종료되면 해당 작업의 결과를 무한히 기다리므로 ProcessPoolExecutor 사용)
+    env_kwargs = env_kwargs or {}
+    num_workers = max(1, min(num_workers or mp.cpu_count(), len(tasks)))
+    if num_workers > 1:
+        executor = ProcessPoolExecutor(num_workers, mp_context=mp.get_context(start_method),
+                                       initializer=_init_worker, initargs=(config, path, env_kwargs))
+        try:
+            futures = {executor.submit(_simulate, task): task for task in tasks}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except BrokenProcessPool as error:
+                    # 작업 프로세스가 비정상 종료되면 완료되지 않은 작업이 모두 실패하므로 해당 시나리오를 함께 보고
+                    wait(futures)
+                    unfinished = sorted(index for other, (_, index, _) in futures.items() if other.exception())
+                    raise RuntimeError("a worker process exited before finishing rule %s on scenarios %s"
+                                       % (futures[future][0], unfinished)) from error
+                except Exception as error:
+                    raise RuntimeError("rule %s failed on scenario %d (seed %d): %r"
+                                       % (*futures[future], error)) from error
+                yield result
+        finally:
+            executor.shutdown(cancel_futures=True)
+    else:
+        _init_worker(config, path, env_kwargs)
+        for task in tasks:
+            try:
+                result = _simulate(task)
+            except Exception as error:
+                raise RuntimeError("rule %s failed on scenario %d (seed %d): %r" % (*task, error)) from error
+            yield result
+
+
+def _worker(remote, config, path, tasks, num_envs, env_kwargs):
+    # 배정된 시나리오를 num_envs개의 환경 슬롯에서 실행 (에피소드가 끝난 슬롯은 다음 시나리오로 재시작)
+    # 시나리오 실행 중 발생한 예외는 (시나리오 번호, 시드, traceback)으로 메인 프로세스에 전달
+    import torch
+
+    torch.set_num_threads(1)
+    _init_worker(config, path, env_kwargs)
+    tasks = deque(tasks)
+    slots = [None] * num_envs
+    rows, errors = [], []
+
+    def start(slot_id):
+        # 의사결정 없이 끝나는 시나리오(reset 시점에 이미 종료)는 바로 결과를 기록하고 다음 시나리오 실행
+        while tasks:
+            index, seed = tasks.popleft()
+            slots[slot_id] = [None, index, seed]
+            env = SteelStockyard(_scenario_set[index], _config, seed=seed, **_env_kwargs)
+            start_time = time.perf_counter()
+            state, mask, mode = env.reset()
+            if env.crane_in_decision is not None:
+                slots[slot_id] = [env, index, seed, start_time, state, mask, mode]
+                return
+            rows.append(get_row(env, index, seed, time.perf_counter() - start_time))
+        slots[slot_id] = None
+
+    def run(slot_id, function, *args):
+        try:
+            function(slot_id, *args)
+        except Exception:
+            errors.append((*slots[slot_id][1:3], traceback.format_exc()))
+            slots[slot_id] = None
+
+    def step(slot_id, action):
+        slot = slots[slot_id]
+        env, index, seed, start_time = slot[:4]
+        state, reward, done, mask, mode = env.step(action, slot[6])
+        if done:
+            rows.append(get_row(env, index, seed, time.perf_counter() - start_time))
+            start(slot_id)
+        else:
+            slot[4:] = [state, mask, mode]
+
+    try:
+        for slot_id in range(num_envs):
+            run(slot_id, start)
+        actions = {}
+        while True:
+            for slot_id, action in actions.items():
+                run(slot_id, step, action)
+            # 진행 중인 환경의 관측 (시나리오 번호, 노드 특성, 행동 마스크, 의사결정 유형)을 numpy 배열로 전송
+            observations = [(slot_id, slot[1], slot[4]["crane"].x.numpy(), slot[4]["pile"].x.numpy(),
+                             slot[5].numpy(), slot[6]) for slot_id, slot in enumerate(slots) if slot is not None]
+            remote.send((observations, rows, errors))
+            rows.clear()
+            errors.clear()
+            actions = remote.recv()
+            if actions is None:
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        remote.close()
+
+
+class BatchBuilder:
+    # 작업 프로세스들의 관측을 하나의 배치 그래프로 구성 (배치 크기별 간선 정보는 한 번만 생성)
+    def __init__(self, env):
+        self.num_nodes = env.num_nodes
+        self.state_size = env.state_size
+        self.templates = {}
+
+    def get_batch(self, crane_features, pile_features, masks):
+        import torch
+
+        batch_size = len(masks)
+        template = self.templates.get(batch_size)
+        if template is None:
+            template = self.templates[batch_size] = get_batch_template(self.num_nodes, self.state_size, batch_size)
+
+        batch = template.clone()
+        batch["crane"].x = torch.from_numpy(np.concatenate(crane_features))
+        batch["pile"].x = torch.from_numpy(np.concatenate(pile_features))
+        return batch, torch.from_numpy(np.stack(masks))
+
+
+def evaluate(config, path, policy=None, rule=None, output=None, num_workers=None, num_envs=4, seed=0,
+             num_threads=None, start_method=None, env_kwargs=None):
+    # 시나리오 집합의 모든 시나리오를 정책(policy) 또는 규칙(rule)으로 평가하여 시나리오별 결과 반환
+    # policy: policy(states, masks, modes) -> actions (배치 그래프, 행동 마스크 [배치, 행동 수], 의사결정 유형 [배치])
+    # output: 결과 CSV 파일 (이미 있으면 완료된 시나리오를 제외하고 이어서 평가), num_envs: 작업 프로세스당 환경 수
+    # 시나리오 index의 시드는 seed + index (benchmark.dispatching.evaluate_rules와 동일)
+    if (policy is None) == (rule is None):
+        raise ValueError("exactly one of policy and rule must be given")
+    env_kwargs = env_kwargs or {}
+
+    writer = ResultWriter(output)
+    completed = writer.get_completed()
+    tasks = [(index, seed + index) for index in range(len(ScenarioSet(path))) if index not in completed]
+    num_workers = max(1, min(num_workers or mp.cpu_count(), len(tasks)))
+    ctx = mp.get_context(start_method)
+
+    if len(tasks) == 0:
+        pass
+    elif rule is not None:
+        # 규칙 기반 평가는 작업 프로세스 안에서 에피소드 전체를 실행
+        rule_tasks = [(rule, index, task_seed) for index, task_seed in tasks]
+        for _, row in simulate_rules(config, path, rule_tasks, num_workers, start_method, env_kwargs):
+            writer.write([row])
+    else:
+        import torch
+
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+        builder = BatchBuilder(SteelStockyard(ScenarioSet(path)[0], config, **env_kwargs))
+
+        # 시나리오는 작업 프로세스별로 번갈아 배정하여 시나리오 크기에 따른 부하 차이를 줄임
+        # (작업 프로세스가 비정상 종료된 경우 결과를 받지 못한 시나리오를 보고하기 위해 배정된 시나리오 기록)
+        remotes, processes = [], []
+        pending = [{index for index, _ in tasks[worker_id::num_workers]} for worker_id in range(num_workers)]
+        for worker_id in range(num_workers):
+            remote, work_remote = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(work_remote, config, path, tasks[worker_id::num_workers],
+                                                        num_envs, env_kwargs), daemon=True)
+            process.start()
+            work_remote.close()
+            remotes.append(remote)
+            processes.append(process)
+
+        try:
+            actions = [None for _ in remotes]
+            active = list(range(num_workers))
+            while active:
+                for worker_id in active:
+                    if actions[worker_id] is not None:
+                        remotes[worker_id].send(actions[worker_id])
+                keys, indices, crane_features, pile_features, masks, modes = [], [], [], [], [], []
+                for worker_id in list(active):
+                    try:
+                        observations, rows, errors = remotes[worker_id].recv()
+                    except (EOFError, ConnectionResetError):
+                        raise RuntimeError("worker %d exited before finishing scenarios %s"
+                                           % (worker_id, sorted(pending[worker_id]))) from None
+                    writer.write(rows)
+                    pending[worker_id].difference_update(row["scenario"] for row in rows)
+                    if errors:
+                        index, task_seed, message = errors[0]
+                        raise RuntimeError("evaluation failed on scenario %d (seed %d):\n%s"
+                                           % (index, task_seed, message))
+                    if len(observations) == 0:
+                        active.remove(worker_id)
+                    for slot_id, index, crane_x, pile_x, mask, mode in observations:
+                        keys.append((worker_id, slot_id))
+                        indices.append(index)
+                        crane_features.append(crane_x)
+                        pile_features.append(pile_x)
+                        masks.append(mask)
+                        modes.append(mode)
+                if len(keys) == 0:
+                    break
+
+                states, mask_batch = builder.get_batch(crane_features, pile_features, masks)
+                # 가능한 행동이 없는 관측은 정책에 전달하지 않음 (정책이 임의의 행동을 선택하게 되므로)
+                infeasible = np.flatnonzero(~mask_batch.any(dim=1).numpy())
+                if len(infeasible) > 0:
+                    raise RuntimeError("no feasible action at a decision point of scenarios %s"
+                                       % sorted({indices[i] for i in infeasible}))
+                with torch.inference_mode():
+                    batch_actions = policy(states, mask_batch, np.array(modes, dtype=np.int64))
+                if torch.is_tensor(batch_actions):
+                    batch_actions = batch_actions.cpu().numpy()
+
+                actions = [{} for _ in remotes]
+                for (worker_id, slot_id), action in zip(keys, batch_actions):
+                    actions[worker_id][slot_id] = int(action)
+        finally:
+            for remote in remotes:
+                try:
+                    remote.send(None)
+                except (BrokenPipeError, EOFError):
+                    pass
+            for process in processes:
+                process.join(timeout=1.0)
+                if process.is_alive():
+                    process.terminate()
+
+    import pandas as pd
+
+    results = pd.DataFrame(writer.rows)
+    if len(results) > 0:
+        results = results.sort_values("scenario").reset_index(drop=True)
+    return results
+
+
+if __name__ == "__main__":
+    import json
+    import argparse
+
+    parser = argparse.ArgumentParser(description="evaluate a policy or a dispatching rule on a scenario set")
+    parser.add_argument("--config", type=str, default="./input/env_config.json", help="environment config file")
+    parser.add_argument("--scenarios", type=str, required=True, help="scenario set directory")
+    parser.add_argument("--output", type=str, required=True, help="results CSV file (resumed if it exists)")
+    parser.add_argument("--policy", type=str, default=None, help="'module:function' policy factory or 'random'")
+    parser.add_argument("--checkpoint", type=str, default=None, help="checkpoint passed to the policy factory")
+    parser.add_argument("--rule", type=str, default=None, help="dispatching rule (instead of a policy)")
+    parser.add_argument("--num_workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--num_envs", type=int, default=4, help="environments per worker process")
+    parser.add_argument("--num_threads", type=int, default=None, help="torch threads for policy inference")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first scenario")
+    parser.add_argument("--look_ahead", type=int, default=2)
+    parser.add_argument("--loading_mode", type=str, default="greedy")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    policy = load_policy(args.policy, args.checkpoint) if args.policy is not None else None
+    env_kwargs = {"look_ahead": args.look_ahead, "loading_mode": args.loading_mode}
+
+    start = time.perf_counter()
+    results = evaluate(config, args.scenarios, policy=policy, rule=args.rule, output=args.output,
+                       num_workers=args.num_workers, num_envs=args.num_envs, seed=args.seed,
+                       num_threads=args.num_threads, env_kwargs=env_kwargs)
+    print("evaluated %d scenarios in %.2f s: makespan %.1f (mean), %.1f retrievals served (mean) -> %s"
+          % (len(results), time.perf_counter() - start, results["makespan"].mean(),
+             results["num_retrievals"].mean(), args.output))
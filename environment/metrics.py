@@ -0,0 +1,95 @@
+from collections import defaultdict
+
+
+class Metrics:
+    # 이벤트 발생 시점마다 누적 지표를 갱신하여 로그 없이도 에피소드 KPI 계산 (record_events와 무관하게 동작)
+    def __init__(self):
+        # 크레인별 이동 / 대기 시간 및 처리 강재 수
+        self.travel_time = defaultdict(float)
+        self.empty_travel_time = defaultdict(float)
+        self.idle_time = defaultdict(float)
+        self.waiting_time = defaultdict(float)
+        self.num_moves = defaultdict(int)
+        self.num_plates = defaultdict(int)
+
+        # 크레인 간 간섭 (우선순위 결정이 필요한 충돌 예측 / 이동 중단 / 정지한 크레인 밀어냄)
+        self.num_conflicts = 0
+        self.num_interruptions = 0
+        self.num_pushes = 0
+
+        # 출고 지점별 출고 요청부터 반출까지의 지연 시간
+        self.num_retrievals = defaultdict(int)
+        self.retrieval_delay = defaultdict(float)
+        self.max_retrieval_delay = defaultdict(float)
+
+        # 작업 대기열 길이의 시간 가중 누적값
+        self.queue_length = defaultdict(int)
+        self.queue_time = defaultdict(float)
+        self.queue_area = defaultdict(float)
+        self.max_queue_length = defaultdict(int)
+
+    def get_state(self):
+        # 스냅샷 저장용 지표 값 (defaultdict는 dict로 변환)
+        return {key: dict(value) if isinstance(value, defaultdict) else value for key, value in vars(self).items()}
+
+    @classmethod
+    def from_state(cls, state):
+        metrics = cls()
+        for key, value in state.items():
+            if isinstance(getattr(metrics, key), defaultdict):
+                getattr(metrics, key).update(value)
+            else:
+                setattr(metrics, key, value)
+        return metrics
+
+    def add_travel(self, crane_id, moving_time, empty):
+        self.travel_time[crane_id] += moving_time
+        if empty:
+            self.empty_travel_time[crane_id] += moving_time
+        self.num_moves[crane_id] += 1
+
+    def add_retrieval(self, output_point_id, delay):
+        self.num_retrievals[output_point_id] += 1
+        self.retrieval_delay[output_point_id] += delay
+        if delay > self.max_retrieval_delay[output_point_id]:
+            self.max_retrieval_delay[output_point_id] = delay
+
+    def update_queue(self, key, now, length):
+        self.queue_area[key] += self.queue_length[key] * (now - self.queue_time[key])
+        self.queue_time[key] = now
+        self.queue_length[key] = length
+        if length > self.max_queue_length[key]:
+            self.max_queue_length[key] = length
+
+    def summary(self, now, cranes=None, output_points=None):
+        # 에피소드 지표를 한 행으로 반환 (키: 지표 이름, 값: float 또는 int)
+        row = {"makespan": now, "num_conflicts": self.num_conflicts, "num_interruptions": self.num_interruptions,
+               "num_pushes": self.num_pushes}
+
+        crane_names = {id: crane.name for id, crane in (cranes or {}).items()}
+        for crane_id in sorted(set(self.travel_time) | set(crane_names)):
+            prefix = crane_names.get(crane_id, "Crane-%d" % (crane_id + 1))
+            travel_time = self.travel_time[crane_id]
+            row[prefix + "/utilization"] = travel_time / now if now > 0 else 0.0
+            row[prefix + "/empty_travel_ratio"] = self.empty_travel_time[crane_id] / travel_time \
+                if travel_time > 0 else 0.0
+            row[prefix + "/idle_time"] = self.idle_time[crane_id]
+            row[prefix + "/waiting_time"] = self.waiting_time[crane_id]
+            row[prefix + "/num_moves"] = self.num_moves[crane_id]
+            row[prefix + "/num_plates"] = self.num_plates[crane_id]
+
+        output_point_names = {id: output_point.name for id, output_point in (output_points or {}).items()}
+        for output_point_id in sorted(set(self.num_retrievals) | set(output_point_names)):
+            prefix = output_point_names.get(output_point_id, str(output_point_id))
+            num_retrievals = self.num_retrievals[output_point_id]
+            row[prefix + "/num_retrievals"] = num_retrievals
+            row[prefix + "/mean_retrieval_delay"] = self.retrieval_delay[output_point_id] / num_retrievals \
+                if num_retrievals > 0 else 0.0
+            row[prefix + "/max_retrieval_delay"] = self.max_retrieval_delay[output_point_id]
+
+        for key in sorted(self.queue_length):
+            area = self.queue_area[key] + self.queue_length[key] * (now - self.queue_time[key])
+            row["queue_%s/mean_length" % key] = area / now if now > 0 else 0.0
+            row["queue_%s/max_length" % key] = self.max_queue_length[key]
+
+        return row
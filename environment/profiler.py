@@ -0,0 +1,139 @@
+import json
+
+from time import perf_counter_ns
+from collections import Counter
+
+
+# 환경의 주요 구간별 실행 시간을 측정하는 선택적 계측 도구 (SteelStockyard(profile=True)로 사용)
+# 계측 대상 메서드를 인스턴스 속성으로 감싸는 방식이므로 사용하지 않는 경우 실행 경로에 추가 비용이 없음
+# 구간이 중첩되는 경우(step 안의 event, event 안의 check_interference 등) self 시간은 하위 구간을 제외한 시간
+#   reset / step / simulate / restore: 환경 인터페이스 호출
+#   event: 시뮬레이션 이벤트 하나의 처리, check_interference: 크레인 간 간섭 예측
+#   state: 상태(HeteroData) 생성, mask: 행동 마스크 생성, record: 이벤트 로그 기록
+#   policy: step(또는 reset)이 반환된 후 다음 step이 호출되기까지의 시간 (정책 추론 등 환경 외부의 시간)
+
+PHASES = ("reset", "step", "simulate", "restore", "event", "check_interference", "state", "mask", "record", "policy")
+
+
+class Profiler:
+    def __init__(self, trace=False, max_trace_events=1000000):
+        # trace: Chrome trace(chrome://tracing, Perfetto) 형식으로 구간별 기록 저장 (최대 max_trace_events개)
+        self.trace = trace
+        self.max_trace_events = max_trace_events
+        self.clear()
+
+    def clear(self):
+        self.timers = {}
+        self.event_counts = Counter()
+        self.trace_events = []
+        self.stack = []
+        self.origin = perf_counter_ns()
+        self.last_return = None
+
+    def add(self, name, start, elapsed, self_elapsed, args=None):
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = [0, 0, 0]
+        timer[0] += 1
+        timer[1] += elapsed
+        timer[2] += self_elapsed
+        if self.trace and len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append((name, start, elapsed, args))
+
+    def wrap(self, obj, method_name, name):
+        # obj의 메서드를 구간 시간을 측정하는 함수로 교체 (하위 구간의 시간은 상위 구간의 self 시간에서 제외)
+        func = getattr(obj, method_name)
+        stack = self.stack
+
+        def timed(*args, **kwargs):
+            stack.append(0)
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter_ns() - start
+                self.add(name, start, elapsed, elapsed - stack.pop())
+                if stack:
+                    stack[-1] += elapsed
+
+        setattr(obj, method_name, timed)
+
+    def wrap_interface(self, obj, method_name):
+        # 환경 인터페이스 호출 사이의 시간을 policy 구간으로 기록
+        func = getattr(obj, method_name)
+        stack = self.stack
+
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            if self.last_return is not None and method_name == "step":
+                self.add("policy", self.last_return, start - self.last_return, start - self.last_return)
+            self.last_return = None
+            stack.append(0)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = perf_counter_ns()
+                self.add(method_name, start, end - start, end - start - stack.pop())
+                self.last_return = end
+
+        setattr(obj, method_name, timed)
+
+    def wrap_step(self, env):
+        # 이벤트 처리 시간 측정 및 이벤트 클래스별 이벤트 수 집계
+        step = env.step
+        queue = env._queue
+        stack = self.stack
+        event_counts = self.event_counts
+
+        def timed_step():
+            kind = type(queue[0][3]).__name__ if queue else "None"
+            event_counts[kind] += 1
+            stack.append(0)
+            start = perf_counter_ns()
+            try:
+                step()
+            finally:
+                elapsed = perf_counter_ns() - start
+                self.add("event", start, elapsed, elapsed - stack.pop(), kind)
+                if stack:
+                    stack[-1] += elapsed
+
+        env.step = timed_step
+
+    def attach_yard(self, yard):
+        for method_name in ("reset", "step", "simulate", "restore"):
+            self.wrap_interface(yard, method_name)
+        self.wrap(yard, "_get_state", "state")
+        self.wrap(yard, "_get_mask", "mask")
+
+    def attach_model(self, env, cranes, monitor):
+        # 에피소드마다 새로 생성되는 시뮬레이션 모델의 객체에 계측 함수 설정
+        self.wrap_step(env)
+        for crane in cranes.values():
+            self.wrap(crane, "check_interference", "check_interference")
+        if monitor.record_events:
+            self.wrap(monitor, "record", "record")
+
+    def report(self):
+        # 구간별 호출 수, 전체 / self 시간 [ms], 호출당 평균 시간 [us]와 self 시간 비율, 유형별 이벤트 수
+        total_self = sum(timer[2] for timer in self.timers.values())
+        phases = {}
+        for name in PHASES:
+            if name not in self.timers:
+                continue
+            calls, elapsed, self_elapsed = self.timers[name]
+            phases[name] = {"calls": calls, "total_ms": elapsed / 1e6, "self_ms": self_elapsed / 1e6,
+                            "mean_us": elapsed / calls / 1e3,
+                            "self_share": self_elapsed / total_self if total_self > 0 else 0.0}
+        return {"phases": phases, "events": dict(self.event_counts.most_common())}
+
+    def save_trace(self, file_path):
+        if not self.trace:
+            raise ValueError("trace recording is disabled (use profile_options={'trace': True})")
+        trace_events = []
+        for name, start, elapsed, args in self.trace_events:
+            trace_event = {"name": name if args is None else "%s:%s" % (name, args), "cat": name, "ph": "X",
+                           "ts": (start - self.origin) / 1e3, "dur": elapsed / 1e3, "pid": 0, "tid": 0}
+            trace_events.append(trace_event)
+        with open(file_path, 'w') as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,172 @@
+import os
+from collections import deque
+
+import numpy as np
+
+
+log_columns = ["Time", "Event", "Crane", "Location", "Plate", "Tag"]
+record_dtype = np.dtype([("Time", np.float64), ("Event", np.int32), ("Crane", np.int32),
+                         ("Location", np.int32), ("Plate", np.int32), ("Tag", np.int32)])
+
+
+def get_episode_path(path, episode):
+    # 에피소드별 스트리밍 기록 파일 경로 (path의 {episode}를 에피소드 번호로 치환, 없으면 확장자 앞에 번호 추가)
+    if "{episode}" in path:
+        return path.replace("{episode}", str(episode))
+    root, ext = os.path.splitext(path)
+    return "%s_%d%s" % (root, episode, ext)
+
+
+class Vocab(dict):
+    # 범주형 값 → 코드 사전 (처음 조회되는 값은 다음 코드로 등록)
+    def __missing__(self, value):
+        code = self[value] = len(self)
+        return code
+
+
+class EventRecorder:
+    # 이벤트 로그를 고정 크기 청크 단위로 열 단위 배열에 기록 (문자열 값은 범주형 코드로 변환)
+    # 기록 시에는 열별 리스트에 값만 추가하고 (튜플을 만들지 않으므로 GC 추적 대상 객체가 늘지 않음),
+    # 코드 변환은 청크 단위로 일괄 수행
+    # path 지정 시 청크마다 Parquet / Arrow IPC 파일에 기록하고,
+    # max_events 지정 시 최근 max_events개의 이벤트만 유지하는 링 버퍼로 동작
+    def __init__(self, chunk_size=16384, path=None, file_format="parquet", max_events=None):
+        if file_format not in ("parquet", "arrow"):
+            raise ValueError("file_format must be 'parquet' or 'arrow'")
+        if max_events is not None and path is not None:
+            raise ValueError("ring buffer mode does not support streaming export")
+
+        self.chunk_size = chunk_size
+        self.path = path
+        self.file_format = file_format
+        self.max_events = max_events
+
+        # 열별 범주형 값 사전 (None은 항상 코드 0)
+        self.vocabs = [Vocab({None: 0}) for _ in log_columns[1:]]
+        self.num_flushed = 0
+        self.chunks = []
+        if max_events is None:
+            self.pending = [[] for _ in log_columns]
+        else:
+            # 링 버퍼는 오래된 이벤트를 열별 deque가 함께 버리므로 청크 변환 없이 버린 이벤트 수만 별도로 기록
+            self.pending = [deque(maxlen=max_events) for _ in log_columns]
+            self.record = self._record_ring
+
+        self.sink = None
+        self.writer = None
+        self.closed = False
+
+    @property
+    def num_events(self):
+        return self.num_flushed + len(self.pending[0])
+
+    def record(self, time, event, crane=None, location=None, plate=None, tag=None):
+        times, events, cranes, locations, plates, tags = self.pending
+        times.append(time)
+        events.append(event)
+        cranes.append(crane)
+        locations.append(location)
+        plates.append(plate)
+        tags.append(tag)
+        if len(times) == self.chunk_size:
+            self.flush()
+
+    def _record_ring(self, time, event, crane=None, location=None, plate=None, tag=None):
+        times, events, cranes, locations, plates, tags = self.pending
+        if len(times) == self.max_events:
+            self.num_flushed += 1
+        times.append(time)
+        events.append(event)
+        cranes.append(crane)
+        locations.append(location)
+        plates.append(plate)
+        tags.append(tag)
+
+    def flush(self):
+        if not self.pending[0] or self.max_events is not None:
+            return
+
+        if self.closed:
+            raise RuntimeError("cannot record events after the recorder is closed")
+
+        chunk = self._encode(self.pending)
+        if self.path is None:
+            self.chunks.append(chunk)
+        else:
+            self._write(chunk)
+        self.num_flushed += len(chunk)
+        self.pending = [[] for _ in log_columns]
+
+    def close(self):
+        # 남은 이벤트를 기록하고 파일을 닫음 (이후의 기록은 허용하지 않음)
+        if self.closed:
+            return
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.sink.close()
+        self.closed = True
+
+    def get_logs(self):
+        # pandas는 로그를 DataFrame으로 반환하는 경우에만 필요
+        import pandas as pd
+
+        # 스트리밍 기록 파일은 닫힌 후에만 읽을 수 있으므로 에피소드 도중에는 기록을 끝내지 않고 오류 발생
+        # (에피소드가 끝나면 SteelStockyard가 close를 호출)
+        if self.path is not None:
+            if not self.closed:
+                raise RuntimeError("streamed event logs can only be read after the episode ends "
+                                   "(or after calling close)")
+            return self._read()
+
+        if self.max_events is not None:
+            records = self._encode([list(values) for values in self.pending])
+        else:
+            records = np.concatenate(self.chunks + [self._encode(self.pending)])
+        return pd.DataFrame(self._decode(records), columns=log_columns)
+
+    def _encode(self, columns):
+        # 사전 조회 한 번으로 코드 변환 (새 값은 조회 시 등록, pandas 없이 동작)
+        records = np.empty(len(columns[0]), dtype=record_dtype)
+        if len(records) == 0:
+            return records
+
+        records["Time"] = columns[0]
+        for key, vocab, values in zip(log_columns[1:], self.vocabs, columns[1:]):
+            records[key] = np.fromiter(map(vocab.__getitem__, values), dtype=np.int32, count=len(values))
+        return records
+
+    def _decode(self, records):
+        data = {"Time": records["Time"]}
+        for key, vocab in zip(log_columns[1:], self.vocabs):
+            data[key] = np.array(list(vocab), dtype=object)[records[key]]
+        return data
+
+    def _write(self, chunk):
+        # pyarrow는 스트리밍 기록을 사용하는 경우에만 필요
+        import pyarrow as pa
+
+        schema = pa.schema([("Time", pa.float64())] + [(key, pa.string()) for key in log_columns[1:]])
+        table = pa.table(self._decode(chunk), schema=schema)
+        if self.writer is None:
+            self.sink = pa.OSFile(self.path, 'wb')
+            if self.file_format == "parquet":
+                import pyarrow.parquet as pq
+                self.writer = pq.ParquetWriter(self.sink, schema)
+            else:
+                self.writer = pa.ipc.new_file(self.sink, schema)
+        self.writer.write_table(table)
+
+    def _read(self):
+        import pyarrow as pa
+        import pandas as pd
+
+        if self.writer is None:
+            return pd.DataFrame(columns=log_columns)
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+            table = pq.read_table(self.path)
+        else:
+            with pa.memory_map(self.path, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas()
@@ -0,0 +1,172 @@
+import os
+import json
+import uuid
+import numpy as np
+
+
+sheet_names = ["storage", "reshuffle", "retrieval"]
+
+
+class Scenario:
+    # 시나리오 집합 내 하나의 시나리오 (각 열은 메모리 매핑된 배열의 슬라이스)
+    def __init__(self, scenario_set, index):
+        self.scenario_set = scenario_set
+        self.index = index
+
+        start, end = scenario_set.offsets[index], scenario_set.offsets[index + 1]
+        self.name = scenario_set.columns["name"][start:end]
+        self.id = scenario_set.columns["id"][start:end]
+        self.weight = scenario_set.columns["weight"][start:end]
+        self.from_location = scenario_set.columns["from_location"][start:end]
+        self.to_location = scenario_set.columns["to_location"][start:end]
+        self.sheet = scenario_set.columns["sheet"][start:end]
+        self.locations = scenario_set.locations
+
+    def __len__(self):
+        return len(self.id)
+
+    def get_key(self):
+        return ("scenario_set", self.scenario_set.path, self.scenario_set.mtime, self.index)
+
+    def to_frames(self):
+        import pandas as pd
+
+        # 강재 이름 열은 UTF-8 바이트("S") 또는 고정 길이 유니코드("U") 배열 (memmap 포함)
+        locations = np.asarray(self.locations, dtype=object)
+        names = np.asarray(self.name)
+        names = np.char.decode(names, "utf-8") if names.dtype.kind == "S" else names.astype(str)
+        df_plates = pd.DataFrame({"name": names, "id": np.asarray(self.id),
+                                  "from_location": locations[self.from_location],
+                                  "to_location": locations[self.to_location],
+                                  "weight": np.asarray(self.weight)})
+        sheet = np.asarray(self.sheet)
+        return tuple(df_plates[sheet == i].reset_index(drop=True) for i in range(len(sheet_names)))
+
+
+class ScenarioSet:
+    def __init__(self, path, mmap_mode="r"):
+        self.path = os.path.abspath(path)
+        manifest_path = os.path.join(self.path, "manifest.json")
+        with open(manifest_path, 'r') as f:
+            self.manifest = json.load(f)
+        self.mtime = os.path.getmtime(manifest_path)
+
+        self.locations = self.manifest["locations"]
+        self.sources = self.manifest.get("sources", [])
+        self.seeds = self.manifest.get("seeds", [])
+        self.offsets = np.load(os.path.join(self.path, "offsets.npy"))
+        self.columns = {}
+        for key in ["name", "id", "weight", "from_location", "to_location", "sheet"]:
+            self.columns[key] = np.load(os.path.join(self.path, key + ".npy"), mmap_mode=mmap_mode)
+
+    @classmethod
+    def from_columns(cls, columns, offsets, locations, sources=None, seeds=None):
+        # 디스크를 거치지 않는 메모리 상의 시나리오 집합 (캐시 키를 위해 고유한 경로 부여)
+        scenario_set = cls.__new__(cls)
+        scenario_set.path = "memory-" + uuid.uuid4().hex
+        scenario_set.mtime = None
+        scenario_set.manifest = get_manifest(offsets, locations, sources, seeds)
+        scenario_set.locations = list(locations)
+        scenario_set.sources = sources or []
+        scenario_set.seeds = seeds or []
+        scenario_set.offsets = np.asarray(offsets, dtype=np.int64)
+        scenario_set.columns = columns
+        return scenario_set
+
+    def save(self, path):
+        return save_columns(path, self.columns, self.offsets, self.locations, self.sources, self.seeds)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("scenario index out of range")
+        return Scenario(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+def is_scenario_set(path):
+    return isinstance(path, (str, os.PathLike)) and os.path.isfile(os.path.join(path, "manifest.json"))
+
+
+def write_scenarios(path, scenarios, sources=None):
+    # scenarios: (df_storage, df_reshuffle, df_retrieval) 튜플의 리스트
+    names, ids, weights, from_locations, to_locations, sheets = [], [], [], [], [], []
+    offsets = [0]
+    for frames in scenarios:
+        for i, df in enumerate(frames):
+            names.append(df["name"].to_numpy(dtype=str))
+            ids.append(df["id"].to_numpy(dtype=np.int64))
+            weights.append(df["weight"].to_numpy(dtype=np.float64))
+            from_locations.append(df["from_location"].to_numpy(dtype=str))
+            to_locations.append(df["to_location"].to_numpy(dtype=str))
+            sheets.append(np.full(len(df), i, dtype=np.int8))
+        offsets.append(offsets[-1] + sum(len(df) for df in frames))
+    num_plates = offsets[-1]
+
+    # 위치 이름은 어휘 사전과 정수 코드로 저장
+    import pandas as pd
+
+    codes, locations = pd.factorize(np.concatenate(from_locations + to_locations + [np.array([], dtype=str)]))
+    columns = {"name": np.char.encode(np.concatenate(names + [np.array([], dtype=str)]), "utf-8"),
+               "id": np.concatenate(ids + [np.array([], dtype=np.int64)]),
+               "weight": np.concatenate(weights + [np.array([], dtype=np.float64)]),
+               "from_location": codes[:num_plates].astype(np.int32),
+               "to_location": codes[num_plates:].astype(np.int32),
+               "sheet": np.concatenate(sheets + [np.array([], dtype=np.int8)])}
+
+    return save_columns(path, columns, offsets, locations.tolist(), sources)
+
+
+def get_manifest(offsets, locations, sources=None, seeds=None):
+    # seeds: 시나리오별 생성 시드 (DataGenerator.generate(rng=np.random.default_rng(seed))로 재생성 가능)
+    return {"format": "dcsp-scenarios", "version": 1, "num_scenarios": len(offsets) - 1,
+            "num_plates": int(offsets[-1]), "locations": list(locations), "sources": sources or [],
+            "seeds": seeds or []}
+
+
+def save_columns(path, columns, offsets, locations, sources=None, seeds=None):
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "offsets.npy"), np.asarray(offsets, dtype=np.int64))
+    for key, values in columns.items():
+        np.save(os.path.join(path, key + ".npy"), values)
+
+    # manifest는 마지막에 기록 (캐시 키로 manifest의 수정 시각을 사용)
+    with open(os.path.join(path, "manifest.json"), 'w') as f:
+        json.dump(get_manifest(offsets, locations, sources, seeds), f, indent=4)
+
+    return ScenarioSet(path)
+
+
+def convert_excel(file_paths, path):
+    import pandas as pd
+
+    scenarios = []
+    for file_path in file_paths:
+        df_storage = pd.read_excel(file_path, sheet_name="storage", engine="openpyxl")
+        df_reshuffle = pd.read_excel(file_path, sheet_name="reshuffle", engine="openpyxl")
+        df_retrieval = pd.read_excel(file_path, sheet_name="retrieval", engine="openpyxl")
+        scenarios.append((df_storage, df_reshuffle, df_retrieval))
+
+    return write_scenarios(path, scenarios, sources=[os.path.basename(file_path) for file_path in file_paths])
+
+
+if __name__ == "__main__":
+    import glob
+    import argparse
+
+    parser = argparse.ArgumentParser(description="convert Excel scenario files into a binary scenario set")
+    parser.add_argument("inputs", nargs="+", type=str, help="Excel files or glob patterns")
+    parser.add_argument("--output", type=str, required=True, help="output directory of the scenario set")
+    args = parser.parse_args()
+
+    file_paths = sorted(file_path for pattern in args.inputs for file_path in glob.glob(pattern))
+    scenario_set = convert_excel(file_paths, args.output)
+    print("converted %d scenarios (%d plates) into %s"
+          % (len(scenario_set), scenario_set.manifest["num_plates"], scenario_set.path))
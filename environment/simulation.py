@@ -1,133 +1,220 @@
 import simpy
-import random
 import numpy as np
-import pandas as pd
 
 from collections import OrderedDict
+from environment.metrics import Metrics
+from environment.recorder import EventRecorder, log_columns
+from environment.trajectory import Leg, sign, clamp, travel_time, get_x_ranges, safe_xcoord, legs_conflict
 
 
-class Plate:
-    def __init__(self, name, id, from_location, to_location, weight):
-        self.name = name
-        self.id = id
-        self.from_location = from_location
-        self.to_location = to_location
-        self.weight = weight
+class PlateTable:
+    # 강재 정보를 열 단위 NumPy 구조체 배열로 저장 (위치는 위치 ID로 표현)
+    dtype = np.dtype([("id", np.int64), ("weight", np.float64),
+                      ("from_location", np.int32), ("to_location", np.int32)])
+
+    def __init__(self, names, ids, weights, from_locations, to_locations):
+        # 강재 이름은 이벤트 기록에만 사용되므로 바이트 문자열도 그대로 보관
+        self.names = np.asarray(names)
+        self.data = np.zeros(len(self.names), dtype=self.dtype)
+        self.data["id"] = ids
+        self.data["weight"] = weights
+        self.data["from_location"] = from_locations
+        self.data["to_location"] = to_locations
+
+        self.id = self.data["id"]
+        self.weight = self.data["weight"]
+        self.from_location = self.data["from_location"]
+        self.to_location = self.data["to_location"]
+
+    def __len__(self):
+        return len(self.data)
+
+    def get_name(self, idx):
+        name = self.names[idx]
+        return name.decode("utf-8") if isinstance(name, bytes) else str(name)
+
+    def group_by_location(self, num_locations):
+        # 출발 위치별 강재 인덱스 (데이터 상의 순서 유지, 마지막 강재가 최상단)
+        order = np.argsort(self.from_location, kind="stable")
+        counts = np.bincount(self.from_location, minlength=num_locations)
+        return np.split(order, np.cumsum(counts)[:-1])
 
 
 class InputPoint:
-    def __init__(self, env, name, id, coord, plates, monitor):
+    # 강재는 StackArena에 저장 (plates는 반출 대상 강재 스택의 view)
+    def __init__(self, env, name, id, coord, arena, monitor):
         self.env = env
         self.name = name
         self.id = id
         self.coord = coord
-        self.plates = plates
+        self.arena = arena
         self.monitor = monitor
 
-        self.call = None
-        self.action = env.process(self.run())
-
-    def run(self):
-        while len(self.plates) != 0:
+        if self.arena.size[self.id] > 0:
             self.monitor.queue_storage[self.id] = self
-            self.call = self.env.event()
-            yield self.call
+            self.monitor.metrics.update_queue("storage", env.now, len(self.monitor.queue_storage))
+
+    @property
+    def plates(self):
+        return self.arena.stack(self.id)
 
     def get_plate(self):
-        plate = self.plates.pop()
+        plate = self.arena.pop(self.id)
+        if self.arena.size[self.id] == 0:
+            self.monitor.queue_storage.pop(self.id, None)
+            self.monitor.metrics.update_queue("storage", self.env.now, len(self.monitor.queue_storage))
+        self.monitor.updated_locations.add(self.id)
+        if self.monitor.feasibility is not None:
+            self.monitor.feasibility.update_source(self.id, self.arena.top(self.id))
         return plate
 
 
 class Pile:
-    def __init__(self, env, name, id, type, coord, plates, monitor):
+    # 반출 대상 강재(plates)와 적치된 강재(plates_stacked)는 StackArena의 서로 다른 스택
+    def __init__(self, env, name, id, type, coord, arena, monitor):
         self.env = env
         self.name = name
         self.id = id
         self.type = type
         self.coord = coord
-        self.plates = plates
+        self.arena = arena
         self.monitor = monitor
 
-        self.plates_stacked = []
-        self.call = None
+        self.stacked_id = arena.num_locations + id
 
-        if len(plates) > 0:
-            self.action = env.process(self.run())
+        if self.arena.size[self.id] > 0 and self.type == "storage":
+            self.monitor.queue_reshuffle[self.id] = self
+            self.monitor.metrics.update_queue("reshuffle", env.now, len(self.monitor.queue_reshuffle))
 
-    def run(self):
-        while len(self.plates) != 0:
-            if type == "storage":
-                self.monitor.queue_reshuffle[self.id] = self
-            elif type == "retrieval":
-                self.monitor.queue_retireval[self.id] = self
-            else:
-                print("Invalid type")
+    @property
+    def plates(self):
+        return self.arena.stack(self.id)
 
-            self.call = self.env.event()
-            yield self.call
+    @property
+    def plates_stacked(self):
+        return self.arena.stack(self.stacked_id)
 
     def get_plate(self):
-        plate = self.plates.pop()
+        plate = self.arena.pop(self.id)
+        if self.arena.size[self.id] == 0:
+            self.monitor.queue_reshuffle.pop(self.id, None)
+            self.monitor.metrics.update_queue("reshuffle", self.env.now, len(self.monitor.queue_reshuffle))
+        self.monitor.updated_locations.add(self.id)
+        if self.monitor.feasibility is not None:
+            if self.type == "storage":
+                self.monitor.feasibility.update_source(self.id, self.arena.top(self.id))
+            else:
+                self.monitor.feasibility.update_retrieval_pile(self.id, self.arena.top(self.id))
         return plate
 
     def put_plate(self, plate):
-        self.plates_stacked.append(plate)
+        self.arena.push(self.stacked_id, plate)
+        self.monitor.num_plates_remaining -= 1
+        self.monitor.updated_locations.add(self.id)
 
 
 class OutputPoint:
-    def __init__(self, env, name, id, coord, irt, monitor):
+    # 출고 요청은 environment.demand.DemandStream이 발생시키며, 출고 지점은 요청 상태와 반출된 강재만 관리
+    def __init__(self, env, name, id, coord, irt, num_plates, arena, monitor):
         self.env = env
         self.name = name
         self.id = id
         self.coord = coord
         self.irt = irt
+        self.num_plates = num_plates
+        self.arena = arena
         self.monitor = monitor
 
-        self.plates_retrieved = []
+        # 출고 완료된 강재는 StackArena의 적치 스택에 기록
+        self.stacked_id = arena.num_locations + id
         self.call = None
-
-        self.action = env.process(self.run())
-
-    def run(self):
-        while True:
-            irt = np.random.geometric(self.irt)
-            yield self.env.timeout(irt)
-            if self.monitor.record_events:
-                self.monitor.record(self.env.now, "Retrieval", crane=None, location=self.name, plate=None)
-
-            self.monitor.queue_retireval[self.id] = self
-            self.call = self.env.event()
-            yield self.call
+        self.request_time = 0.0
+
+    @property
+    def plates_retrieved(self):
+        return self.arena.stack(self.stacked_id)
+
+    def request_retrieval(self, request_time=None):
+        # request_time: 요청 시각 (기록 재생 시 이전 요청의 처리를 기다린 요청은 기록된 시각, 없으면 현재 시각)
+        if self.monitor.record_events:
+            self.monitor.record(self.env.now, "Retrieval", crane=None, location=self.name, plate=None)
+
+        self.monitor.queue_retrieval[self.id] = self
+        self.monitor.metrics.update_queue("retrieval", self.env.now, len(self.monitor.queue_retrieval))
+        self.request_time = request_time if request_time is not None else self.env.now
+        self.monitor.updated_locations.add(self.id)
+        if self.monitor.feasibility is not None:
+            self.monitor.feasibility.update_request(self.id, True)
+        self.monitor.notify()
+        self.call = self.env.event()
 
     def put_plate(self, plate):
-        self.plates_retrieved.append(plate)
+        self.arena.push(self.stacked_id, plate)
+        self.monitor.num_plates_remaining -= 1
+        if self.call is not None and not self.call.triggered:
+            self.monitor.queue_retrieval.pop(self.id, None)
+            self.monitor.metrics.update_queue("retrieval", self.env.now, len(self.monitor.queue_retrieval))
+            self.monitor.metrics.add_retrieval(self.id, self.env.now - self.request_time)
+            self.monitor.updated_locations.add(self.id)
+            if self.monitor.feasibility is not None:
+                self.monitor.feasibility.update_request(self.id, False)
+            self.call.succeed()
 
 
 class Crane:
-    def __init__(self, env, name, id, velocity, safety_margin, initial_location,
-                 input_points, piles, output_points, monitor, row_range=(0, 1), bay_range=(0, 43)):
+    def __init__(self, env, name, id, velocity, safety_margin, initial_coord,
+                 input_points, piles, output_points, plate_table, monitor, row_range=(0, 1), bay_range=(0, 43),
+                 coord_to_id=None, x_range=None, resume=None):
         self.env = env
         self.name = name
         self.id = id
         self.x_velocity = velocity[0]
         self.y_velocity = velocity[1]
         self.safety_margin = safety_margin
-        self.initial_location = initial_location
+        self.initial_coord = initial_coord
         self.input_points = input_points
         self.piles = piles
         self.output_points = output_points
+        self.plate_table = plate_table
         self.monitor = monitor
         self.row_range = row_range
         self.bay_range = bay_range
 
-        self.other_crane = None
+        # 레일 위 인접 크레인 (크레인 ID는 레일 위 왼쪽부터의 순서)
+        # 모든 이동 구간을 양쪽 크레인들과 비교하고 밀어내므로 (check_interference, clear_path 참고) 이 순서가 유지됨
+        self.left_crane = None
+        self.right_crane = None
+        self.other_cranes = []
+        # 간섭이 예측된 크레인 / 회피 이동 후 이동 완료를 기다리는 크레인 / 이 크레인을 밀어내는 크레인
+        self.conflict_crane = None
+        self.blocking_crane = None
+        self.pushed_by = None
+
+        # 위치 좌표(베이, 행)별 input point / pile / output point ID 배열 (-1은 위치 없음)
+        self.locations = {**input_points, **piles, **output_points}
+        self.coord_to_id = coord_to_id
+        if self.coord_to_id is None:
+            self.coord_to_id = np.full((bay_range[1] - bay_range[0] + 1, row_range[1] - row_range[0] + 1), -1,
+                                       dtype=np.int32)
+            for id, location in self.locations.items():
+                if type(location) is Pile:
+                    self.coord_to_id[location.coord[0] - bay_range[0], location.coord[1] - row_range[0]] = id
+                else:
+                    self.coord_to_id[location.coord[0] - bay_range[0], :] = id
+
+        # 크레인 이동 가능 범위 (양쪽 크레인들과의 안전 거리 고려, 지정하지 않으면 두 크레인 기준)
+        self.x_range = x_range if x_range is not None else get_x_ranges(bay_range, safety_margin, 2)[id]
 
         # 크레인 위치 정보
         self.target_location = None
         self.target_location_coord = (-1.0, -1.0)
-        self.current_location = initial_location
-        self.current_location_coord = initial_location.coord
+        self.current_location = self.locations[int(self.coord_to_id[initial_coord[0] - bay_range[0],
+                                                                    initial_coord[1] - row_range[0]])]
+        self.current_location_coord = (float(initial_coord[0]), float(initial_coord[1]))
+        self.leg = Leg(0.0, self.current_location_coord, 0.0, 0.0, self.x_velocity, self.y_velocity)
         self.safety_xcoord = -1.0
+        self.avoidance = False
+        self.move_index = 0
 
         self.offset_location = None
         self.loading_location_ids = []
@@ -137,6 +224,8 @@ class Crane:
         # 크레인 작업 정보
         self.job_type = None
         self.status = "idle"
+        self.moving = False
+        self.yielding = False
         self.waiting_for_avoidance = False
 
         # 의사결정을 위한 이벤트 생성
@@ -145,243 +234,788 @@ class Crane:
         self.event_sequencing = None
         self.event_loading = None
         self.event_prioritizing = None
+        self.move_timeout = None
 
         # 크레인 관련 지표 기록
         self.start_time = 0.0
+        self.idle_start = 0.0
+        self.waiting_start = 0.0
         self.idle_time = 0.0
         self.empty_travel_time = 0.0
         self.avoiding_time = 0.0
         self.extended_moving_time = 0.0
 
-        # 위치 좌표 별 input point / pile / output point ID 매핑
-        self.coord_to_id = {}
-        for id, input_point in input_points.items():
-            for i in range(row_range[0], row_range[1] + 1):
-                coord = (input_point[0], i)
-                self.coord_to_id[coord] = id
-        for id, pile in piles.items():
-            self.coord_to_id[pile.coord] = id
-        for id, output_point in output_points.items():
-            for i in range(row_range[0], row_range[1] + 1):
-                coord = (output_point[0], i)
-                self.coord_to_id[coord] = id
-
         self.move_process = None
-        self.action = env.process(self.run())
+        self.action = self.start(resume)
 
-    def run(self):
-        while True:
-            # 크레인 작업 분배 및 작업 순서 결정과 관련한 의사결정
-            self.monitor.queue_sequencing[self.id] = self
-            self.event_sequencing = self.env.event()
-            target_location_id, target_location_code = yield self.event_sequencing
+    def start(self, resume=None):
+        # 크레인 프로세스 시작
+        return self.env.process(self.run(resume))
 
-            # 해당 크레인이 이동 가능한 강재가 없을 시 대기
-            if target_location_code == "None":
-                self.idle = self.env.event()
+    def run(self, resume=None):
+        # resume: 스냅샷에서 복원한 경우 프로세스가 중단된 단계 (단계, 이동 단계), environment.snapshot 참고
+        if resume is not None:
+            yield from self.resume(*resume)
 
-                idle_start = self.env.now
-                if self.monitor.record_events:
-                    self.monitor.record(self.env.now, "Idle_Start", crane=self.name,
-                                        location=self.current_location.name, plate=None)
+        while True:
+            # 크레인 작업 분배 및 작업 순서 결정과 관련한 의사결정
+            decision = self.request_sequencing()
+            if decision is None:
+                decision = yield self.event_sequencing
+            yield from self.execute(*decision)
+
+    def resume(self, phase, move_phase=None):
+        # 중단된 단계의 남은 작업을 마친 후 run의 작업 순서 결정 단계로 복귀
+        if phase == "sequencing":
+            decision = yield self.event_sequencing
+            yield from self.execute(*decision)
+        elif phase == "idle":
+            yield self.idle
+            self.finish_idle()
+            self.status = "idle"
+        elif phase == "loading_decision":
+            self.loading_location_ids = yield self.event_loading
+            yield from self.transport()
+            self.status = "idle"
+        else:
+            yield from self.transport(phase, move_phase)
+            self.status = "idle"
 
-                yield self.idle
+    def get_phase(self):
+        # (단계, 이동 단계): 크레인 프로세스가 대기 중인 이벤트로부터 판단 (스냅샷 저장에 사용)
+        target = self.action.target
+        if target is self.event_sequencing:
+            return "sequencing", None
+        elif target is self.idle:
+            return "idle", None
+        elif target is self.event_loading:
+            return "loading_decision", None
+
+        move_target = self.move_process.target
+        if move_target is self.event_prioritizing:
+            return self.status, "prioritizing"
+        elif move_target is self.wait:
+            return self.status, "waiting"
+        else:
+            return self.status, "moving"
+
+    def execute(self, target_location_id, target_location_code):
+        # 해당 크레인이 이동 가능한 강재가 없을 시 대기
+        if target_location_code == "None":
+            self.start_idle()
+            yield self.idle
+            self.finish_idle()
+        # 해당 크레인이 이동 가능한 강재가 있을 시 작업 시작
+        else:
+            loading_location_ids = self.start_job(target_location_id, target_location_code)
+            if loading_location_ids is None:
+                loading_location_ids = yield self.event_loading
+            self.loading_location_ids = loading_location_ids
+            yield from self.transport()
 
-                idle_finish = self.env.now
-                if self.monitor.record_events:
-                    self.monitor.record(self.env.now, "Idle_Finish", crane=self.name,
-                                        location=self.current_location.name, plate=None)
+        self.status = "idle"
 
-                self.idle_time += idle_finish - idle_start
-            # 해당 크레인이 이동 가능한 강재가 있을 시 작업 시작
+    def transport(self, resume=None, move_resume=None):
+        # 크레인 loading 프로세스 수행 (복원 시에는 중단된 이동 프로세스부터 재개)
+        if resume != "unloading":
+            self.status = "loading"
+            self.move_process = self.env.process(self.move(move_resume if resume == "loading" else None))
+            yield self.move_process
+            self.finish_loading()
+
+        # 크레인 unloading 프로세스 실행
+        self.status = "unloading"
+        self.move_process = self.env.process(self.move(move_resume if resume == "unloading" else None))
+        yield self.move_process
+        self.finish_job()
+
+    def move(self, resume=None):
+        # resume: 복원 시 중단된 이동 단계 ("prioritizing", "moving", "waiting")
+        location_ids = self.get_move_location_ids()
+        if resume is None:
+            self.move_index = 0
+        while self.move_index < len(location_ids):
+            if resume is None:
+                priority = self.plan_leg(location_ids[self.move_index])
+                if priority is None:
+                    priority = self.recheck_interference((yield self.event_prioritizing))
+                    self.interrupt_conflict_crane(priority)
+                self.start_leg(priority)
+            elif resume == "prioritizing":
+                priority = self.recheck_interference((yield self.event_prioritizing))
+                self.interrupt_conflict_crane(priority)
+                self.start_leg(priority)
+
+            yield from self.travel(resume if resume != "prioritizing" else None)
+            resume = None
+
+    def travel(self, resume=None):
+        # 현재 이동 구간(leg)을 따라 이동 (복원 시에는 이동 중 / 회피 후 대기 중 단계부터 재개)
+        try:
+            if resume == "waiting":
+                yield self.wait
+                self.finish_waiting()
             else:
-                if target_location_code == "input_point":
-                    self.job_type = "storage"
-                    self.offset_location = self.input_points[target_location_id]
-                elif target_location_code == "pile":
-                    self.job_type = "reshuffle"
-                    self.offset_location = self.piles[target_location_id]
-                elif target_location_code == "output_point":
-                    self.job_type = "retrieval"
-                    self.offset_location = self.output_points[target_location_id]
-
-                # 동시 이동할 복수 강재 선택을 위한 의사결정
-                self.monitor.queue_loading[self.id] = self
-                self.event_loading = self.env.event()
-                self.loading_location_ids = yield self.event_loading
-                self.unloading_location_ids = self.loading_location_ids[::-1]
-
-                # 크레인 loading 프로세스 수행
-                self.status = "loading"
-                self.move_process = self.env.process(self.move())
-                yield self.move_process
-                self.loading_location_ids = []
-
-                # 크레인 unloading 프로세스 실행
-                self.status = "unloading"
-                self.move_process = self.env.process(self.move())
-                yield self.move_process
-                self.unloading_location_ids = []
+                if resume is None:
+                    self.depart()
+                    self.move_timeout = self.env.timeout(self.leg.duration)
+                yield self.move_timeout
+                if self.arrive():
+                    yield self.wait
+                    self.finish_waiting()
+        except simpy.Interrupt as i:
+            self.stop_leg()
+        else:
+            self.complete_leg()
+        finally:
+            self.end_leg()
+
+    # 아래는 프로세스의 각 단계에서 수행하는 상태 변경
+    # 의사결정이 필요한 경우 대기열에 등록하고 None을 반환하며, 의사결정 결과는 해당 이벤트의 값으로 전달됨
+    def request_sequencing(self):
+        self.settle()
+        if self.monitor.dispatcher is not None:
+            return self.monitor.dispatcher.sequencing(self)
+        self.monitor.queue_sequencing[self.id] = self
+        self.monitor.trigger_decision()
+        self.event_sequencing = self.env.event()
+        return None
+
+    def start_idle(self):
+        self.monitor.queue_idle[self.id] = self
+        self.idle = self.env.event()
+
+        self.idle_start = self.env.now
+        if self.monitor.record_events:
+            self.monitor.record(self.env.now, "Idle_Start", crane=self.name,
+                                location=self.current_location.name, plate=None)
+
+    def finish_idle(self):
+        idle_finish = self.env.now
+        if self.monitor.record_events:
+            self.monitor.record(self.env.now, "Idle_Finish", crane=self.name,
+                                location=self.current_location.name, plate=None)
+
+        self.idle_time += idle_finish - self.idle_start
+        self.monitor.metrics.idle_time[self.id] += idle_finish - self.idle_start
+
+    def start_job(self, target_location_id, target_location_code):
+        if target_location_code == "input_point":
+            self.job_type = "storage"
+            self.offset_location = self.input_points[target_location_id]
+        elif target_location_code == "pile":
+            self.job_type = "reshuffle"
+            self.offset_location = self.piles[target_location_id]
+        elif target_location_code == "output_point":
+            self.job_type = "retrieval"
+            self.offset_location = self.output_points[target_location_id]
+
+        # 동시 이동할 복수 강재 선택을 위한 의사결정
+        if self.monitor.dispatcher is not None:
+            return self.monitor.dispatcher.loading(self)
+        self.monitor.queue_loading[self.id] = self
+        self.monitor.trigger_decision()
+        self.event_loading = self.env.event()
+        return None
+
+    def finish_loading(self):
+        self.loading_location_ids = []
+        # 나중에 적재된 강재부터 하역
+        self.unloading_location_ids = self.plate_table.to_location[self.plates[::-1]].tolist()
 
-            self.status = "idle"
+    def finish_job(self):
+        self.unloading_location_ids = []
+        self.offset_location = None
+        self.job_type = None
+        self.release_waiting_cranes()
+        self.monitor.notify()
 
-    def move(self):
+    def get_move_location_ids(self):
         if self.status == "loading":
-            location_ids = self.loading_location_ids[:]
+            return self.loading_location_ids[:]
         elif self.status == "unloading":
-            location_ids = self.unloading_location_ids[:]
+            return self.unloading_location_ids[:]
         else:
             print("Invalid Access")
-            return
-
-        idx = 0
-        while True:
-            self.start_time = self.env.now
-            target_location_id = location_ids[idx]
-            if self.job_type == "storage" or self.job_type == "reshuffle":
-                self.target_location = self.piles[target_location_id]
-                self.target_location_coord = self.target_location.coord
-            elif self.job_type == "retrieval":
-                self.target_location = self.output_points[target_location_id]
-                self.target_location_coord = (self.target_location.coord[0], self.current_location_coord[1])
-
-            flag, safety_xcoord = self.check_interference()
-            if self.other_crane.waiting_for_avoidance:
-                self.other_crane.wait.succed()
-
-            if flag:
-                self.other_crane.move_process.interrupt()
-                self.monitor.queue_prioritizing[self.id] = self
-                self.event_prioritizing = self.env.event()
-                priority = yield self.event_prioritizing
-            else:
-                priority = "high"
-
-            if priority == "high":
-                dx = self.target_location_coord[0] - self.current_location_coord[0]
-                dy = self.target_location_coord[1] - self.current_location_coord[1]
-                avoidance = False
-            else:
-                dx = safety_xcoord - self.current_location_coord[0]
-                dy = self.target_location_coord[1] - self.current_location_coord[1]
-                avoidance = True
+            return []
+
+    def plan_leg(self, location_id):
+        self.settle()
+        self.start_time = self.env.now
+        self.target_location = self.locations[location_id]
+        if type(self.target_location) is Pile:
+            self.target_location_coord = self.target_location.coord
+        else:
+            self.target_location_coord = (self.target_location.coord[0], self.current_location_coord[1])
+
+        num_conflicts, self.safety_xcoord = self.check_interference()
+        self.release_waiting_cranes()
+
+        if self.yielding:
+            # 우선순위가 높은 크레인에 의해 이동이 중단된 경우 회피 이동
+            self.yielding = False
+            return "low" if num_conflicts else "high"
+        elif num_conflicts:
+            self.monitor.metrics.num_conflicts += 1
+            if num_conflicts > 1 or not self.conflict_crane.moving:
+                # 여러 크레인과 간섭하거나 밀려서 이동 중인 크레인과 간섭하는 경우 회피 이동
+                # (밀려서 이동 중인 크레인과 간섭하는 경우 밀어내는 크레인이 우선)
+                return "low"
+            if self.monitor.dispatcher is not None:
+                priority = self.monitor.dispatcher.prioritizing(self)
+                self.interrupt_conflict_crane(priority)
+                return priority
+            self.monitor.queue_prioritizing[self.id] = self
+            self.monitor.trigger_decision()
+            self.event_prioritizing = self.env.event()
+            return None
+        else:
+            return "high"
+
+    def recheck_interference(self, priority):
+        # 우선순위 결정을 기다리는 동안 다른 크레인이 이동을 시작하거나 이 크레인을 밀어낼 수 있으므로 간섭 여부를 다시 확인
+        # (결정 대상 크레인과만 간섭하는 경우에만 결정에 따름)
+        conflict_crane = self.conflict_crane
+        self.settle()
+        num_conflicts, self.safety_xcoord = self.check_interference()
+        if not num_conflicts:
+            return "high"
+        elif num_conflicts > 1 or self.conflict_crane is not conflict_crane or not conflict_crane.moving:
+            return "low"
+        return priority
+
+    def interrupt_conflict_crane(self, priority):
+        if priority == "high" and self.conflict_crane is not None and self.conflict_crane.moving \
+                and not self.conflict_crane.yielding:
+            self.monitor.metrics.num_interruptions += 1
+            self.conflict_crane.yielding = True
+            self.conflict_crane.interrupt_move()
+
+    def interrupt_move(self):
+        self.move_process.interrupt()
+
+    def start_leg(self, priority):
+        # 우선순위가 낮은 경우 간섭이 예측된 크레인으로부터 안전 거리를 확보할 수 있는 위치로 회피 이동
+        # (밀려서 이동 중인 크레인과의 간섭인 경우 밀어내는 크레인의 이동 완료를 기다림)
+        if priority == "high":
+            dx = self.target_location_coord[0] - self.current_location_coord[0]
+            dy = self.target_location_coord[1] - self.current_location_coord[1]
+            self.avoidance = False
+        else:
+            dx = self.safety_xcoord - self.current_location_coord[0]
+            dy = self.target_location_coord[1] - self.current_location_coord[1]
+            self.avoidance = True
+            self.blocking_crane = self.conflict_crane.pushed_by or self.conflict_crane
+        self.pushed_by = None
+        self.leg = Leg(self.start_time, self.current_location_coord, dx, dy, self.x_velocity, self.y_velocity)
+        self.clear_path()
+
+    def depart(self):
+        if self.monitor.record_events:
+            self.monitor.record(self.env.now, "Move_from", crane=self.name,
+                                location=self.current_location.name, plate=None)
+        self.moving = True
+
+    def arrive(self):
+        # 회피 이동 후 간섭이 예측된 크레인의 이동 완료를 기다려야 하는 경우 True 반환
+        self.moving = False
+        self.monitor.metrics.add_travel(self.id, min(self.env.now - self.start_time, self.leg.duration),
+                                        self.status == "loading")
+
+        if self.monitor.record_events:
+            self.monitor.record(self.env.now, "Move_to", crane=self.name,
+                                location=self.current_location.name, plate=None)
 
-            try:
-                if self.monitor.record_events:
-                    self.monitor.record(self.env.now, "Move_from", crane=self.name,
-                                        location=self.current_location.name, plate=None)
+        if self.status == "loading":
+            self.empty_travel_time += self.leg.duration
 
-                predicted_moving_time = min(abs(dx) / self.x_velocity, abs(dy) / self.y_velocity)
-                yield self.env.timeout(predicted_moving_time)
+        if self.extended_moving_time > 0.0:
+            self.avoiding_time += self.extended_moving_time
+            self.extended_moving_time = 0.0
 
-                if self.monitor.record_events:
-                    self.monitor.record(self.env.now, "Move_to", crane=self.name,
-                                        location=self.current_location.name, plate=None)
+        if sign(self.leg.dx) != sign(self.target_location_coord[0] - self.current_location_coord[0]):
+            self.extended_moving_time = self.leg.duration
+            self.avoiding_time += self.extended_moving_time
 
-                if self.extended_moving_time > 0.0:
-                    self.avoiding_time += self.extended_moving_time
-                    self.extended_moving_time = 0.0
+        if self.avoidance and self.blocking_crane.moving:
+            self.waiting_for_avoidance = True
+            if self.monitor.record_events:
+                self.monitor.record(self.env.now, "Waiting_start", crane=self.name,
+                                    location=self.current_location.name, plate=None)
 
-                if np.sign(dx) != np.sign(self.target_location_coord[0] - self.current_location_coord[0]):
-                    self.extended_moving_time = predicted_moving_time
-                    self.avoiding_time += self.extended_moving_time
+            self.waiting_start = self.env.now
+            self.wait = self.env.event()
+            return True
+        return False
 
-                if avoidance:
-                    self.waiting_for_avoidance = True
-                    if self.monitor.record_events:
-                        self.monitor.record(self.env.now, "Waiting_start", crane=self.name,
-                                            location=self.current_location.name, plate=None)
+    def finish_waiting(self):
+        waiting_finish = self.env.now
 
-                    waiting_start = self.env.now()
-                    self.wait = self.env.event()
-                    yield self.wait
-                    waiting_finish = self.env.now()
+        if self.monitor.record_events:
+            self.monitor.record(self.env.now, "Waiting_finish", crane=self.name,
+                                location=self.current_location.name, plate=None)
 
-                    self.monitor.record(self.env.now, "Waiting_finish", crane=self.name,
-                                        location=self.current_location.name, plate=None)
+        self.avoiding_time += waiting_finish - self.waiting_start
+        self.monitor.metrics.waiting_time[self.id] += waiting_finish - self.waiting_start
+        self.waiting_for_avoidance = False
 
-                    self.avoiding_time += waiting_finish - waiting_start
-                    self.waiting_for_avoidance = False
-            except simpy.Interrupt as i:
+    def stop_leg(self):
+        # 우선순위가 높은 크레인에 의해 이동이 중단된 경우
+        self.moving = False
+        self.monitor.metrics.add_travel(self.id, min(self.env.now - self.start_time, self.leg.duration),
+                                        self.status == "loading")
+        if self.monitor.record_events:
+            self.monitor.record(self.env.now, "Interference_predicted", crane=self.name,
+                                location=self.current_location.name, plate=None)
+        # 이 크레인이 밀어내던 크레인들도 현재 위치에서 정지
+        for other_crane in self.other_cranes:
+            if other_crane.pushed_by is self:
+                other_crane.stop_push()
+
+    def complete_leg(self):
+        if not self.avoidance:
+            self.move_index += 1
+            self.current_location = self.target_location
+            if self.status == "loading":
+                plate = self.target_location.get_plate()
+                self.plates.append(plate)
                 if self.monitor.record_events:
-                    self.monitor.record(self.env.now, "Interference_predicted", crane=self.name,
-                                        location=self.current_location.name, plate=None)
+                    self.monitor.record(self.env.now, "Pick_up", crane=self.name,
+                                        location=self.target_location.name,
+                                        plate=self.plate_table.get_name(plate))
             else:
-                if not avoidance:
-                    idx += 1
-                    if self.status == "loading":
-                        plate = self.target_location.get_plate()
-                        self.plates.append(plate)
-                        if self.monitor.record_events:
-                            self.monitor.record(self.env.now, "Pick_up", crane=self.name,
-                                                location=self.target_location.name, plate=plate.name)
-                    else:
-                        plate = self.plates.pop()
-                        self.target_location.put_plate(plate)
-                        if self.monitor.record_events:
-                            self.monitor.record(self.env.now, "Put_down", crane=self.name,
-                                                location=self.target_location.name, plate=plate.name)
-            finally:
-                actual_moving_time = self.env.now - self.start_time
-                x_coord = self.current_location_coord[0] + actual_moving_time * self.x_velocity * np.sign(dx)
-                y_coord = self.current_location_coord[1] + actual_moving_time * self.y_velocity * np.sign(dy)
-                x_coord = np.clip(x_coord, self.bay_range[0], self.bay_range[1])
-                y_coord = np.clip(y_coord, self.row_range[0], self.row_range[1])
-                self.current_location_coord = (x_coord, y_coord)
+                plate = self.plates.pop()
+                self.target_location.put_plate(plate)
+                self.monitor.metrics.num_plates[self.id] += 1
+                if self.monitor.record_events:
+                    self.monitor.record(self.env.now, "Put_down", crane=self.name,
+                                        location=self.target_location.name,
+                                        plate=self.plate_table.get_name(plate))
+
+    def end_leg(self):
+        # 이동이 완료되거나 중단된 시점의 위치로 크레인 좌표 갱신 (회피 후 대기 중에 밀려서 이동 중이면 밀려난 이동 유지)
+        x_coord, y_coord = self.leg.coord_at(self.env.now)
+        self.current_location_coord = (clamp(x_coord, self.bay_range[0], self.bay_range[1]),
+                                       clamp(y_coord, self.row_range[0], self.row_range[1]))
+        if self.pushed_by is None or self.leg.end_time <= self.env.now:
+            self.pushed_by = None
+            self.leg = Leg(self.env.now, self.current_location_coord, 0.0, 0.0, self.x_velocity, self.y_velocity)
 
     def check_interference(self):
-        if self.other_crane.status == "idle" or self.other_crane.waiting_for_avoidance:
-            flag = False
-            safety_xcoord = None
-        else:
-            dx = self.target_location_coord[0] - self.current_location_coord[0]
-            dy = self.target_location_coord[1] - self.current_location_coord[1]
-            direction = np.sign(dx)
-            moving_time = max(abs(dx) / self.x_velocity, abs(dy) / self.y_velocity)
-
-            elapsed_time = self.env.now - self.other_crane.start_time
-            dx_other = self.other_crane.target_location_coord[0] - self.other_crane.current_location_coord[0]
-            dy_other = self.other_crane.target_location_coord[1] - self.other_crane.current_location_coord[1]
-            direction_other = np.sign(dx_other)
-            moving_time_other = max(abs(dx_other) / self.other_crane.x_velocity,
-                                    abs(dy_other) / self.other_crane.y_velocity)
-            moving_time_other = moving_time_other - elapsed_time
-
-            min_moving_time = min(moving_time, moving_time_other)
-            xcoord = self.current_location_coord[0] + min_moving_time * self.x_velocity * direction
-            xcoord_other = (self.other_crane.current_location_coord[0]
-                            + (min_moving_time + elapsed_time) * self.other_crane.x_velocity * direction_other)
-
-            if self.id == 0 and xcoord >= xcoord_other - self.safety_margin:
-                flag = True
-                safety_xcoord = self.other_crane.target_location_coord[0] - self.safety_margin - 1
-            elif self.id == 1 and xcoord <= xcoord_other + self.safety_margin:
-                flag = True
-                safety_xcoord = self.other_crane.target_location_coord[0] + self.safety_margin + 1
+        # 목표 위치까지의 이동 구간과 양쪽의 목표 위치로 이동 중인 크레인 / 밀려서 이동 중인 크레인의 이동 구간을 비교하여
+        # 간섭이 예측되는 크레인 수와 회피 위치 반환 (environment.trajectory.legs_conflict 참고)
+        # 사이의 정지한 크레인과 회피 이동 중인 크레인은 밀어내거나 다시 회피하도록 하므로 (clear_path 참고)
+        # 크레인 수만큼 안전 거리를 늘려서 비교하고, 진행 방향에서 가장 가까운 크레인을 conflict_crane에 기록
+        # 정지한 크레인 너머의 크레인도 연쇄적으로 밀려오거나 회피 위치를 침범할 수 있으므로 인접 크레인에서 멈추지 않음
+        # (첫 번째 비간섭 크레인에서 멈추면 3대 이상의 레일에서 회피 이동이 서로를 밀어내는 무한 반복 발생)
+        # 회피 위치는 양쪽 크레인들의 이동 종료 위치로부터 안전 거리를 확보하는 범위 안에서 현재 위치와 가장 가까운 위치
+        # (인접 크레인이 진행 방향에서 이동 중인 경우에만 그 크레인의 안전 거리 밖까지 목표 위치 쪽으로 이동)
+        self.conflict_crane = None
+        num_conflicts = 0
+        x_coord, target_xcoord = self.current_location_coord[0], self.target_location_coord[0]
+        leg = Leg(self.env.now, self.current_location_coord, target_xcoord - x_coord,
+                  self.target_location_coord[1] - self.current_location_coord[1],
+                  self.x_velocity, self.y_velocity)
+        # side: 0은 오른쪽 크레인들, 1은 왼쪽 크레인들 (진행 방향부터 확인)
+        forward_side = 0 if target_xcoord >= x_coord else 1
+        lower, upper = self.x_range
+        for side in (forward_side, 1 - forward_side):
+            other_crane = self.right_crane if side == 0 else self.left_crane
+            safety_margin = self.safety_margin
+            while other_crane is not None:
+                if (other_crane.moving and not other_crane.avoidance) or other_crane.is_pushed():
+                    left_leg, right_leg = (leg, other_crane.leg) if side == 0 else (other_crane.leg, leg)
+                    if legs_conflict(left_leg, right_leg, safety_margin, self.env.now):
+                        num_conflicts += 1
+                        if self.conflict_crane is None:
+                            self.conflict_crane = other_crane
+                    xcoord = safe_xcoord(other_crane.leg.x + other_crane.leg.dx, side, safety_margin)
+                    if side == 0:
+                        upper = min(upper, xcoord)
+                    else:
+                        lower = max(lower, xcoord)
+                    if side == forward_side and other_crane is (self.right_crane if side == 0 else self.left_crane):
+                        x_coord = target_xcoord
+                other_crane = other_crane.right_crane if side == 0 else other_crane.left_crane
+                safety_margin += self.safety_margin + 1
+        return num_conflicts, clamp(x_coord, lower, upper)
+
+    def clear_path(self, pusher=None):
+        # 새 이동 구간(목표 위치 / 회피 위치로의 이동, 밀려난 이동)과 간섭하는 인접 크레인 처리
+        # 이동 중인 크레인은 이동을 중단시켜 회피하도록 하고, 정지했거나 밀려서 이동 중인 크레인은 밀어냄
+        # 밀려난 크레인도 같은 방식으로 반대쪽 인접 크레인을 처리하므로 모든 인접 크레인 쌍의 안전 거리가 유지됨
+        for other_crane in (self.left_crane, self.right_crane):
+            if other_crane is None or other_crane is pusher:
+                continue
+            left_leg, right_leg = (other_crane.leg, self.leg) if other_crane is self.left_crane \
+                else (self.leg, other_crane.leg)
+            if not legs_conflict(left_leg, right_leg, self.safety_margin, self.env.now):
+                continue
+            if other_crane.moving:
+                if not other_crane.yielding:
+                    self.monitor.metrics.num_interruptions += 1
+                    other_crane.yielding = True
+                    other_crane.interrupt_move()
             else:
-                flag = False
-                safety_xcoord = None
+                other_crane.push(self)
+
+    def push(self, pusher):
+        # pusher의 이동 구간 종료 위치로부터 안전 거리 밖으로 같은 방향, 같은 속도로 밀려서 이동
+        # pusher의 남은 x축 이동 거리보다 멀리 밀리지 않으므로 pusher의 이동이 끝나기 전에 정지
+        # (회피 이동 후 대기 중인 크레인은 좌표가 이동 시작 시점의 값이므로 현재 이동 구간으로부터 위치 계산)
+        now = self.env.now
+        self.current_location_coord = self.leg.coord_at(now)
+        direction = 1.0 if pusher is self.left_crane else -1.0
+        x_coord = self.current_location_coord[0]
+        pusher_xcoord = pusher.leg.x + pusher.leg.dx
+        distance = min(direction * (pusher_xcoord + direction * (self.safety_margin + 1) - x_coord),
+                       abs(pusher_xcoord - pusher.leg.x_at(now)))
+        dx = clamp(x_coord + direction * max(distance, 0.0), self.x_range[0], self.x_range[1]) - x_coord
+        self.leg = Leg(now, self.current_location_coord, dx, 0.0, self.x_velocity, self.y_velocity)
+        self.pushed_by = pusher.pushed_by or pusher
+        self.avoiding_time += self.leg.duration
+        self.monitor.metrics.num_pushes += 1
+        if self.monitor.record_events:
+            self.monitor.record(now, "Pushed", crane=self.name, location=self.current_location.name, plate=None)
+        self.clear_path(pusher)
+
+    def stop_push(self):
+        # 밀어내던 크레인의 이동이 중단된 경우 현재 위치에서 정지
+        # (밀려난 이동 구간을 기준으로 이동 중인 인접 크레인이 있으므로 정지한 위치에 대해 다시 확인)
+        self.settle()
+        if self.pushed_by is not None:
+            self.pushed_by = None
+            self.leg = Leg(self.env.now, self.current_location_coord, 0.0, 0.0, self.x_velocity, self.y_velocity)
+            self.clear_path()
+
+    def is_pushed(self):
+        # 다른 크레인에 밀려서 이동 중인지 여부
+        return self.pushed_by is not None and self.leg.end_time > self.env.now
+
+    def settle(self):
+        # 밀려서 이동 중인 경우 현재 시각의 위치로 좌표 갱신 (밀려난 이동이 끝났으면 정지 상태로 전환)
+        if self.pushed_by is None:
+            return
+        self.current_location_coord = self.leg.coord_at(self.env.now)
+        if self.leg.end_time <= self.env.now:
+            self.pushed_by = None
+            self.leg = Leg(self.env.now, self.current_location_coord, 0.0, 0.0, self.x_velocity, self.y_velocity)
+
+    def release_waiting_cranes(self):
+        # 회피 후 이 크레인의 이동 완료를 기다리는 크레인의 이동 재개
+        for other_crane in self.other_cranes:
+            if other_crane.waiting_for_avoidance and other_crane.blocking_crane is self \
+                    and not other_crane.wait.triggered:
+                other_crane.wait.succeed()
+
+    def get_reserved_location_ids(self):
+        # 다른 크레인들이 작업 중이거나 적재 예정인 위치 ID (같은 파일의 강재를 두 크레인이 계획하지 않도록 제외)
+        location_ids = []
+        for crane in self.other_cranes:
+            if crane.offset_location is not None:
+                location_ids.append(crane.offset_location.id)
+            location_ids.extend(crane.loading_location_ids)
+        return location_ids
+
+
+class FeasibilityIndex:
+    # 크레인별 작업 가능 위치를 배열로 유지 (강재 반출 / 출고 요청 시점에 해당 위치만 갱신)
+    # 작업 가능 조건: 크레인 이동 범위 내 위치 & 수행할 작업 존재 & 작업 목적지가 크레인 이동 범위 내
+    def __init__(self, reachable, is_output_point, plate_to_location):
+        self.reachable = reachable
+        self.is_output_point = is_output_point
+        self.plate_to_location = plate_to_location
+
+        num_cranes, num_locations = reachable.shape
+        self.has_job = np.zeros(num_locations, dtype=bool)
+        self.target_reachable = np.zeros((num_cranes, num_locations), dtype=bool)
+        # 출고 지점별로 해당 지점이 목적지인 강재가 맨 위에 있는 출고 파일 중 크레인이 도달 가능한 파일 수
+        self.num_retrieval_piles = np.zeros((num_cranes, num_locations), dtype=np.int32)
+        # 출고 파일별 맨 위 강재의 목적 출고 지점 ID (출고 대상 강재가 아니거나 빈 파일은 -1)
+        self.retrieval_top = np.full(num_locations, -1, dtype=np.int64)
+
+    # top_plate: 갱신된 위치의 최상단 강재 인덱스 (빈 위치는 -1)
+    def update_source(self, location_id, top_plate):
+        if top_plate >= 0:
+            self.has_job[location_id] = True
+            self.target_reachable[:, location_id] = self.reachable[:, self.plate_to_location[top_plate]]
+        else:
+            self.has_job[location_id] = False
+
+    def update_retrieval_pile(self, pile_id, top_plate):
+        top = int(self.plate_to_location[top_plate]) if top_plate >= 0 else -1
+        if top >= 0 and not self.is_output_point[top]:
+            top = -1
+        previous = int(self.retrieval_top[pile_id])
+        if top == previous:
+            return
 
-        return flag, safety_xcoord
+        if previous >= 0:
+            self.num_retrieval_piles[:, previous] -= self.reachable[:, pile_id]
+            self.target_reachable[:, previous] = self.num_retrieval_piles[:, previous] > 0
+        if top >= 0:
+            self.num_retrieval_piles[:, top] += self.reachable[:, pile_id]
+            self.target_reachable[:, top] = self.num_retrieval_piles[:, top] > 0
+        self.retrieval_top[pile_id] = top
+
+    def update_request(self, output_point_id, requested):
+        self.has_job[output_point_id] = requested
+
+    def get_retrieval_piles(self, crane_id, output_point_id):
+        # 출고 지점이 목적지인 강재가 맨 위에 있고 크레인이 도달 가능한 출고 파일 ID (위치 ID 순서)
+        return np.flatnonzero((self.retrieval_top == output_point_id) & self.reachable[crane_id])
+
+    def get_mask(self, crane_id, excluded_ids=()):
+        mask = self.reachable[crane_id] & self.has_job & self.target_reachable[crane_id]
+        if len(excluded_ids) > 0:
+            mask[excluded_ids] = False
+        return mask
+
+
+class LoadingPlanner:
+    # 복수 강재 동시 이동 계획: number_limit 매 이하, 총 중량 weight_limit 이하, pile_limit 개 이하의 파일에서
+    # 각 파일의 맨 위 강재부터 연속으로 적재 (강재 1매는 중량과 무관하게 항상 이동 가능)
+    # weight_prefix: 위치별 강재 중량의 누적합 (아래 → 위 순서, 강재가 반출되어도 변하지 않으므로 시나리오별로 한 번만 계산)
+    def __init__(self, piles, plate_table, feasibility, weight_prefix, weight_limit, number_limit, pile_limit):
+        self.piles = piles
+        self.storage_piles = {id: pile for id, pile in piles.items() if pile.type == "storage"}
+        self.plate_table = plate_table
+        self.feasibility = feasibility
+        self.weight_prefix = weight_prefix
+        self.weight_limit = weight_limit
+        self.number_limit = number_limit
+        self.pile_limit = pile_limit
+
+    def get_top_weight(self, location, num_plates):
+        prefix = self.weight_prefix[location.id]
+        size = int(location.arena.size[location.id])
+        return prefix[size] - prefix[size - num_plates]
+
+    def get_max_plates(self, crane, location, output_point=None):
+        # 맨 위부터 연속으로 적재 가능한 강재 수 (출고 작업은 동일 출고 지점 대상, 그 외는 목적지가 이동 범위 내)
+        to_location = self.plate_table.to_location
+        reachable = self.feasibility.reachable[crane.id]
+        num_plates = 0
+        for plate in location.plates[:-self.number_limit - 1:-1].tolist():
+            if output_point is not None and to_location[plate] != output_point.id:
+                break
+            if output_point is None and not reachable[to_location[plate]]:
+                break
+            num_plates += 1
+        while num_plates > 1 and self.get_top_weight(location, num_plates) > self.weight_limit:
+            num_plates -= 1
+        return num_plates
+
+    def get_candidates(self, crane):
+        # (필수 포함 위치, [(위치, 최대 적재 수), ...]) 반환 (다른 크레인의 작업 위치는 제외)
+        excluded = set(crane.get_reserved_location_ids())
+
+        offset = crane.offset_location
+        if crane.job_type == "retrieval":
+            candidates = []
+            for pile_id in self.feasibility.get_retrieval_piles(crane.id, offset.id).tolist():
+                if pile_id in excluded:
+                    continue
+                pile = self.piles[pile_id]
+                candidates.append((pile, self.get_max_plates(crane, pile, offset)))
+            return None, candidates
+
+        candidates = [(offset, max(self.get_max_plates(crane, offset), 1))]
+        if crane.job_type == "reshuffle" and self.pile_limit > 1 and self.number_limit > 1:
+            mask = self.feasibility.get_mask(crane.id)
+            for location_id in np.flatnonzero(mask).tolist():
+                pile = self.storage_piles.get(location_id)
+                if pile is None or pile is offset or location_id in excluded:
+                    continue
+                candidates.append((pile, self.get_max_plates(crane, pile)))
+        return offset, candidates
+
+    def get_route(self, crane, plan):
+        # 레일 위 이동 거리가 최소가 되도록 한쪽 끝부터 순서대로 방문 (적재 위치 ID 목록, 이동 거리)
+        x = crane.current_location_coord[0]
+        xcoords = [location.coord[0] for location, _ in plan]
+        x_min, x_max = min(xcoords), max(xcoords)
+        ascending = abs(x - x_min) <= abs(x - x_max)
+        distance = (x_max - x_min) + min(abs(x - x_min), abs(x - x_max))
+        ordered = sorted(plan, key=lambda item: item[0].coord[0], reverse=not ascending)
+        return [location.id for location, num_plates in ordered for _ in range(num_plates)], distance
+
+    def plan(self, crane):
+        # 가능한 적재 계획을 탐색하여 (전체 최선 계획, 위치별로 해당 위치를 포함하는 최선 계획) 반환
+        # 계획의 우선순위: 강재 수가 많을수록, 이동 거리가 짧을수록 우선
+        required, candidates = self.get_candidates(crane)
+        best_by_location = {}
+        plan = []
+
+        def visit(start, num_plates, weight):
+            if num_plates > 0:
+                loading_location_ids, distance = self.get_route(crane, plan)
+                score = (num_plates, -distance)
+                for location, _ in plan:
+                    if location.id not in best_by_location or score > best_by_location[location.id][0]:
+                        best_by_location[location.id] = (score, loading_location_ids)
+            if num_plates == self.number_limit or len(plan) == self.pile_limit:
+                return
+
+            # 필수 포함 위치가 있는 경우 첫 번째 위치로 고정
+            end = 1 if required is not None and num_plates == 0 else len(candidates)
+            for index in range(start, end):
+                location, max_plates = candidates[index]
+                for count in range(min(max_plates, self.number_limit - num_plates), 0, -1):
+                    total_weight = weight + self.get_top_weight(location, count)
+                    if total_weight <= self.weight_limit or (num_plates == 0 and count == 1):
+                        plan.append((location, count))
+                        visit(index + 1, num_plates + count, total_weight)
+                        plan.pop()
+
+        visit(0, 0, 0.0)
+        if len(best_by_location) == 0:
+            return None, {}
+        best = max(best_by_location.values(), key=lambda item: item[0])[1]
+        return best, {id: item[1] for id, item in best_by_location.items()}
+
+    def greedy(self, crane):
+        loading_location_ids, _ = self.plan(crane)
+        return loading_location_ids if loading_location_ids is not None else self.single(crane)
+
+    def single(self, crane):
+        # 작업 위치의 강재 1매 이동 (출고 작업은 크레인과 가장 가까운 출고 대상 파일)
+        if crane.job_type == "retrieval":
+            pile_ids = self.feasibility.get_retrieval_piles(crane.id, crane.offset_location.id).tolist()
+            x = crane.current_location_coord[0]
+            return [min(pile_ids, key=lambda id: abs(self.piles[id].coord[0] - x))]
+        return [crane.offset_location.id]
+
+
+class Dispatcher:
+    # 규칙 기반 의사결정 (Crane.run의 의사결정 시점에서 바로 결정하여 강화학습 step 인터페이스를 거치지 않음)
+    # SETT: 빈 이동 시간이 가장 짧은 작업 / NEAREST: x축 거리가 가장 가까운 위치
+    # LQF: 남은 강재 수가 가장 많은 위치 / ERD: 출고 요청 시각이 가장 빠른 출고 작업 (없으면 SETT)
+    rules = ("SETT", "NEAREST", "LQF", "ERD")
+
+    def __init__(self, rule, piles, monitor, planner=None):
+        if rule not in self.rules:
+            raise ValueError("unknown dispatching rule: %s" % rule)
+        self.rule = rule
+        self.piles = piles
+        self.monitor = monitor
+        self.planner = planner
+
+    def get_candidates(self, crane):
+        # 크레인이 수행 가능한 작업의 (작업 위치, 적재 위치) 목록 (SteelStockyard._get_mask와 동일한 작업 가능 마스크 사용)
+        # 규칙의 값이 같은 후보는 작업 대기열에 먼저 추가된 위치를 선택하도록 대기열 순서로 나열
+        mask = self.monitor.feasibility.get_mask(crane.id, crane.get_reserved_location_ids())
+
+        candidates = []
+        for queue in [self.monitor.queue_storage, self.monitor.queue_reshuffle]:
+            for location in queue.values():
+                if mask[location.id]:
+                    candidates.append((location, location))
+        for output_point in self.monitor.queue_retrieval.values():
+            if mask[output_point.id]:
+                candidates.append((output_point, self.get_retrieval_pile(crane, output_point)))
+        return candidates
+
+    def get_retrieval_pile(self, crane, output_point):
+        # 출고 대상 강재가 맨 위에 있는 파일 중 크레인과 가장 가까운 파일
+        pile_ids = self.monitor.feasibility.get_retrieval_piles(crane.id, output_point.id).tolist()
+        if len(pile_ids) == 0:
+            return None
+        x = crane.current_location_coord[0]
+        return self.piles[min(pile_ids, key=lambda id: abs(self.piles[id].coord[0] - x))]
+
+    def get_empty_travel_time(self, crane, location):
+        x, y = crane.current_location_coord
+        target_y = location.coord[1] if type(location) is Pile else y
+        return travel_time(location.coord[0] - x, target_y - y, crane.x_velocity, crane.y_velocity)
+
+    def get_backlog(self, location):
+        if isinstance(location, OutputPoint):
+            return location.num_plates - int(location.arena.size[location.stacked_id])
+        return int(location.arena.size[location.id])
+
+    def sequencing(self, crane):
+        candidates = self.get_candidates(crane)
+        if len(candidates) == 0:
+            return None, "None"
+
+        if self.rule == "SETT":
+            key = lambda x: self.get_empty_travel_time(crane, x[1])
+        elif self.rule == "NEAREST":
+            key = lambda x: abs(x[0].coord[0] - crane.current_location_coord[0])
+        elif self.rule == "LQF":
+            key = lambda x: (-self.get_backlog(x[0]), self.get_empty_travel_time(crane, x[1]))
+        else:
+            key = lambda x: (0, x[0].request_time) if isinstance(x[0], OutputPoint) \
+                else (1, self.get_empty_travel_time(crane, x[1]))
+        location, _ = min(candidates, key=key)
+
+        if type(location) is InputPoint:
+            return location.id, "input_point"
+        elif type(location) is Pile:
+            return location.id, "pile"
+        else:
+            return location.id, "output_point"
+
+    def loading(self, crane):
+        # planner가 주어진 경우 복수 강재 동시 이동 계획 중 최선의 계획 사용
+        if self.planner is not None:
+            return self.planner.greedy(crane)
+        # 출고 작업은 가장 가까운 출고 대상 파일, 그 외 작업은 작업 위치의 강재 1매 이동
+        if crane.job_type == "retrieval":
+            return [self.get_retrieval_pile(crane, crane.offset_location).id]
+        return [crane.offset_location.id]
+
+    def prioritizing(self, crane):
+        # 출고 작업을 수행 중인 크레인을 우선하고, 그 외에는 남은 이동 시간이 짧은 크레인을 우선
+        other_crane = crane.conflict_crane
+        if (crane.job_type == "retrieval") != (other_crane.job_type == "retrieval"):
+            return "high" if crane.job_type == "retrieval" else "low"
+
+        dx = crane.target_location_coord[0] - crane.current_location_coord[0]
+        dy = crane.target_location_coord[1] - crane.current_location_coord[1]
+        remaining_time = travel_time(dx, dy, crane.x_velocity, crane.y_velocity)
+        remaining_time_other = other_crane.leg.end_time - crane.env.now
+        return "high" if remaining_time <= remaining_time_other else "low"
 
 
 class Monitor:
-    def __init__(self, record_events=False):
+    def __init__(self, record_events=False, log_options=None):
         self.record_events = record_events
+        # log_options: EventRecorder 설정 (chunk_size, path, file_format, max_events)
+        self.recorder = EventRecorder(**(log_options or {})) if record_events else None
+        if self.recorder is not None:
+            # 이벤트마다 호출되므로 기록 함수를 직접 연결 (Monitor.record를 거치지 않음)
+            self.record = self.recorder.record
+        self.metrics = Metrics()
+
+        self.queue_storage = {}
+        self.queue_reshuffle = {}
+        self.queue_retrieval = {}
 
         self.queue_sequencing = {}
         self.queue_loading = {}
         self.queue_prioritizing = {}
-
-        self.time = []
-        self.event = []
-        self.crane = []
-        self.location = []
-        self.plate = []
-        self.tag = []
+        self.queue_idle = {}
+
+        # 의사결정 대기열이 채워질 때까지 실행 중인지 여부와 대기열이 채워졌는지 여부 (decision-driven 실행 모드에서 사용)
+        self.waiting_decision = False
+        self.decision_ready = False
+        # 규칙 기반 의사결정을 사용하는 경우 Dispatcher가 의사결정 대기열을 대신함
+        self.dispatcher = None
+        # 행동 마스크 계산을 위한 작업 가능 위치 정보 (SteelStockyard에서 설정)
+        self.feasibility = None
+        # 복수 강재 적재 계획 (SteelStockyard에서 설정)
+        self.planner = None
+        # 출고 요청 발생 (SteelStockyard에서 설정)
+        self.demand = None
+
+        self.num_plates_remaining = 0
+        self.updated_locations = set()
 
     def request_scheduling(self):
         flag = False
+        info = None
         if len(self.queue_prioritizing) != 0:
             flag = True
             info = "prioritizing"
@@ -395,24 +1029,27 @@ class Monitor:
                     info = "loading"
         return flag, info
 
+    def trigger_decision(self):
+        self.decision_ready = True
+
+    def notify(self):
+        # 작업 상황이 변경된 경우 대기 중인 크레인의 의사결정 재요청
+        for crane in self.queue_idle.values():
+            crane.idle.succeed()
+        self.queue_idle = {}
+
     def record(self, time, event, crane=None, location=None, plate=None, tag=None):
-        self.time.append(time)
-        self.event.append(event)
-        self.crane.append(crane)
-        self.location.append(location)
-        self.plate.append(plate)
-        self.tag.append(tag)
+        self.recorder.record(time, event, crane, location, plate, tag)
 
     def get_logs(self, file_path=None):
-        records = pd.DataFrame(columns=["Time", "Event", "Crane", "Location", "Plate", "Tag"])
-        records["Time"] = self.time
-        records["Event"] = self.event
-        records["Crane"] = self.crane
-        records["Location"] = self.location
-        records["Plate"] = self.plate
-        records["Tag"] = self.tag
+        import pandas as pd
+
+        if self.recorder is None:
+            records = pd.DataFrame(columns=log_columns)
+        else:
+            records = self.recorder.get_logs()
 
         if file_path is not None:
             records.to_csv(file_path, index=False)
 
-        return records
\ No newline at end of file
+        return records
@@ -0,0 +1,141 @@
+import heapq
+
+from environment.metrics import Metrics
+from environment.trajectory import Leg
+
+
+# 의사결정 시점의 시뮬레이션 상태를 pickle 가능한 dict로 저장하고, 저장된 상태로부터 동일한 시뮬레이션을 재구성
+# SimPy 프로세스(generator)는 복사할 수 없으므로 프로세스별로 중단된 단계만 기록하고 복원 시 해당 단계부터 재개
+# (Crane.run / Crane.move의 resume 인자 참고, 출고 요청은 DemandStream.get_state / set_state로 저장 / 복원)
+# 대기 중인 타이머(크레인 이동 완료, 출고 요청)는 원래 시각과 처리 순서를 그대로 유지하여 다시 등록
+
+location_queues = ("queue_storage", "queue_reshuffle", "queue_retrieval")
+crane_queues = ("queue_sequencing", "queue_loading", "queue_prioritizing", "queue_idle")
+
+crane_values = ("current_location_coord", "target_location_coord", "safety_xcoord", "avoidance", "move_index",
+                "job_type", "status", "moving", "yielding", "waiting_for_avoidance",
+                "start_time", "idle_start", "waiting_start",
+                "idle_time", "empty_travel_time", "avoiding_time", "extended_moving_time")
+crane_lists = ("loading_location_ids", "unloading_location_ids", "plates")
+crane_locations = ("current_location", "target_location", "offset_location")
+crane_refs = ("conflict_crane", "blocking_crane", "pushed_by")
+
+
+def take_snapshot(yard):
+    # reset / step 반환 직후(현재 시각의 이벤트가 모두 처리된 시점)에만 유효
+    monitor = yard.monitor
+    if monitor.dispatcher is not None or monitor.waiting_decision:
+        raise ValueError("snapshots can only be taken at decision points of reset/step")
+
+    # 대기 중인 이벤트의 소유자 (이동이 중단된 크레인의 타이머처럼 소유자가 없는 이벤트는 처리 시각만 유지)
+    owners = {}
+
+    output_points = {}
+    for output_point_id, output_point in yard.output_points.items():
+        phase = monitor.demand.get_phase(output_point_id)
+        if phase == "timer":
+            owners[id(monitor.demand.timers[output_point_id])] = ("output_point", output_point_id)
+        output_points[output_point_id] = {"phase": phase, "request_time": output_point.request_time}
+
+    cranes = []
+    for crane_id, crane in yard.cranes.items():
+        phase, move_phase = crane.get_phase()
+        if move_phase == "moving":
+            owners[id(crane.move_timeout)] = ("crane", crane_id)
+        state = {"phase": phase, "move_phase": move_phase,
+                 "leg": (crane.leg.start_time, crane.leg.x, crane.leg.y, crane.leg.dx, crane.leg.dy)}
+        state.update({key: getattr(crane, key) for key in crane_values})
+        state.update({key: list(getattr(crane, key)) for key in crane_lists})
+        state.update({key: getattr(crane, key).id if getattr(crane, key) is not None else None
+                      for key in crane_locations + crane_refs})
+        cranes.append(state)
+
+    pending = [(time, priority) + owners.get(id(event), (None, None))
+               for time, priority, _, event in sorted(yard.env._queue)]
+
+    feasibility = monitor.feasibility
+    return {"time": yard.env.now, "reward_time": yard.time, "episode_seed": yard.episode_seed,
+            "arena": (yard.arena.plates.copy(), yard.arena.size.copy()),
+            "feasibility": {key: getattr(feasibility, key).copy()
+                            for key in ("has_job", "target_reachable", "num_retrieval_piles", "retrieval_top")},
+            "queues": {key: list(getattr(monitor, key)) for key in location_queues + crane_queues},
+            "num_plates_remaining": monitor.num_plates_remaining,
+            "metrics": monitor.metrics.get_state(),
+            "output_points": output_points, "demand": monitor.demand.get_state(),
+            "cranes": cranes, "pending": pending,
+            "crane_in_decision": yard.crane_in_decision.id if yard.crane_in_decision is not None else None,
+            "loading_plans": {key: list(value) for key, value in yard.loading_plans.items()}}
+
+
+def restore_snapshot(yard, snapshot):
+    # 스냅샷 시점의 시뮬레이션 모델을 생성하고 해당 시점의 (상태, 마스크, 의사결정 유형) 반환
+    yard.episode_seed = snapshot["episode_seed"]
+    yard.env, yard.input_points, yard.output_points, yard.piles, yard.cranes, yard.monitor \
+        = yard._build_simulation_model(snapshot)
+    yard.locations = {**yard.input_points, **yard.piles, **yard.output_points}
+    env = yard.env
+    monitor = yard.monitor
+
+    for key in location_queues:
+        setattr(monitor, key, {location_id: yard.locations[location_id] for location_id in snapshot["queues"][key]})
+    for key in crane_queues:
+        setattr(monitor, key, {crane_id: yard.cranes[crane_id] for crane_id in snapshot["queues"][key]})
+    monitor.num_plates_remaining = snapshot["num_plates_remaining"]
+    monitor.metrics = Metrics.from_state(snapshot["metrics"])
+    for key, value in snapshot["feasibility"].items():
+        getattr(monitor.feasibility, key)[:] = value
+
+    for output_point_id, state in snapshot["output_points"].items():
+        yard.output_points[output_point_id].request_time = state["request_time"]
+
+    for crane_id, state in enumerate(snapshot["cranes"]):
+        crane = yard.cranes[crane_id]
+        for key in crane_values + crane_lists:
+            setattr(crane, key, state[key])
+        for key in crane_locations:
+            setattr(crane, key, yard.locations[state[key]] if state[key] is not None else None)
+        for key in crane_refs:
+            setattr(crane, key, yard.cranes[state[key]] if state[key] is not None else None)
+        start_time, x, y, dx, dy = state["leg"]
+        crane.leg = Leg(start_time, (x, y), dx, dy, crane.x_velocity, crane.y_velocity)
+
+        # 프로세스가 대기하던 의사결정 이벤트 재생성
+        if state["phase"] == "sequencing":
+            crane.event_sequencing = env.event()
+        elif state["phase"] == "idle":
+            crane.idle = env.event()
+        elif state["phase"] == "loading_decision":
+            crane.event_loading = env.event()
+        elif state["move_phase"] == "prioritizing":
+            crane.event_prioritizing = env.event()
+        elif state["move_phase"] == "waiting":
+            crane.wait = env.event()
+
+    # 대기 중인 타이머를 원래 처리 시각과 순서대로 등록 (Timeout과 동일하게 값이 None인 발생 예정 이벤트)
+    for time, priority, kind, owner_id in snapshot["pending"]:
+        event = env.event()
+        event._ok = True
+        event._value = None
+        heapq.heappush(env._queue, (time, priority, next(env._eid), event))
+        if kind == "crane":
+            yard.cranes[owner_id].move_timeout = event
+        elif kind == "output_point":
+            monitor.demand.timers[owner_id] = event
+    monitor.demand.set_state(snapshot["demand"],
+                             {key: state["phase"] for key, state in snapshot["output_points"].items()})
+
+    # 각 프로세스를 중단된 단계까지 진행 (현재 시각의 프로세스 시작 이벤트만 처리됨)
+    while env.peek() == env.now:
+        env.step()
+
+    yard.time = snapshot["reward_time"]
+    yard.crane_in_decision = yard.cranes[snapshot["crane_in_decision"]] \
+        if snapshot["crane_in_decision"] is not None else None
+    yard.loading_plans = {key: list(value) for key, value in snapshot["loading_plans"].items()}
+    yard._init_state()
+
+    _, info = monitor.request_scheduling()
+    if yard.crane_in_decision is None:
+        info = None
+    state, mask = yard._get_state(info)
+    return state, mask, yard._get_mode(info)
@@ -0,0 +1,223 @@
+import torch
+import numpy as np
+import multiprocessing as mp
+
+from multiprocessing import shared_memory
+from environment.batch import get_batch_template
+from environment.data import spawn_seeds
+from environment.env import SteelStockyard
+
+
+def _attach_buffers(shm_specs):
+    shms, buffers = {}, {}
+    for key, (name, shape, dtype) in shm_specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        shms[key] = shm
+        buffers[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return shms, buffers
+
+
+def _write_transition(buffers, idx, state, mask, mode, reward=0.0, done=False):
+    buffers["crane"][idx] = state["crane"].x.numpy()
+    buffers["pile"][idx] = state["pile"].x.numpy()
+    buffers["mask"][idx] = mask.numpy()
+    buffers["mode"][idx] = mode
+    buffers["reward"][idx] = reward
+    buffers["done"][idx] = done
+
+
+def _worker(remote, parent_remote, data_srcs, config, look_ahead, env_ids, seeds, shm_specs):
+    parent_remote.close()
+    torch.set_num_threads(1)
+
+    shms, buffers = _attach_buffers(shm_specs)
+    envs = [SteelStockyard(src, config, look_ahead=look_ahead, seed=seed) for src, seed in zip(data_srcs, seeds)]
+
+    try:
+        while True:
+            cmd = remote.recv()
+            if cmd == "reset":
+                for idx, env in zip(env_ids, envs):
+                    state, mask, mode = env.reset()
+                    _write_transition(buffers, idx, state, mask, mode)
+                remote.send(True)
+            elif cmd == "step":
+                # 행동 및 의사결정 유형은 공유 메모리에서 읽고 결과는 공유 메모리에 기록
+                for idx, env in zip(env_ids, envs):
+                    action = int(buffers["action"][idx])
+                    mode = int(buffers["mode"][idx])
+                    next_state, reward, done, mask, mode = env.step(action, mode)
+                    if done:
+                        next_state, mask, mode = env.reset()
+                    _write_transition(buffers, idx, next_state, mask, mode, reward, done)
+                remote.send(True)
+            elif cmd == "close":
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        for shm in shms.values():
+            shm.close()
+        remote.close()
+
+
+class SubprocSteelStockyard:
+    def __init__(self, data_src, config, num_envs, num_workers=None, look_ahead=2,
+                 start_method=None, timeout=60.0, seed=None):
+        if type(data_src) is list:
+            if len(data_src) != num_envs:
+                raise ValueError("len(data_src) must be equal to num_envs")
+            self.data_srcs = data_src
+        else:
+            self.data_srcs = [data_src] * num_envs
+
+        # 환경별 시드는 작업 프로세스 수와 무관하게 환경 인덱스에 따라 결정
+        self.seed = seed
+        self.seeds = spawn_seeds(seed, num_envs) if seed is not None else [None] * num_envs
+
+        self.config = config
+        self.num_envs = num_envs
+        self.num_workers = min(num_workers or mp.cpu_count(), num_envs)
+        self.look_ahead = look_ahead
+        self.timeout = timeout
+        self.ctx = mp.get_context(start_method)
+
+        # 관측 및 행동 공간 정보는 메인 프로세스의 환경 하나로부터 획득
+        env = SteelStockyard(self.data_srcs[0], config, look_ahead=look_ahead)
+        self.decision_mode = env.decision_mode
+        self.action_size = env.action_size
+        self.state_size = env.state_size
+        self.meta_data = env.meta_data
+        self.num_nodes = env.num_nodes
+
+        # 관측 / 마스크 / 보상을 위한 공유 메모리 버퍼 사전 할당
+        shapes = {"crane": ((num_envs, self.num_nodes["crane"], self.state_size["crane"]), np.float32),
+                  "pile": ((num_envs, self.num_nodes["pile"], self.state_size["pile"]), np.float32),
+                  "mask": ((num_envs, self.action_size), np.bool_),
+                  "action": ((num_envs,), np.int64),
+                  "mode": ((num_envs,), np.int64),
+                  "reward": ((num_envs,), np.float32),
+                  "done": ((num_envs,), np.bool_)}
+        self.shms, self.buffers, self.shm_specs = {}, {}, {}
+        for key, (shape, dtype) in shapes.items():
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self.shms[key] = shm
+            self.buffers[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            self.buffers[key].fill(0)
+            self.shm_specs[key] = (shm.name, shape, dtype)
+
+        self.env_ids = np.array_split(np.arange(num_envs), self.num_workers)
+        self.remotes = [None] * self.num_workers
+        self.processes = [None] * self.num_workers
+        self.num_restarts = 0
+        for worker_id in range(self.num_workers):
+            self._start_worker(worker_id)
+
+        self.closed = False
+
+        # 레이아웃이 고정되어 있으므로 배치 그래프의 간선 정보는 한 번만 생성
+        self.template = get_batch_template(self.num_nodes, self.state_size, num_envs)
+
+    def _start_worker(self, worker_id):
+        remote, work_remote = self.ctx.Pipe()
+        env_ids = [int(i) for i in self.env_ids[worker_id]]
+        data_srcs = [self.data_srcs[i] for i in env_ids]
+        # 재시작한 작업 프로세스의 환경은 (시드, 재시작 횟수)로부터 새 시드를 생성하여 재시작 전의 에피소드를 반복하지 않음
+        if self.seed is None or self.num_restarts == 0:
+            seeds = [self.seeds[i] for i in env_ids]
+        else:
+            seeds = spawn_seeds([self.seed, self.num_restarts], self.num_envs)
+            seeds = [seeds[i] for i in env_ids]
+        process = self.ctx.Process(target=_worker,
+                                   args=(work_remote, remote, data_srcs, self.config, self.look_ahead,
+                                         env_ids, seeds, self.shm_specs),
+                                   daemon=True)
+        process.start()
+        work_remote.close()
+        self.remotes[worker_id] = remote
+        self.processes[worker_id] = process
+
+    def _restart_worker(self, worker_id):
+        # 비정상 종료된 작업 프로세스를 재시작하고 해당 환경들의 에피소드는 종료 처리
+        process = self.processes[worker_id]
+        if process.is_alive():
+            process.terminate()
+        process.join(timeout=1.0)
+        self.remotes[worker_id].close()
+
+        # 재시작한 작업 프로세스도 응답하지 않으면 재시도하지 않고 오류 발생
+        self.num_restarts += 1
+        self._start_worker(worker_id)
+        remote = self.remotes[worker_id]
+        try:
+            remote.send("reset")
+            if not remote.poll(self.timeout):
+                raise TimeoutError
+            remote.recv()
+        except (BrokenPipeError, EOFError, ConnectionResetError, TimeoutError):
+            raise RuntimeError("worker %d failed to reset after restart" % worker_id) from None
+        self.buffers["done"][self.env_ids[worker_id]] = True
+
+    def _broadcast(self, cmd):
+        failed = []
+        for worker_id, remote in enumerate(self.remotes):
+            try:
+                remote.send(cmd)
+            except (BrokenPipeError, EOFError, ConnectionResetError):
+                failed.append(worker_id)
+        for worker_id, remote in enumerate(self.remotes):
+            if worker_id in failed:
+                continue
+            try:
+                if not remote.poll(self.timeout):
+                    raise TimeoutError
+                remote.recv()
+            except (BrokenPipeError, EOFError, ConnectionResetError, TimeoutError):
+                failed.append(worker_id)
+        for worker_id in failed:
+            self._restart_worker(worker_id)
+
+    def _get_batch(self):
+        batch = self.template.clone()
+        batch["crane"].x = torch.from_numpy(self.buffers["crane"].reshape(-1, self.state_size["crane"]).copy())
+        batch["pile"].x = torch.from_numpy(self.buffers["pile"].reshape(-1, self.state_size["pile"]).copy())
+        masks = torch.from_numpy(self.buffers["mask"].copy())
+        return batch, masks
+
+    def reset(self):
+        self._broadcast("reset")
+        states, masks = self._get_batch()
+        return states, masks, self.buffers["mode"].copy()
+
+    def step(self, actions, modes):
+        if torch.is_tensor(actions):
+            actions = actions.cpu().numpy()
+        self.buffers["action"][:] = actions
+        self.buffers["mode"][:] = modes
+
+        self._broadcast("step")
+        states, masks = self._get_batch()
+        return states, self.buffers["reward"].copy(), self.buffers["done"].copy(), masks, \
+               self.buffers["mode"].copy()
+
+    def close(self):
+        if self.closed:
+            return
+        for remote in self.remotes:
+            try:
+                remote.send("close")
+            except (BrokenPipeError, EOFError):
+                pass
+        for process in self.processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+        for shm in self.shms.values():
+            shm.close()
+            shm.unlink()
+        self.closed = True
+
+    def __del__(self):
+        if not getattr(self, "closed", True):
+            self.close()
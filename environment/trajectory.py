@@ -0,0 +1,125 @@
+# 크레인 이동 구간(leg)을 시간에 대한 구간별 선형 함수 x(t)로 표현하고 간섭 여부를 해석적으로 계산
+# 시뮬레이션에서는 이벤트마다 한 번씩 호출되므로 NumPy 스칼라 연산 대신 Python float 연산 사용
+
+
+def sign(value):
+    return (value > 0.0) - (value < 0.0)
+
+
+def clamp(value, lower, upper):
+    return lower if value < lower else upper if value > upper else value
+
+
+def travel_time(dx, dy, x_velocity, y_velocity):
+    # x축과 y축은 동시에 이동하므로 두 축 중 오래 걸리는 시간이 이동 시간
+    return max(abs(dx) / x_velocity, abs(dy) / y_velocity)
+
+
+def advance(coord, delta, velocity, elapsed_time):
+    # elapsed_time 동안 이동한 후의 좌표 (목표 좌표를 넘어가지 않음)
+    return coord + min(elapsed_time * velocity, abs(delta)) * sign(delta)
+
+
+class Leg:
+    __slots__ = ("start_time", "x", "y", "dx", "dy", "x_velocity", "y_velocity", "duration", "x_end_time")
+
+    def __init__(self, start_time, coord, dx, dy, x_velocity, y_velocity):
+        self.start_time = start_time
+        self.x, self.y = coord
+        self.dx = dx
+        self.dy = dy
+        self.x_velocity = x_velocity
+        self.y_velocity = y_velocity
+        self.duration = travel_time(dx, dy, x_velocity, y_velocity)
+        self.x_end_time = start_time + abs(dx) / x_velocity
+
+    @property
+    def end_time(self):
+        return self.start_time + self.duration
+
+    @property
+    def end_coord(self):
+        return self.x + self.dx, self.y + self.dy
+
+    def x_at(self, time):
+        # advance와 같은 계산 (간섭 판단에서 가장 많이 호출되므로 함수 호출 없이 전개)
+        if time <= self.start_time:
+            return self.x
+        elif time >= self.x_end_time:
+            return self.x + self.dx
+        elif self.dx > 0:
+            return self.x + (time - self.start_time) * self.x_velocity
+        else:
+            return self.x - (time - self.start_time) * self.x_velocity
+
+    def coord_at(self, time):
+        elapsed_time = max(time - self.start_time, 0.0)
+        return (advance(self.x, self.dx, self.x_velocity, elapsed_time),
+                advance(self.y, self.dy, self.y_velocity, elapsed_time))
+
+    def breakpoints(self):
+        # x(t)의 기울기가 바뀌는 시각 (x축 이동 시작 / 완료 시각)
+        return self.start_time, self.x_end_time
+
+
+def get_x_ranges(bay_range, safety_margin, num_cranes):
+    # 크레인별 이동 가능 범위 (레일 위 왼쪽부터 순서대로, 양쪽 크레인들과의 안전 거리 고려)
+    return [(bay_range[0] + i * (safety_margin + 1), bay_range[1] - (num_cranes - 1 - i) * (safety_margin + 1))
+            for i in range(num_cranes)]
+
+
+def safe_xcoord(other_target_x, side, safety_margin):
+    # 다른 크레인의 목표 위치로부터 안전 거리를 확보할 수 있는 회피 위치
+    # side: 0은 다른 크레인의 왼쪽, 1은 오른쪽에 있는 크레인
+    if side == 0:
+        return other_target_x - safety_margin - 1
+    else:
+        return other_target_x + safety_margin + 1
+
+
+def collision_window(left_leg, right_leg, safety_margin, start_time, end_time):
+    # 두 크레인 간 거리가 안전 거리 이하가 되는 첫 시간 구간 [t_enter, t_exit] (없으면 None)
+    # 거리 함수는 각 이동 구간의 꺾이는 시각 사이에서 선형이므로 구간별로 일차방정식을 풀어 계산
+    times = sorted({start_time, end_time}
+                   | {t for t in left_leg.breakpoints() + right_leg.breakpoints() if start_time < t < end_time})
+
+    def gap(time):
+        return right_leg.x_at(time) - left_leg.x_at(time) - safety_margin
+
+    if len(times) == 1:
+        return (start_time, end_time) if gap(start_time) <= 0.0 else None
+
+    t_enter = None
+    for t0, t1 in zip(times[:-1], times[1:]):
+        g0, g1 = gap(t0), gap(t1)
+        if t_enter is None:
+            if g0 <= 0.0:
+                t_enter = t0
+            elif g1 <= 0.0:
+                t_enter = t0 + (t1 - t0) * g0 / (g0 - g1)
+            else:
+                continue
+        if g1 > 0.0:
+            return t_enter, t0 + (t1 - t0) * g0 / (g0 - g1)
+    return (t_enter, times[-1]) if t_enter is not None else None
+
+
+def legs_conflict(left_leg, right_leg, safety_margin, now):
+    # 현재 시각 이후 두 이동 구간(왼쪽 / 오른쪽 크레인)의 거리가 안전 거리 이하가 되는지 여부 (구간 종료 후에는 정지)
+    # 이미 안전 거리 이내인 경우(초기 배치 등)에는 거리가 더 줄어드는 경우에만 간섭으로 판단
+    # 거리 함수는 구간별 선형이므로 최솟값은 꺾이는 시각에서만 나타나며, 교차 시각을 구하는 collision_window 대신
+    # 꺾이는 시각의 거리만 비교 (이벤트마다 호출되므로 정렬 없이 계산)
+    left_x, right_x = left_leg.x_at(now), right_leg.x_at(now)
+    distance = right_x - left_x
+    if distance > safety_margin:
+        # x(t)는 구간마다 단조이므로 왼쪽 크레인의 최대 x와 오른쪽 크레인의 최소 x가 안전 거리 밖이면 간섭 없음
+        if min(right_x, right_leg.x + right_leg.dx) - max(left_x, left_leg.x + left_leg.dx) > safety_margin:
+            return False
+        for t in (left_leg.start_time, left_leg.x_end_time, right_leg.start_time, right_leg.x_end_time):
+            if t > now and right_leg.x_at(t) - left_leg.x_at(t) <= safety_margin:
+                return True
+    else:
+        for t in (left_leg.start_time, left_leg.x_end_time, right_leg.start_time, right_leg.x_end_time):
+            if t > now and right_leg.x_at(t) - left_leg.x_at(t) < distance:
+                return True
+    return False
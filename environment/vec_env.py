@@ -0,0 +1,88 @@
+import torch
+import numpy as np
+
+from torch_geometric.data import Batch
+from environment.data import spawn_seeds
+from environment.env import SteelStockyard
+
+
+class BatchedSteelStockyard:
+    def __init__(self, data_src, config, num_envs, look_ahead=2, record_events=False, seed=None, max_resets=10,
+                 **env_kwargs):
+        # data_src가 리스트인 경우 환경별로 서로 다른 시나리오 사용
+        if type(data_src) is list:
+            if len(data_src) != num_envs:
+                raise ValueError("len(data_src) must be equal to num_envs")
+            data_srcs = data_src
+        else:
+            data_srcs = [data_src] * num_envs
+
+        # 환경별 시드는 하나의 SeedSequence로부터 분기하여 서로 독립적인 난수 스트림 사용
+        seeds = spawn_seeds(seed, num_envs) if seed is not None else [None] * num_envs
+
+        # env_kwargs: 각 SteelStockyard에 전달할 나머지 설정 (loading_mode, run_mode, log_options 등)
+        self.num_envs = num_envs
+        self.max_resets = max_resets
+        self.envs = [SteelStockyard(src, config, look_ahead=look_ahead, record_events=record_events, seed=env_seed,
+                                    **env_kwargs)
+                     for src, env_seed in zip(data_srcs, seeds)]
+
+        self.decision_mode = self.envs[0].decision_mode
+        self.action_size = self.envs[0].action_size
+        self.state_size = self.envs[0].state_size
+        self.meta_data = self.envs[0].meta_data
+        self.num_nodes = self.envs[0].num_nodes
+
+        self.episode_rewards = np.zeros(num_envs, dtype=np.float32)
+        self.episode_returns = [[] for _ in range(num_envs)]
+        self.episode_metrics = [[] for _ in range(num_envs)]
+
+    def _reset_env(self, i):
+        # 의사결정 없이 끝나는 에피소드(reset 시점에 이미 종료)는 종료 상태를 의사결정 시점으로 반환하지 않고 다시 초기화
+        env = self.envs[i]
+        for _ in range(self.max_resets):
+            state, mask, mode = env.reset()
+            if env.crane_in_decision is not None:
+                return state, mask, mode
+        raise RuntimeError("environment %d reached no decision point in %d resets" % (i, self.max_resets))
+
+    def reset(self):
+        states, masks, modes = [], [], []
+        for i in range(self.num_envs):
+            state, mask, mode = self._reset_env(i)
+            states.append(state)
+            masks.append(mask)
+            modes.append(mode)
+        self.episode_rewards[:] = 0.0
+
+        return Batch.from_data_list(states), torch.stack(masks), np.array(modes, dtype=np.int64)
+
+    def step(self, actions, modes):
+        if torch.is_tensor(actions):
+            actions = actions.cpu().numpy()
+        actions = np.asarray(actions, dtype=np.int64)
+        modes = np.asarray(modes, dtype=np.int64)
+
+        states, masks = [], []
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        next_modes = np.zeros(self.num_envs, dtype=np.int64)
+
+        for i, env in enumerate(self.envs):
+            next_state, reward, done, mask, mode = env.step(int(actions[i]), int(modes[i]))
+            self.episode_rewards[i] += reward
+
+            # 에피소드 종료 시 자동으로 초기화하여 다음 의사결정 시점의 상태 반환
+            if done:
+                self.episode_returns[i].append(float(self.episode_rewards[i]))
+                self.episode_metrics[i].append(env.get_metrics())
+                self.episode_rewards[i] = 0.0
+                next_state, mask, mode = self._reset_env(i)
+
+            states.append(next_state)
+            masks.append(mask)
+            rewards[i] = reward
+            dones[i] = done
+            next_modes[i] = mode
+
+        return Batch.from_data_list(states), rewards, dones, torch.stack(masks), next_modes
@@ -0,0 +1,57 @@
+import os
+import json
+
+import numpy as np
+import pytest
+
+from benchmark.scaling import scale_config
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+
+with open(os.path.join(os.path.dirname(__file__), "..", "input", "env_config.json"), 'r') as f:
+    CONFIG = json.load(f)
+
+# (행 수, 베이 수, 크레인 수), None은 기본 설정
+LAYOUTS = [None, (2, 88, 2), (2, 88, 3), (2, 88, 4)]
+
+
+class OrderCheckedStockyard(SteelStockyard):
+    # 시뮬레이션 이벤트를 처리할 때마다 레일 위 크레인 순서와 인접 크레인 간 안전 거리 확인
+    def _build_simulation_model(self, snapshot=None):
+        model = super()._build_simulation_model(snapshot)
+        env, cranes = model[0], model[4]
+        step = env.step
+
+        def checked_step():
+            step()
+            x_coords = [crane.leg.x_at(env.now) for crane in cranes.values()]
+            for left_x, right_x in zip(x_coords[:-1], x_coords[1:]):
+                assert right_x - left_x >= self.safety_margin - 1e-6, (env.now, x_coords)
+
+        env.step = checked_step
+        return model
+
+
+def get_config(layout):
+    return CONFIG if layout is None else scale_config(CONFIG, *layout)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+@pytest.mark.parametrize("seed", range(2))
+def test_crane_order_rule(layout, seed):
+    config = get_config(layout)
+    env = OrderCheckedStockyard(DataGenerator(config), config, seed=seed, use_cache=False)
+    env.simulate("SETT")
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_crane_order_random_policy(layout):
+    # 무작위 정책은 우선순위 결정(회피 / 이동 중단)을 포함한 모든 의사결정을 무작위로 선택
+    config = get_config(layout)
+    env = OrderCheckedStockyard(DataGenerator(config), config, seed=0, use_cache=False)
+    rng = np.random.default_rng(0)
+    state, mask, mode = env.reset()
+    done = False
+    while not done:
+        action = int(rng.choice(np.flatnonzero(mask.numpy())))
+        state, reward, done, mask, mode = env.step(action, mode)
@@ -0,0 +1,64 @@
+import os
+import json
+
+import pytest
+
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from environment.evaluate import ResultWriter, evaluate
+
+with open(os.path.join(os.path.dirname(__file__), "..", "input", "env_config.json"), 'r') as f:
+    CONFIG = json.load(f)
+
+HEADER = "scenario,seed,makespan\r\n"
+ROWS = "0,0,10.5\r\n1,1,20.25\r\n"
+
+
+@pytest.mark.parametrize("partial", ["", "2", "2,2", "2,2,", "2,2,3", "2,2,30.5\r"])
+def test_result_writer_drops_partial_row(tmp_path, partial):
+    # 줄바꿈으로 끝나지 않는 마지막 행은 열 수 / 값과 무관하게 제외하고 이어서 기록
+    path = str(tmp_path / "results.csv")
+    with open(path, 'w', newline='') as f:
+        f.write(HEADER + ROWS + partial)
+
+    writer = ResultWriter(path)
+    assert writer.rows == [{"scenario": 0, "seed": 0, "makespan": 10.5}, {"scenario": 1, "seed": 1, "makespan": 20.25}]
+    assert writer.get_completed() == {0, 1}
+
+    writer.write([{"scenario": 2, "seed": 2, "makespan": 30.5}])
+    with open(path, 'r', newline='') as f:
+        assert f.read() == HEADER + ROWS + "2,2,30.5\r\n"
+
+
+def test_result_writer_partial_header(tmp_path):
+    # 헤더 기록 도중 중단된 경우 빈 결과에서 시작
+    path = str(tmp_path / "results.csv")
+    with open(path, 'w', newline='') as f:
+        f.write("scenario,se")
+
+    writer = ResultWriter(path)
+    assert writer.rows == [] and writer.get_completed() == set()
+    writer.write([{"scenario": 0, "seed": 0, "makespan": 10.5}])
+    assert ResultWriter(path).rows == [{"scenario": 0, "seed": 0, "makespan": 10.5}]
+
+
+@pytest.mark.parametrize("mode", ["policy", "rule"])
+def test_evaluate_reports_failed_scenario(tmp_path, monkeypatch, mode):
+    # 시나리오 실행 중 예외가 발생하면 해당 시나리오를 포함한 오류 발생 (완료된 시나리오의 결과는 결과 파일에 유지)
+    path = str(tmp_path / "scenarios")
+    DataGenerator(CONFIG).generate_many(2, seed=0, path=path)
+
+    def fail(method):
+        def wrapper(self, *args, **kwargs):
+            if self.seed == 1:
+                raise ValueError("failure in scenario 1")
+            return method(self, *args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(SteelStockyard, "step", fail(SteelStockyard.step))
+    monkeypatch.setattr(SteelStockyard, "simulate", fail(SteelStockyard.simulate))
+    kwargs = {"policy": lambda states, masks, modes: masks.int().argmax(dim=1)} if mode == "policy" \
+        else {"rule": "SETT"}
+    with pytest.raises(RuntimeError, match="scenario 1"):
+        evaluate(CONFIG, path, output=str(tmp_path / "results.csv"), num_workers=1, num_envs=2,
+                 start_method="fork", **kwargs)
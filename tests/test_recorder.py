@@ -0,0 +1,52 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmark.common import random_action
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+
+with open(os.path.join(os.path.dirname(__file__), "..", "input", "env_config.json"), 'r') as f:
+    CONFIG = json.load(f)
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_streamed_logs_mid_episode(tmp_path, file_format):
+    # 스트리밍 기록 중에는 로그 조회 시 오류가 발생하고 기록은 계속되며, 에피소드 종료 후에는 전체 로그 반환
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / ("events." + file_format))
+    env = SteelStockyard(DataGenerator(CONFIG), CONFIG, record_events=True, seed=0,
+                         log_options={"path": path, "file_format": file_format, "chunk_size": 256})
+    rng = np.random.default_rng(0)
+    state, mask, mode = env.reset()
+    state, reward, done, mask, mode = env.step(random_action(rng, mask), mode)
+    with pytest.raises(RuntimeError):
+        env.monitor.get_logs()
+
+    while not done:
+        state, reward, done, mask, mode = env.step(random_action(rng, mask), mode)
+    assert len(env.monitor.get_logs()) == env.monitor.recorder.num_events
+
+
+def test_streamed_logs_per_episode(tmp_path):
+    # 스트리밍 기록은 에피소드마다 별도 파일에 기록하고, 중단된 에피소드의 파일은 다음 reset에서 닫힘
+    pytest.importorskip("pyarrow")
+    env = SteelStockyard(DataGenerator(CONFIG), CONFIG, record_events=True, seed=0,
+                         log_options={"path": str(tmp_path / "events_{episode}.parquet"), "chunk_size": 256})
+    rng = np.random.default_rng(0)
+    num_events = []
+    for _ in range(2):
+        state, mask, mode = env.reset()
+        for _ in range(10):
+            state, reward, done, mask, mode = env.step(random_action(rng, mask), mode)
+        num_events.append(env.monitor.recorder.num_events)
+        recorder = env.monitor.recorder
+
+    env.reset()
+    assert recorder.closed and recorder.path == str(tmp_path / "events_1.parquet")
+    for episode in range(2):
+        logs = pd.read_parquet(str(tmp_path / ("events_%d.parquet" % episode)))
+        assert len(logs) == num_events[episode]
@@ -0,0 +1,60 @@
+import os
+import json
+
+import numpy as np
+
+from environment.corpus import build_corpus
+from environment.data import DataGenerator
+from environment.env import SteelStockyard
+from environment.scenario import ScenarioSet, save_columns
+
+with open(os.path.join(os.path.dirname(__file__), "..", "input", "env_config.json"), 'r') as f:
+    CONFIG = json.load(f)
+
+
+def test_scenario_set_index(tmp_path):
+    # 시나리오 집합 디렉토리는 scenario_index(지정하지 않으면 시드)로 선택한 시나리오를 사용 (캐시도 시나리오별로 구분)
+    path = str(tmp_path / "scenarios")
+    scenario_set = DataGenerator(CONFIG).generate_many(3, seed=0, path=path)
+
+    for index in range(3):
+        env = SteelStockyard(path, CONFIG, scenario_index=index)
+        assert np.array_equal(env.plate_table.weight, scenario_set[index].weight)
+    for seed in range(4):
+        env = SteelStockyard(path, CONFIG, seed=seed)
+        assert np.array_equal(env.plate_table.weight, scenario_set[seed % 3].weight)
+    assert np.array_equal(SteelStockyard(path, CONFIG).plate_table.weight, scenario_set[0].weight)
+
+
+def test_generator_cache_key():
+    # 환경 설정과 시드가 같아도 데이터 생성기 설정이 다르면 캐시된 시나리오를 재사용하지 않음
+    generator_config = dict(CONFIG, num_plates_for_storage=CONFIG["num_plates_for_storage"] // 2)
+    env = SteelStockyard(DataGenerator(CONFIG), CONFIG, seed=0)
+    other = SteelStockyard(DataGenerator(generator_config), CONFIG, seed=0)
+    expected = SteelStockyard(DataGenerator(generator_config), CONFIG, seed=0, use_cache=False)
+    assert not np.array_equal(env.plate_table.weight, other.plate_table.weight)
+    assert np.array_equal(other.plate_table.weight, expected.plate_table.weight)
+
+
+def test_empty_corpus(tmp_path):
+    # 시나리오 0개의 코퍼스는 DataGenerator.generate_many(0)과 같은 빈 시나리오 집합
+    scenario_set = build_corpus(CONFIG, str(tmp_path / "corpus"), 0, seed=0)
+    assert len(scenario_set) == 0 and scenario_set.manifest["num_plates"] == 0
+
+
+def test_to_frames_roundtrip(tmp_path):
+    # 강재 이름 열이 바이트("S") / 유니코드("U") 배열인 시나리오 집합을 저장 후 memmap으로 읽어도 같은 DataFrame 반환
+    generator = DataGenerator(CONFIG)
+    frames = []
+    for name_dtype in ["S", "U"]:
+        columns, offsets = generator.sample(2, np.random.default_rng(0), name_dtype=name_dtype)
+        path = str(tmp_path / name_dtype)
+        save_columns(path, columns, offsets, generator.locations)
+        scenario_set = ScenarioSet(path)
+        assert scenario_set.columns["name"].dtype.kind == name_dtype
+        frames.append([scenario_set[index].to_frames() for index in range(len(scenario_set))])
+
+    for frames_bytes, frames_unicode in zip(*frames):
+        for df_bytes, df_unicode in zip(frames_bytes, frames_unicode):
+            assert len(df_bytes) > 0 and df_bytes.equals(df_unicode)
+            assert isinstance(df_unicode["name"].iloc[0], str)
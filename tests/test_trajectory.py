@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from environment.trajectory import Leg, collision_window, legs_conflict
+
+VELOCITY = (0.5, 1.0)
+SAFETY_MARGIN = 5
+
+
+def random_leg(rng, start_time, bay_range=(0, 43)):
+    # 시뮬레이션과 같은 범위의 정수 좌표로 무작위 이동 구간 생성
+    coord = (float(rng.integers(bay_range[0], bay_range[1] + 1)), float(rng.integers(2)))
+    target = (float(rng.integers(bay_range[0], bay_range[1] + 1)), float(rng.integers(2)))
+    return Leg(start_time, coord, target[0] - coord[0], target[1] - coord[1], *VELOCITY)
+
+
+def get_gaps(left_leg, right_leg, times):
+    return np.array([right_leg.x_at(t) - left_leg.x_at(t) for t in times])
+
+
+def test_coord_at_matches_reference():
+    # 이동 완료 / 중단 시점의 위치가 기존 계산(NumPy)과 같아야 함
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        leg = random_leg(rng, 100.0)
+        for elapsed in [0.0, 0.5 * leg.duration, leg.duration, leg.duration + 1.0]:
+            expected_x = leg.x + min(elapsed * VELOCITY[0], abs(leg.dx)) * np.sign(leg.dx)
+            expected_y = leg.y + min(elapsed * VELOCITY[1], abs(leg.dy)) * np.sign(leg.dy)
+            assert leg.coord_at(100.0 + elapsed) == (expected_x, expected_y)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_collision_window_matches_sampling(seed):
+    # 간섭 구간 이전에는 안전 거리를 초과하고 진입 시각과 구간 내부에서는 안전 거리 이하여야 함
+    rng = np.random.default_rng(seed)
+    for _ in range(500):
+        left_leg = random_leg(rng, 100.0)
+        right_leg = random_leg(rng, 100.0 + float(rng.integers(0, 40)))
+        end_time = max(left_leg.end_time, right_leg.end_time) + 1.0
+        window = collision_window(left_leg, right_leg, SAFETY_MARGIN, 100.0, end_time)
+        times = np.linspace(100.0, end_time, 401)
+        gaps = get_gaps(left_leg, right_leg, times)
+        if window is None:
+            assert (gaps > SAFETY_MARGIN).all()
+        else:
+            t_enter, t_exit = window
+            assert 100.0 <= t_enter <= t_exit <= end_time
+            assert get_gaps(left_leg, right_leg, [t_enter])[0] <= SAFETY_MARGIN + 1e-9
+            assert (gaps[times < t_enter - 1e-9] > SAFETY_MARGIN).all()
+            assert get_gaps(left_leg, right_leg, [0.5 * (t_enter + t_exit)])[0] <= SAFETY_MARGIN + 1e-9
+
+
+def test_collision_window_single_time():
+    # 시작 시각과 종료 시각이 같은 경우에도 안전 거리 이내이면 간섭 구간 반환
+    left_leg = Leg(0.0, (10.0, 0.0), 0.0, 0.0, *VELOCITY)
+    right_leg = Leg(0.0, (13.0, 0.0), 0.0, 0.0, *VELOCITY)
+    assert collision_window(left_leg, right_leg, SAFETY_MARGIN, 5.0, 5.0) == (5.0, 5.0)
+    right_leg = Leg(0.0, (20.0, 0.0), 0.0, 0.0, *VELOCITY)
+    assert collision_window(left_leg, right_leg, SAFETY_MARGIN, 5.0, 5.0) is None
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_legs_conflict_matches_sampling(seed):
+    # 현재 안전 거리를 확보한 두 이동 구간은 이후 어느 시점에서든 안전 거리 이하가 되는 경우에만 간섭
+    rng = np.random.default_rng(seed)
+    num_checked = 0
+    while num_checked < 500:
+        left_leg = random_leg(rng, 100.0)
+        right_leg = random_leg(rng, 100.0 + float(rng.integers(0, 40)))
+        now = 100.0 + float(rng.integers(0, 40))
+        if right_leg.x_at(now) - left_leg.x_at(now) <= SAFETY_MARGIN:
+            continue
+        end_time = max(left_leg.end_time, right_leg.end_time, now) + 1.0
+        times = np.concatenate([np.linspace(now, end_time, 401),
+                                [t for t in left_leg.breakpoints() + right_leg.breakpoints() if t > now]])
+        assert legs_conflict(left_leg, right_leg, SAFETY_MARGIN, now) \
+            == bool((get_gaps(left_leg, right_leg, times) <= SAFETY_MARGIN).any())
+        num_checked += 1
+
+
+def test_legs_conflict_within_margin():
+    # 이미 안전 거리 이내인 경우 거리가 줄어드는 이동만 간섭
+    left_leg = Leg(0.0, (10.0, 0.0), 0.0, 0.0, *VELOCITY)
+    assert not legs_conflict(left_leg, Leg(0.0, (13.0, 0.0), 0.0, 0.0, *VELOCITY), SAFETY_MARGIN, 0.0)
+    assert not legs_conflict(left_leg, Leg(0.0, (13.0, 0.0), 5.0, 0.0, *VELOCITY), SAFETY_MARGIN, 0.0)
+    assert legs_conflict(left_leg, Leg(0.0, (13.0, 0.0), -1.0, 0.0, *VELOCITY), SAFETY_MARGIN, 0.0)
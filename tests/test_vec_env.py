@@ -0,0 +1,37 @@
+import os
+import json
+
+import numpy as np
+
+from environment.data import DataGenerator
+from environment.vec_env import BatchedSteelStockyard
+
+with open(os.path.join(os.path.dirname(__file__), "..", "input", "env_config.json"), 'r') as f:
+    CONFIG = json.load(f)
+
+
+def test_env_kwargs():
+    # 나머지 설정은 모든 환경에 그대로 전달
+    vec_env = BatchedSteelStockyard(DataGenerator(CONFIG), CONFIG, 2, seed=0, loading_mode="single",
+                                    run_mode="polling")
+    assert all(env.loading_mode == "single" and env.run_mode == "polling" for env in vec_env.envs)
+
+
+def test_reset_skips_finished_episodes():
+    # reset 시점에 이미 종료된 에피소드는 종료 상태 대신 다시 초기화한 에피소드의 의사결정 시점 반환
+    vec_env = BatchedSteelStockyard(DataGenerator(CONFIG), CONFIG, 2, seed=0)
+    env = vec_env.envs[1]
+    run_until_decision = env._run_until_decision
+    calls = []
+
+    def finish_first_episode():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            env.crane_in_decision = None
+            return None, True
+        return run_until_decision()
+
+    env._run_until_decision = finish_first_episode
+    states, masks, modes = vec_env.reset()
+    assert len(calls) == 2
+    assert masks.any(dim=1).all() and np.all(modes >= 0)